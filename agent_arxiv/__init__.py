@@ -1,3 +1,16 @@
-from .workflow import run_workflow
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .workflow import run_workflow
 
 __all__ = ["run_workflow"]
+
+
+def __getattr__(name: str):
+    # Import différé : `agent_arxiv.papers` ou `agent_arxiv.prompts` ne
+    # chargent ni LangGraph ni les clients réseau.
+    if name == "run_workflow":
+        from .workflow import run_workflow
+
+        return run_workflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
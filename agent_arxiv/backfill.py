@@ -0,0 +1,99 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .fingerprints import digest
+from .logger import get_logger
+from .metrics import registry
+from .workflow import build_workflow, checkpointer, invoke_checkpointed
+
+logger = get_logger(__name__)
+
+Window = Tuple[datetime, datetime]
+
+
+def day_windows(start: date, end: date, chunk_days: int = 1) -> Iterator[Window]:
+    """Découpe `[start, end]` (bornes incluses, en UTC) en fenêtres de `chunk_days` jours."""
+    step = timedelta(days=max(1, chunk_days))
+    cursor = datetime.combine(start, time.min, tzinfo=timezone.utc)
+    stop = datetime.combine(end + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    while cursor < stop:
+        yield cursor, min(cursor + step, stop)
+        cursor += step
+
+
+def _ensure_done_table(conn):
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS backfill_chunks ("
+            " thread_id TEXT PRIMARY KEY,"
+            " papers INTEGER NOT NULL,"
+            " scored INTEGER NOT NULL,"
+            " completed_at TEXT NOT NULL"
+            ")"
+        )
+
+
+def backfill(
+    start: date,
+    end: date,
+    query: str = "",
+    chunk_days: int = 1,
+    force: bool = False,
+) -> List[Dict[str, Any]]:
+    """Traite une plage de dates passée, fenêtre par fenêtre, sans post LinkedIn.
+
+    Chaque fenêtre est une exécution checkpointée (`thread_id` dérivé de la
+    requête et de la date) : une fenêtre interrompue reprend à sa dernière
+    étape, une fenêtre terminée est sautée (sauf `force=True`). Seul l'état
+    d'une fenêtre est en mémoire à la fois, et ses checkpoints sont effacés
+    une fois la fenêtre terminée pour que la base ne grossisse pas.
+    """
+    summaries: List[Dict[str, Any]] = []
+    query_key = digest(query or "default")
+    with checkpointer() as saver:
+        _ensure_done_table(saver.conn)
+        compiled = build_workflow(linkedin_post=False).compile(checkpointer=saver)
+        for window_start, window_end in day_windows(start, end, chunk_days):
+            thread_id = f"backfill:{query_key}:{window_start:%Y-%m-%d}:{chunk_days}"
+            summary: Dict[str, Any] = {
+                "window_start": window_start.isoformat(),
+                "window_end": window_end.isoformat(),
+            }
+            done = saver.conn.execute(
+                "SELECT papers, scored FROM backfill_chunks WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+            if done and not force:
+                logger.info("Backfill %s already done, skipping", thread_id)
+                summaries.append({**summary, "papers": done[0], "scored": done[1], "skipped": True})
+                continue
+
+            logger.info("Backfill window %s → %s", window_start.isoformat(), window_end.isoformat())
+            registry.reset()
+            state = invoke_checkpointed(
+                compiled,
+                {"query": query, **{key: summary[key] for key in ("window_start", "window_end")}},
+                thread_id,
+            )
+            summary.update(
+                papers=len(state.get("raw_papers", [])),
+                scored=len(state.get("scored", [])),
+                skipped=False,
+            )
+            with saver.conn:
+                saver.conn.execute(
+                    "INSERT INTO backfill_chunks (thread_id, papers, scored, completed_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (thread_id) DO UPDATE SET "
+                    "papers = excluded.papers, scored = excluded.scored, "
+                    "completed_at = excluded.completed_at",
+                    (
+                        thread_id,
+                        summary["papers"],
+                        summary["scored"],
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+            saver.delete_thread(thread_id)
+            summaries.append(summary)
+            del state
+    return summaries
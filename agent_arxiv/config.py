@@ -1,7 +1,11 @@
+from functools import lru_cache
 from pathlib import Path
 
+from dotenv import load_dotenv
 from pydantic import BaseSettings, Field
 
+from llm_client import GenerationProfile
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 PROMPTS_DIR = PROJECT_ROOT / "prompts"
 DEFAULT_CATEGORIES = ["cs.CL", "cs.AI", "cs.IR", "cs.MA"]
@@ -14,6 +18,16 @@ CRITERIA_PROMPT_FILES = [
     ("potentiel", "Short-term potential", "potential.md"),
 ]
 
+# Profils de génération par type d'appel : un score tient en quelques
+# dizaines de tokens, le post LinkedIn en moins de 2500 caractères.
+ANALYSIS_PROFILE = GenerationProfile(max_tokens=2048)
+SCORE_PROFILE = GenerationProfile(max_tokens=256, json_mode=True)
+# Le scoring groupé renvoie un tableau, incompatible avec le mode JSON objet ;
+# son budget est de `BATCH_SCORE_TOKENS_PER_PAPER` par papier.
+BATCH_SCORE_PROFILE = GenerationProfile(max_tokens=256)
+BATCH_SCORE_TOKENS_PER_PAPER = 128
+LINKEDIN_PROFILE = GenerationProfile(max_tokens=1536)
+
 
 class AppSettings(BaseSettings):
     """Configuration typée de l'application, chargée depuis l'environnement."""
@@ -26,18 +40,374 @@ class AppSettings(BaseSettings):
         alias="LINKEDIN_POST_TEMPERATURE",
         description="Température de génération du post LinkedIn",
     )
+    pdf_download_workers: int = Field(
+        8,
+        alias="PDF_DOWNLOAD_WORKERS",
+        description="Nombre maximal de téléchargements PDF simultanés",
+    )
+    pdf_download_per_host: int = Field(
+        4,
+        alias="PDF_DOWNLOAD_PER_HOST",
+        description="Nombre maximal de téléchargements simultanés par hôte",
+    )
+    pdf_download_retries: int = Field(
+        3,
+        alias="PDF_DOWNLOAD_RETRIES",
+        description="Nombre de rejeux sur erreurs 429/5xx ou réseau",
+    )
+    pdf_extract_workers: int = Field(
+        0,
+        alias="PDF_EXTRACT_WORKERS",
+        description="Processus d'extraction PDF (0 = nombre de cœurs)",
+    )
+    pdf_extract_timeout: float = Field(
+        60.0,
+        alias="PDF_EXTRACT_TIMEOUT",
+        description="Délai maximal d'extraction d'un PDF, en secondes",
+    )
+    pdf_max_pages: int = Field(
+        60, alias="PDF_MAX_PAGES", description="Nombre maximal de pages extraites"
+    )
+    pdf_max_bytes: int = Field(
+        50 * 1024 * 1024,
+        alias="PDF_MAX_BYTES",
+        description="Taille maximale d'un PDF accepté pour l'extraction",
+    )
+    pdf_max_chars: int = Field(
+        150_000,
+        alias="PDF_MAX_CHARS",
+        description="Caractères extraits au plus par PDF ; la lecture s'arrête au-delà (0 = illimité)",
+    )
+
+    llm_concurrency: int = Field(
+        8, alias="LLM_CONCURRENCY", description="Appels LLM simultanés maximum"
+    )
+    llm_requests_per_minute: int = Field(
+        0,
+        alias="LLM_REQUESTS_PER_MINUTE",
+        description="Budget de requêtes LLM par minute (0 = illimité)",
+    )
+    llm_tokens_per_minute: int = Field(
+        0,
+        alias="LLM_TOKENS_PER_MINUTE",
+        description="Budget de tokens LLM par minute (0 = illimité)",
+    )
+    llm_max_retries: int = Field(
+        5,
+        alias="LLM_MAX_RETRIES",
+        description="Rejeux sur rate limit, erreurs réseau ou 5xx",
+    )
+
+    arxiv_api_url: str = Field(
+        "",
+        alias="ARXIV_API_URL",
+        description="URL de l'API ArXiv (vide = export.arxiv.org), ex. un miroir ou un banc de test",
+    )
+    search_window_hours: float = Field(
+        72, alias="SEARCH_WINDOW_HOURS", description="Fenêtre de recherche ArXiv, en heures"
+    )
+    search_page_size: int = Field(
+        100, alias="SEARCH_PAGE_SIZE", description="Résultats par page de l'API ArXiv"
+    )
+    search_incremental: bool = Field(
+        False,
+        alias="SEARCH_INCREMENTAL",
+        description="Ne récupère que les soumissions postérieures au dernier high-water mark",
+    )
+    search_watermark_overlap_hours: float = Field(
+        6,
+        alias="SEARCH_WATERMARK_OVERLAP_HOURS",
+        description="Marge relue avant le high-water mark (annonces ArXiv tardives)",
+    )
+    analysis_token_budget: int = Field(
+        20000,
+        alias="ANALYSIS_TOKEN_BUDGET",
+        description="Budget de tokens du contenu PDF injecté dans le prompt d'analyse",
+    )
+    score_batch_size: int = Field(
+        8,
+        alias="SCORE_BATCH_SIZE",
+        description="Nombre d'analyses scorées par appel LLM (1 = un appel par papier)",
+    )
+    score_parse_retries: int = Field(
+        1,
+        alias="SCORE_PARSE_RETRIES",
+        description="Nouvelles demandes lorsqu'un score renvoyé n'est pas un JSON exploitable",
+    )
+    revision_reuse_threshold: float = Field(
+        0.9,
+        alias="REVISION_REUSE_THRESHOLD",
+        description="Similarité minimale pour réutiliser l'analyse d'une révision antérieure (> 1 = désactivé)",
+    )
+    triage_enabled: bool = Field(
+        False,
+        alias="TRIAGE_ENABLED",
+        description="Classe les papiers sur titre + résumé et écarte les moins pertinents avant le téléchargement",
+    )
+    triage_top_k: int = Field(
+        60, alias="TRIAGE_TOP_K", description="Papiers conservés après le tri (0 = tous)"
+    )
+    triage_min_score: float = Field(
+        0.0,
+        alias="TRIAGE_MIN_SCORE",
+        description="Score de pertinence minimal (cosinus) pour conserver un papier",
+    )
+    checkpoint_db: str = Field(
+        "",
+        alias="CHECKPOINT_DB",
+        description="Base SQLite des checkpoints LangGraph (vide = cache/checkpoints.sqlite3)",
+    )
+    metrics_dir: str = Field(
+        "",
+        alias="METRICS_DIR",
+        description="Répertoire du rapport JSON et du fichier Prometheus de chaque exécution (vide = désactivé)",
+    )
+    pipeline_mode: str = Field(
+        "staged",
+        alias="PIPELINE_MODE",
+        description="Exécution par étapes (`staged`) ou par papier (`streaming`)",
+    )
+    work_queue_db: str = Field(
+        "",
+        alias="WORK_QUEUE_DB",
+        description="Base SQLite de la file de travail multi-processus (vide = cache/queue.sqlite3)",
+    )
+    work_lease_seconds: float = Field(
+        300,
+        alias="WORK_LEASE_SECONDS",
+        description="Durée d'un bail de job ; un worker qui ne le renouvelle pas le perd",
+    )
+    work_max_attempts: int = Field(
+        3, alias="WORK_MAX_ATTEMPTS", description="Tentatives par papier avant abandon"
+    )
+    work_batch_size: int = Field(
+        4, alias="WORK_BATCH_SIZE", description="Papiers pris en bail à la fois par un worker"
+    )
+    run_deadline: str = Field(
+        "",
+        alias="RUN_DEADLINE",
+        description="Heure limite de l'exécution (`HH:MM` heure locale ou date ISO 8601, vide = aucune)",
+    )
+    deadline_reserve_seconds: float = Field(
+        60,
+        alias="DEADLINE_RESERVE_SECONDS",
+        description="Temps réservé avant l'heure limite pour rédiger le post LinkedIn",
+    )
+    daily_token_budget: int = Field(
+        0,
+        alias="DAILY_TOKEN_BUDGET",
+        description="Tokens LLM consommables par jour (UTC), post LinkedIn compris (0 = illimité)",
+    )
+    service_host: str = Field(
+        "127.0.0.1", alias="SERVICE_HOST", description="Adresse d'écoute de l'API du mode service"
+    )
+    service_port: int = Field(8080, alias="SERVICE_PORT", description="Port de l'API du mode service")
+    service_poll_minutes: float = Field(
+        30,
+        alias="SERVICE_POLL_MINUTES",
+        description="Intervalle entre deux interrogations d'ArXiv en mode service",
+    )
 
     model_config = {"extra": "ignore"}
 
 
-_settings = AppSettings()  # instancié une seule fois au démarrage
+@lru_cache(maxsize=None)
+def get_settings() -> AppSettings:
+    """Lit la configuration (environnement et `.env`) au premier accès seulement."""
+    load_dotenv()
+    return AppSettings()
 
 
 def linkedin_language() -> str:
     """Retourne la langue configurée pour les posts LinkedIn."""
-    return _settings.linkedin_post_language
+    return get_settings().linkedin_post_language
 
 
 def linkedin_temperature() -> float:
     """Retourne la température configurée pour les posts LinkedIn."""
-    return _settings.linkedin_post_temperature
+    return get_settings().linkedin_post_temperature
+
+
+def pdf_download_workers() -> int:
+    """Retourne le nombre maximal de téléchargements PDF simultanés."""
+    return get_settings().pdf_download_workers
+
+
+def pdf_download_per_host() -> int:
+    """Retourne la limite de téléchargements simultanés par hôte."""
+    return get_settings().pdf_download_per_host
+
+
+def pdf_download_retries() -> int:
+    """Retourne le nombre de rejeux autorisés par téléchargement."""
+    return get_settings().pdf_download_retries
+
+
+def pdf_extract_workers() -> int:
+    """Retourne le nombre de processus d'extraction (0 = nombre de cœurs)."""
+    return get_settings().pdf_extract_workers
+
+
+def pdf_extract_timeout() -> float:
+    """Retourne le délai maximal d'extraction d'un PDF, en secondes."""
+    return get_settings().pdf_extract_timeout
+
+
+def pdf_max_pages() -> int:
+    """Retourne le nombre maximal de pages extraites par PDF."""
+    return get_settings().pdf_max_pages
+
+
+def pdf_max_bytes() -> int:
+    """Retourne la taille maximale (en octets) d'un PDF à extraire."""
+    return get_settings().pdf_max_bytes
+
+
+def pdf_max_chars() -> int:
+    """Retourne le nombre maximal de caractères extraits d'un PDF (0 = illimité)."""
+    return get_settings().pdf_max_chars
+
+
+def llm_concurrency() -> int:
+    """Retourne le nombre maximal d'appels LLM simultanés."""
+    return get_settings().llm_concurrency
+
+
+def llm_requests_per_minute() -> int:
+    """Retourne le budget de requêtes LLM par minute (0 = illimité)."""
+    return get_settings().llm_requests_per_minute
+
+
+def llm_tokens_per_minute() -> int:
+    """Retourne le budget de tokens LLM par minute (0 = illimité)."""
+    return get_settings().llm_tokens_per_minute
+
+
+def llm_max_retries() -> int:
+    """Retourne le nombre de rejeux autorisés par appel LLM."""
+    return get_settings().llm_max_retries
+
+
+def pipeline_mode() -> str:
+    """Retourne le mode d'exécution du workflow (`staged` ou `streaming`)."""
+    return get_settings().pipeline_mode
+
+
+def checkpoint_db() -> str:
+    """Retourne le chemin de la base des checkpoints (vide = dans le cache)."""
+    return get_settings().checkpoint_db
+
+
+def metrics_dir() -> str:
+    """Retourne le répertoire d'export des métriques (vide = désactivé)."""
+    return get_settings().metrics_dir
+
+
+def revision_reuse_threshold() -> float:
+    """Retourne le seuil de similarité de réutilisation entre révisions."""
+    return get_settings().revision_reuse_threshold
+
+
+def arxiv_api_url() -> str:
+    """Retourne l'URL de l'API ArXiv configurée (vide = URL par défaut)."""
+    return get_settings().arxiv_api_url
+
+
+def search_window_hours() -> float:
+    """Retourne la taille de la fenêtre de recherche ArXiv, en heures."""
+    return get_settings().search_window_hours
+
+
+def search_page_size() -> int:
+    """Retourne le nombre de résultats demandés par page à l'API ArXiv."""
+    return get_settings().search_page_size
+
+
+def search_incremental() -> bool:
+    """Indique si la recherche reprend depuis le dernier high-water mark."""
+    return get_settings().search_incremental
+
+
+def search_watermark_overlap_hours() -> float:
+    """Retourne la marge relue avant le high-water mark, en heures."""
+    return get_settings().search_watermark_overlap_hours
+
+
+def analysis_token_budget() -> int:
+    """Retourne le budget de tokens du contenu injecté dans le prompt d'analyse."""
+    return get_settings().analysis_token_budget
+
+
+def score_batch_size() -> int:
+    """Retourne le nombre d'analyses scorées par appel LLM."""
+    return get_settings().score_batch_size
+
+
+def score_parse_retries() -> int:
+    """Retourne le nombre de nouvelles demandes pour un score illisible."""
+    return get_settings().score_parse_retries
+
+
+def triage_enabled() -> bool:
+    """Indique si le tri sur titre + résumé est actif."""
+    return get_settings().triage_enabled
+
+
+def triage_top_k() -> int:
+    """Retourne le nombre de papiers conservés après le tri (0 = tous)."""
+    return get_settings().triage_top_k
+
+
+def triage_min_score() -> float:
+    """Retourne le score de pertinence minimal du tri."""
+    return get_settings().triage_min_score
+
+
+def service_host() -> str:
+    """Retourne l'adresse d'écoute de l'API du mode service."""
+    return get_settings().service_host
+
+
+def service_port() -> int:
+    """Retourne le port de l'API du mode service."""
+    return get_settings().service_port
+
+
+def service_poll_minutes() -> float:
+    """Retourne l'intervalle (minutes) entre deux exécutions du mode service."""
+    return get_settings().service_poll_minutes
+
+
+def work_queue_db() -> str:
+    """Retourne le chemin de la file de travail (vide = répertoire du cache)."""
+    return get_settings().work_queue_db
+
+
+def work_lease_seconds() -> float:
+    """Retourne la durée d'un bail de job, en secondes."""
+    return get_settings().work_lease_seconds
+
+
+def work_max_attempts() -> int:
+    """Retourne le nombre de tentatives par papier dans la file de travail."""
+    return get_settings().work_max_attempts
+
+
+def work_batch_size() -> int:
+    """Retourne le nombre de papiers pris en bail à la fois par un worker."""
+    return get_settings().work_batch_size
+
+
+def run_deadline() -> str:
+    """Retourne l'heure limite configurée de l'exécution (vide = aucune)."""
+    return get_settings().run_deadline
+
+
+def deadline_reserve_seconds() -> float:
+    """Retourne le temps réservé au post LinkedIn avant l'heure limite, en secondes."""
+    return get_settings().deadline_reserve_seconds
+
+
+def daily_token_budget() -> int:
+    """Retourne le budget quotidien de tokens LLM (0 = illimité)."""
+    return get_settings().daily_token_budget
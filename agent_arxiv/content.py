@@ -0,0 +1,151 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from llm_client.tokens import estimate_tokens
+
+_TITLES = (
+    ("abstract", r"abstract"),
+    ("intro", r"introduction"),
+    ("background", r"related work|background|preliminaries"),
+    ("method", r"method(?:s|ology)?|approach|proposed method|our approach"),
+    ("experiments", r"experiments?|experimental setup|evaluation|results|discussion"),
+    ("conclusion", r"conclusions?|limitations|future work"),
+    ("acknowledgments", r"acknowledge?ments?"),
+    ("references", r"references|bibliography"),
+    ("appendix", r"appendix|appendices|supplementary material"),
+)
+_TITLE_GROUP = "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in _TITLES)
+# Titre numéroté court (« 3.1 Method details », « IV. RESULTS », « A Appendix »)
+# ou titre seul sur sa ligne (« Abstract », « REFERENCES: »).
+_HEADING_RE = re.compile(
+    rf"^[ \t]*(?:(?:(?:\d+|[IVX]+|[A-H])(?:\.\d+)*\.?[ \t]+(?:{_TITLE_GROUP})\b[^\n]{{0,40}})"
+    rf"|(?:{_TITLE_GROUP.replace('?P<', '?P<bare_')})[ \t]*:?)[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Après les références, les annexes portent souvent un titre libre précédé
+# d'une lettre (« A Proofs », « B.1 Additional results »).
+_LETTER_HEADING_RE = re.compile(
+    r"^[ \t]*[A-H](?:\.\d+)*\.?[ \t]+[A-Z][A-Za-z \t:-]{2,60}$", re.MULTILINE
+)
+
+# Rang de conservation (plus petit = gardé en premier) ; les sections absentes
+# de ce tableau (références, remerciements, annexes) sont toujours écartées.
+SECTION_PRIORITY = {
+    "front": 0,
+    "abstract": 0,
+    "conclusion": 1,
+    "intro": 2,
+    "method": 3,
+    "experiments": 4,
+    "background": 5,
+}
+TRUNCATION_MARKER = "\n[...]\n"
+
+
+@dataclass
+class ReducedContent:
+    """Texte réduit et bilan de la réduction (tokens avant/après, sections écartées)."""
+
+    text: str
+    original_tokens: int
+    reduced_tokens: int
+    dropped: List[str] = field(default_factory=list)
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.reduced_tokens
+
+
+def _heading_kind(match: re.Match) -> str:
+    for kind, value in match.groupdict().items():
+        if value:
+            return kind.removeprefix("bare_")
+    return "front"
+
+
+def segment_sections(text: str) -> List[Tuple[str, str]]:
+    """Découpe le texte extrait en sections `(type, texte)` dans l'ordre du document.
+
+    Après les références, toute section (reconnue ou titrée par une lettre)
+    est considérée comme une annexe.
+    """
+    boundaries: List[Tuple[int, str]] = [(0, "front")]
+    for match in _HEADING_RE.finditer(text):
+        boundaries.append((match.start(), _heading_kind(match)))
+
+    references_start = next(
+        (start for start, kind in boundaries if kind == "references"), None
+    )
+    if references_start is not None:
+        boundaries = [
+            (start, "appendix" if start > references_start else kind)
+            for start, kind in boundaries
+        ]
+        boundaries += [
+            (match.start(), "appendix")
+            for match in _LETTER_HEADING_RE.finditer(text, references_start + 1)
+        ]
+        boundaries.sort()
+
+    sections: List[Tuple[str, str]] = []
+    for (start, kind), (end, _) in zip(boundaries, boundaries[1:] + [(len(text), "")]):
+        if end > start:
+            sections.append((kind, text[start:end]))
+    return sections
+
+
+def tail_start(text: str) -> int | None:
+    """Position du premier titre de références ou d'annexe dans `text`, ou `None`."""
+    for match in _HEADING_RE.finditer(text):
+        if _heading_kind(match) in ("references", "appendix"):
+            return match.start()
+    return None
+
+
+def _truncate(text: str, tokens: int, budget: int) -> str:
+    if budget <= 0:
+        return ""
+    chars = int(len(text) * budget / max(tokens, 1))
+    return text[:chars].rstrip()
+
+
+def reduce_content(text: str, token_budget: int) -> ReducedContent:
+    """Écarte les sections peu utiles et tient le reste dans `token_budget` tokens.
+
+    Les sections sont retenues par priorité (résumé et conclusion d'abord),
+    la dernière retenue étant tronquée si besoin, puis restituées dans
+    l'ordre du document.
+    """
+    original_tokens = estimate_tokens(text)
+    sections = segment_sections(text)
+    dropped = sorted({kind for kind, _ in sections if kind not in SECTION_PRIORITY})
+    candidates = [
+        (SECTION_PRIORITY[kind], index, body, estimate_tokens(body))
+        for index, (kind, body) in enumerate(sections)
+        if kind in SECTION_PRIORITY
+    ]
+
+    kept = {}
+    remaining = token_budget
+    for _, index, body, tokens in sorted(candidates):
+        if remaining <= 0:
+            dropped.append(sections[index][0])
+            continue
+        kept[index] = body if tokens <= remaining else _truncate(body, tokens, remaining)
+        remaining -= tokens
+
+    parts: List[str] = []
+    previous = -1
+    for index in sorted(kept):
+        if parts and index != previous + 1:
+            parts.append(TRUNCATION_MARKER)
+        parts.append(kept[index])
+        previous = index
+    reduced = "".join(parts).strip()
+    return ReducedContent(
+        text=reduced,
+        original_tokens=original_tokens,
+        reduced_tokens=estimate_tokens(reduced),
+        dropped=sorted(set(dropped)),
+    )
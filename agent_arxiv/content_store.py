@@ -0,0 +1,54 @@
+from typing import Any, Dict
+
+from cache import load_cache_field, save_cache_field
+
+from .fingerprints import digest
+
+# Le texte intégral d'un PDF ne circule pas dans le state : le papier ne porte
+# qu'une référence vers le cache et l'empreinte du texte (pour les fingerprints).
+CONTENT_REF = "content_ref"
+CONTENT_DIGEST = "content_digest"
+CONTENT_META = "content_meta"
+
+
+def attach_content(
+    paper: Dict[str, Any], paper_id: str, content: str, meta: Dict[str, Any] | None = None
+):
+    """Met `content` en cache et n'attache au papier que sa référence et son empreinte.
+
+    `meta` (pages lues, durée d'extraction…) est mis en cache et attaché au papier.
+    """
+    content_digest = digest(content)
+    save_cache_field(paper_id, "content", content)
+    save_cache_field(paper_id, CONTENT_DIGEST, content_digest)
+    paper[CONTENT_REF] = paper_id
+    paper[CONTENT_DIGEST] = content_digest
+    if meta is not None:
+        save_cache_field(paper_id, CONTENT_META, meta)
+        paper[CONTENT_META] = meta
+
+
+def attach_cached_content(paper: Dict[str, Any], paper_id: str) -> bool:
+    """Attache la référence du texte en cache sans le charger ; `False` s'il est absent.
+
+    Les entrées antérieures, sans empreinte enregistrée, sont lues une fois
+    pour la calculer.
+    """
+    content_digest = load_cache_field(paper_id, CONTENT_DIGEST)
+    if content_digest is None:
+        content = load_cache_field(paper_id, "content")
+        if content is None:
+            return False
+        content_digest = digest(content)
+        save_cache_field(paper_id, CONTENT_DIGEST, content_digest)
+    paper[CONTENT_REF] = paper_id
+    paper[CONTENT_DIGEST] = content_digest
+    return True
+
+
+def load_paper_content(paper: Dict[str, Any]) -> str | None:
+    """Texte intégral du papier, lu dans le cache à la demande (non conservé)."""
+    if paper.get("content"):
+        return paper["content"]
+    paper_id = paper.get(CONTENT_REF)
+    return load_cache_field(paper_id, "content") if paper_id else None
@@ -0,0 +1,111 @@
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .logger import get_logger
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+logger = get_logger(__name__)
+
+
+class DownloadError(RuntimeError):
+    """Erreur levée lorsqu'un téléchargement échoue après toutes les tentatives."""
+
+
+class PdfDownloader:
+    """Moteur de téléchargement concurrent des PDF.
+
+    Les requêtes partagent une `requests.Session` (pool de connexions HTTP
+    keep-alive), le nombre de téléchargements simultanés est borné globalement
+    par le pool de threads et par hôte via des sémaphores, et les réponses
+    429/5xx sont rejouées avec un backoff exponentiel.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host_limit: int = 4,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 30,
+    ):
+        self.per_host_limit = max(1, per_host_limit)
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="pdf-download"
+        )
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    def _retry_delay(self, attempt: int, response: requests.Response | None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2**attempt) + random.uniform(0, self.backoff)
+
+    def download(self, url: str) -> bytes:
+        """Télécharge `url` de manière synchrone, avec rejeu sur 429/5xx."""
+        slot = self._host_slot(url)
+        for attempt in range(self.max_retries + 1):
+            response = None
+            with slot:
+                try:
+                    response = self.session.get(url, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    if attempt >= self.max_retries:
+                        raise DownloadError(f"{url}: {exc}") from exc
+                else:
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        response.raise_for_status()
+                        return response.content
+                    if attempt >= self.max_retries:
+                        raise DownloadError(
+                            f"{url}: HTTP {response.status_code} after "
+                            f"{attempt + 1} attempts"
+                        )
+
+            # Le créneau de l'hôte est libéré pendant l'attente.
+            delay = self._retry_delay(attempt, response)
+            logger.info("Retrying %s in %.1fs (attempt %s)", url, delay, attempt + 1)
+            time.sleep(delay)
+
+        raise DownloadError(url)  # pragma: no cover - boucle toujours conclusive
+
+    def submit(self, url: str) -> "Future[bytes]":
+        """Planifie le téléchargement de `url` et renvoie le `Future` associé."""
+        return self._executor.submit(self.download, url)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+    def __enter__(self) -> "PdfDownloader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
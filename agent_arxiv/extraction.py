@@ -0,0 +1,320 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from io import BytesIO
+from itertools import count, islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple
+
+from .content import tail_start
+from .logger import get_logger
+
+if TYPE_CHECKING:
+    from pypdf import PageObject
+
+logger = get_logger(__name__)
+
+POLL_INTERVAL = 0.5
+# Texte minimal avant de croire un titre « References » / « Appendix » (sommaire, citation).
+MIN_BODY_CHARS = 3000
+
+
+class PdfTooLargeError(ValueError):
+    """Levée lorsqu'un PDF dépasse la taille maximale autorisée."""
+
+
+class ExtractionTimeoutError(TimeoutError):
+    """Levée lorsqu'une extraction dépasse le délai alloué."""
+
+
+@dataclass
+class ExtractedText:
+    """Texte extrait d'un PDF et bilan de l'extraction (`meta` est mis en cache)."""
+
+    text: str
+    pages_total: int
+    pages_read: int
+    seconds: float
+    stop_reason: str
+
+    def meta(self) -> Dict[str, Any]:
+        meta = asdict(self)
+        del meta["text"]
+        meta["chars"] = len(self.text)
+        meta["seconds"] = round(self.seconds, 3)
+        return meta
+
+
+def iter_page_texts(pages: Iterable["PageObject"], max_seconds: float = 0) -> Iterator[str]:
+    """Texte de chaque page, extrait à la demande : une page non consommée n'est pas analysée.
+
+    S'interrompt (arrêt coopératif entre deux pages) après `max_seconds` secondes.
+    """
+    started = time.monotonic()
+    for page in pages:
+        if max_seconds and time.monotonic() - started > max_seconds:
+            return
+        yield page.extract_text() or ""
+
+
+def extract_pdf_text(
+    pdf_bytes: bytes, max_pages: int = 0, max_seconds: float = 0, max_chars: int = 0
+) -> ExtractedText:
+    """Extrait le texte d'un PDF, page par page, en s'arrêtant dès que possible.
+
+    Exécutée dans un processus du pool. La lecture s'arrête au premier titre
+    de références ou d'annexe (la suite n'est jamais envoyée au LLM), après
+    `max_chars` caractères, `max_pages` pages ou `max_seconds` secondes
+    (0 = pas de limite) ; le texte déjà lu est renvoyé.
+    """
+    from pypdf import PdfReader  # importé dans les workers seulement
+
+    started = time.monotonic()
+    reader = PdfReader(BytesIO(pdf_bytes))
+    pages_text: List[str] = []
+    chars = 0
+    pages_read = 0
+    stop_reason = "end"
+    for text in iter_page_texts(islice(reader.pages, max_pages or None), max_seconds):
+        pages_read += 1
+        tail = tail_start(text) if chars >= MIN_BODY_CHARS else None
+        if tail is not None:
+            text = text[:tail]
+            stop_reason = "references"
+        if max_chars and chars + len(text) >= max_chars:
+            text = text[: max_chars - chars]
+            stop_reason = "char budget"
+        if text:
+            pages_text.append(text)
+            chars += len(text) + 1
+        if stop_reason != "end":
+            break
+    if stop_reason == "end" and pages_read < len(reader.pages):
+        stop_reason = "max pages" if max_pages and pages_read >= max_pages else "timeout"
+    return ExtractedText(
+        text="\n".join(pages_text),
+        pages_total=len(reader.pages),
+        pages_read=pages_read,
+        seconds=time.monotonic() - started,
+        stop_reason=stop_reason,
+    )
+
+
+# File des démarrages d'extraction, côté worker (installée par `_init_worker`).
+_started_queue: "multiprocessing.SimpleQueue | None" = None
+
+
+def _init_worker(started_queue: "multiprocessing.SimpleQueue"):
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _extract_job(
+    job_id: int, pdf_bytes: bytes, max_pages: int, max_seconds: float, max_chars: int
+) -> ExtractedText:
+    # Un job passe `running` dès son entrée dans la file d'appels du pool, avant
+    # qu'un worker ne le prenne : le délai côté appelant part de ce signal.
+    _started_queue.put((job_id, time.time()))
+    return extract_pdf_text(pdf_bytes, max_pages, max_seconds, max_chars)
+
+
+@dataclass
+class _Job:
+    """Extraction suivie par `PdfExtractor` : `future` est celui rendu à l'appelant."""
+
+    future: Future
+    args: Tuple[Any, ...]
+    # Future du pool courant ; `None` pendant un remplacement du pool.
+    inner: Future | None = None
+
+
+class PdfExtractor:
+    """Pool de processus dédié à l'extraction de texte des PDF.
+
+    `submit` place les octets téléchargés dans la file du pool et renvoie un
+    `Future`; `expired` liste les extractions en cours depuis plus de
+    `timeout` secondes pour que l'appelant puisse les abandonner. Le délai
+    part du moment où un worker commence le job (signalé par le worker),
+    pas de son entrée dans la file du pool.
+
+    Un worker bloqué sur une page ne s'interrompt qu'en terminant son
+    processus : `abandon` remplace aussitôt le pool et y soumet à nouveau les
+    jobs non terminés, pour que les PDF en attente derrière un document
+    malformé soient traités. Un pool cassé (worker tué, par exemple par
+    l'OOM killer) fait échouer ses jobs et est remplacé au `submit` suivant.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pages: int = 60,
+        max_bytes: int = 50 * 1024 * 1024,
+        timeout: float = 60,
+        max_chars: int = 0,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self._lock = threading.RLock()
+        self._job_ids = count()
+        self._jobs: Dict[int, _Job] = {}
+        # Heure (`time.time`, commune aux processus) de démarrage dans un worker.
+        self._started: Dict[int, float] = {}
+        self._broken = False
+        self._start_pool()
+
+    def _start_pool(self):
+        self._started_queue = multiprocessing.SimpleQueue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self._started_queue,),
+        )
+
+    def _stop_pool(self):
+        for process in list(getattr(self._executor, "_processes", {}).values()):
+            process.terminate()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _restart_pool(self):
+        """Remplace un pool cassé : ses jobs ont déjà échoué avec `BrokenProcessPool`."""
+        logger.warning("PDF extraction pool is broken (a worker died), starting a new one")
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._start_pool()
+        self._broken = False
+
+    def _dispatch(self, job_id: int, job: _Job):
+        try:
+            inner = self._executor.submit(_extract_job, job_id, *job.args)
+        except BrokenProcessPool:
+            self._restart_pool()
+            inner = self._executor.submit(_extract_job, job_id, *job.args)
+        job.inner = inner
+        inner.add_done_callback(lambda done, job_id=job_id: self._settle(job_id, done))
+
+    def _settle(self, job_id: int, inner: Future):
+        """Reporte le résultat du pool sur le future de l'appelant (sauf pool remplacé)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.inner is not inner:
+                return
+            self._forget(job_id)
+        if inner.cancelled():
+            job.future.cancel()
+            return
+        error = inner.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._broken = True
+        try:
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(inner.result())
+        except InvalidStateError:  # annulé entre-temps par l'appelant
+            pass
+
+    def submit(self, pdf_bytes: bytes) -> "Future[ExtractedText]":
+        if self.max_bytes and len(pdf_bytes) > self.max_bytes:
+            raise PdfTooLargeError(
+                f"PDF of {len(pdf_bytes)} bytes exceeds the {self.max_bytes} bytes cap"
+            )
+        # Le délai côté worker est un arrêt coopératif entre deux pages; le
+        # délai côté appelant (`expired`) couvre une page qui ne rend pas la main.
+        with self._lock:
+            if self._broken:
+                self._restart_pool()
+            job_id = next(self._job_ids)
+            job = _Job(Future(), (pdf_bytes, self.max_pages, self.timeout, self.max_chars))
+            self._jobs[job_id] = job
+            self._dispatch(job_id, job)
+        return job.future
+
+    async def extract(self, pdf_bytes: bytes) -> ExtractedText:
+        """Variante asynchrone de `submit` qui applique elle-même le délai."""
+        future = self.submit(pdf_bytes)
+        wrapped = asyncio.wrap_future(future)
+        while True:
+            done, _ = await asyncio.wait({wrapped}, timeout=POLL_INTERVAL)
+            if done:
+                return wrapped.result()
+            if future in self.expired():
+                self.abandon(future)
+                wrapped.cancel()
+                raise ExtractionTimeoutError(
+                    f"PDF extraction exceeded {self.timeout} seconds"
+                )
+
+    def _forget(self, job_id: int):
+        self._jobs.pop(job_id, None)
+        self._started.pop(job_id, None)
+
+    def expired(self) -> List[Future]:
+        """Renvoie les extractions commencées par un worker depuis plus de `timeout` secondes."""
+        with self._lock:
+            while not self._started_queue.empty():
+                job_id, started = self._started_queue.get()
+                if job_id in self._jobs:
+                    self._started[job_id] = started
+            now = time.time()
+            return [
+                self._jobs[job_id].future
+                for job_id, started in self._started.items()
+                if now - started > self.timeout
+            ]
+
+    def abandon(self, future: Future):
+        """Abandonne une extraction expirée : le pool est remplacé, les autres jobs resoumis."""
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job.future is future:
+                    self._forget(job_id)
+            future.cancel()
+            pending = list(self._jobs.items())
+            for _, job in pending:
+                job.inner = None
+            self._started.clear()
+            logger.warning(
+                "Replacing PDF extraction pool after a timeout (%s jobs resubmitted)",
+                len(pending),
+            )
+            self._stop_pool()
+            self._start_pool()
+            self._broken = False
+            for job_id, job in pending:
+                self._dispatch(job_id, job)
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._jobs)
+
+    @property
+    def broken(self) -> bool:
+        """Vrai si un worker est mort : le pool sera remplacé au prochain `submit`."""
+        return self._broken
+
+    def close(self):
+        with self._lock:
+            unfinished = bool(self._jobs)
+            for job in self._jobs.values():
+                job.inner = None
+                job.future.cancel()
+            self._jobs.clear()
+            self._started.clear()
+        if unfinished:
+            # Fermeture pendant une extraction (erreur de l'appelant) : un worker
+            # peut être bloqué, on ne l'attend pas.
+            self._stop_pool()
+        else:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "PdfExtractor":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,55 @@
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict
+
+from .config import analysis_token_budget
+from .prompts import (
+    analysis_template,
+    batch_score_template,
+    criteria_prompts,
+    score_template,
+)
+
+
+def digest(*parts: str) -> str:
+    """Empreinte courte et stable d'une suite de chaînes."""
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part.encode("utf-8", errors="replace"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def analysis_template_digest() -> str:
+    """Empreinte du gabarit d'analyse (préfixe et partie variable) et du budget de contenu."""
+    template = analysis_template()
+    return digest(template.prefix, template.body, str(analysis_token_budget()))
+
+
+@lru_cache(maxsize=None)
+def score_template_digest() -> str:
+    """Empreinte des gabarits de scoring (unitaire et groupé) et de chaque critère."""
+    criteria = [digest(key, label, text) for key, label, text in criteria_prompts()]
+    single, batch = score_template(), batch_score_template()
+    return digest(single.prefix, single.body, batch.prefix, batch.body, *criteria)
+
+
+def analysis_fingerprint(paper: Dict[str, Any], model: str | None) -> str:
+    """Empreinte des entrées d'une analyse : gabarit, modèle, métadonnées et texte.
+
+    Le texte est représenté par `content_digest` (voir `content_store`) ou,
+    à défaut, par l'empreinte de `content`.
+    """
+    return digest(
+        analysis_template_digest(),
+        model or "",
+        paper.get("title") or "",
+        paper.get("abstract") or "",
+        paper.get("content_digest") or digest(paper.get("content") or ""),
+    )
+
+
+def score_fingerprint(analysis: str, model: str | None) -> str:
+    """Empreinte des entrées d'un score : gabarit, critères, modèle et analyse."""
+    return digest(score_template_digest(), model or "", digest(analysis or ""))
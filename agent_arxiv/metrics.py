@@ -0,0 +1,302 @@
+import contextvars
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from llm_client import LLMCall, add_usage_listener
+
+from .logger import get_logger
+from .nodes_base import Node
+from .state import State
+
+logger = get_logger(__name__)
+
+UNATTRIBUTED = "unattributed"
+PERCENTILES = (0.5, 0.9, 0.99)
+PROMETHEUS_PREFIX = "arxiv_agent"
+# Valeurs de la dernière exécution (remises à zéro à chaque run) : des jauges,
+# pas des compteurs Prometheus cumulatifs.
+NODE_SERIES = (
+    ("duration_seconds", "Temps passé dans le nœud."),
+    ("items", "Papiers produits par le nœud."),
+    ("llm_requests", "Requêtes LLM envoyées."),
+    ("llm_response_cache_hits", "Réponses LLM servies par le cache disque."),
+    ("prompt_tokens", "Tokens de prompt facturés."),
+    ("cached_prompt_tokens", "Tokens de prompt servis par le cache de préfixe du serveur."),
+    ("completion_tokens", "Tokens de complétion facturés."),
+)
+# Liste de l'état produite par chaque nœud (`raw_papers` par défaut).
+NODE_ITEMS = {
+    "analyze_papers": "analyzed",
+    "score_papers": "scored",
+    "process_papers": "scored",
+    "write_linkedin_post": "top_papers",
+}
+
+# Nœud en cours d'exécution : hérité par les tâches asyncio et les appels LLM
+# lancés depuis le nœud, pour leur attribuer la consommation de tokens.
+current_node: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_node", default=UNATTRIBUTED
+)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@dataclass
+class NodeMetrics:
+    """Mesures cumulées d'un nœud sur une exécution du workflow."""
+
+    calls: int = 0
+    duration_seconds: float = 0.0
+    items: int = 0
+    cache_hits: Dict[str, int] = field(default_factory=dict)
+    cache_lookups: Dict[str, int] = field(default_factory=dict)
+    llm_requests: int = 0
+    llm_response_cache_hits: int = 0
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_latencies: List[float] = field(default_factory=list)
+
+    @property
+    def cache_hit_ratio(self) -> float | None:
+        lookups = sum(self.cache_lookups.values())
+        return sum(self.cache_hits.values()) / lookups if lookups else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "items": self.items,
+            "cache_hits": dict(self.cache_hits),
+            "cache_lookups": dict(self.cache_lookups),
+            "cache_hit_ratio": (
+                round(self.cache_hit_ratio, 3) if self.cache_hit_ratio is not None else None
+            ),
+            "llm_requests": self.llm_requests,
+            "llm_response_cache_hits": self.llm_response_cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "llm_latency_seconds": {
+                f"p{int(q * 100)}": round(_percentile(self.llm_latencies, q), 3)
+                for q in PERCENTILES
+            },
+        }
+
+
+class MetricsRegistry:
+    """Collecte les mesures par nœud d'une exécution et les exporte (JSON, Prometheus)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc)
+            self._started = time.perf_counter()
+            self.nodes: Dict[str, NodeMetrics] = {}
+
+    def _node(self, name: str) -> NodeMetrics:
+        metrics = self.nodes.get(name)
+        if metrics is None:
+            metrics = self.nodes[name] = NodeMetrics()
+        return metrics
+
+    def record_node(self, name: str, duration: float, items: int):
+        with self._lock:
+            metrics = self._node(name)
+            metrics.calls += 1
+            metrics.duration_seconds += duration
+            metrics.items = items
+
+    def record_cache(self, field_name: str, hits: int, lookups: int):
+        """Enregistre les lectures de cache d'un champ pour le nœud courant."""
+        with self._lock:
+            metrics = self._node(current_node.get())
+            metrics.cache_hits[field_name] = metrics.cache_hits.get(field_name, 0) + hits
+            metrics.cache_lookups[field_name] = (
+                metrics.cache_lookups.get(field_name, 0) + lookups
+            )
+
+    def record_llm_call(self, call: LLMCall):
+        with self._lock:
+            metrics = self._node(current_node.get())
+            if call.cached:
+                metrics.llm_response_cache_hits += 1
+                return
+            metrics.llm_requests += 1
+            metrics.prompt_tokens += call.prompt_tokens
+            metrics.cached_prompt_tokens += call.cached_prompt_tokens
+            metrics.completion_tokens += call.completion_tokens
+            metrics.llm_latencies.append(call.latency)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Mesures brutes par nœud (latences comprises), à fusionner dans un autre registre."""
+        with self._lock:
+            return {name: asdict(metrics) for name, metrics in self.nodes.items()}
+
+    def merge(self, snapshot: Dict[str, Dict[str, Any]]):
+        """Ajoute les mesures d'un autre processus (workers de la file de travail).
+
+        Durées et papiers en sortie sont cumulés sur l'ensemble des workers.
+        """
+        with self._lock:
+            for name, values in snapshot.items():
+                metrics = self._node(name)
+                for key in (
+                    "calls",
+                    "duration_seconds",
+                    "items",
+                    "llm_requests",
+                    "llm_response_cache_hits",
+                    "prompt_tokens",
+                    "cached_prompt_tokens",
+                    "completion_tokens",
+                ):
+                    setattr(metrics, key, getattr(metrics, key) + values[key])
+                for key in ("cache_hits", "cache_lookups"):
+                    counters = getattr(metrics, key)
+                    for field_name, count in values[key].items():
+                        counters[field_name] = counters.get(field_name, 0) + count
+                metrics.llm_latencies.extend(values["llm_latencies"])
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            nodes = {name: metrics.to_dict() for name, metrics in self.nodes.items()}
+            latencies = [lat for metrics in self.nodes.values() for lat in metrics.llm_latencies]
+        totals = {
+            key: sum(node[key] for node in nodes.values())
+            for key in (
+                "llm_requests",
+                "llm_response_cache_hits",
+                "prompt_tokens",
+                "cached_prompt_tokens",
+                "completion_tokens",
+            )
+        }
+        totals["llm_latency_seconds"] = {
+            f"p{int(q * 100)}": round(_percentile(latencies, q), 3) for q in PERCENTILES
+        }
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(time.perf_counter() - self._started, 3),
+            "nodes": nodes,
+            "totals": totals,
+        }
+
+    def prometheus(self) -> str:
+        """Sérialise le rapport au format texte Prometheus (collecteur textfile)."""
+        report = self.report()
+        nodes = report["nodes"]
+        families = [
+            (
+                "run_duration_seconds",
+                "gauge",
+                "Durée totale de l'exécution.",
+                [({}, report["duration_seconds"])],
+            )
+        ]
+        for key, help_text in NODE_SERIES:
+            samples = [({"node": name}, node[key]) for name, node in nodes.items()]
+            families.append((f"node_{key}", "gauge", help_text, samples))
+        families.append(
+            (
+                "node_cache_hit_ratio",
+                "gauge",
+                "Part des lectures de cache réussies.",
+                [
+                    ({"node": name}, node["cache_hit_ratio"])
+                    for name, node in nodes.items()
+                    if node["cache_hit_ratio"] is not None
+                ],
+            )
+        )
+        families.append(
+            (
+                "node_llm_latency_quantile_seconds",
+                "gauge",
+                "Quantiles de latence des requêtes LLM.",
+                [
+                    ({"node": name, "quantile": str(q)}, node["llm_latency_seconds"][f"p{int(q * 100)}"])
+                    for name, node in nodes.items()
+                    if node["llm_requests"]
+                    for q in PERCENTILES
+                ],
+            )
+        )
+
+        lines: List[str] = []
+        for name, kind, help_text, samples in families:
+            full_name = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                if labels:
+                    label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                    lines.append(f"{full_name}{{{label_text}}} {value}")
+                else:
+                    lines.append(f"{full_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: Path):
+        """Écrit `run-<horodatage>.json` et `metrics.prom` dans `directory`."""
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%SZ")
+        report_path = directory / f"run-{stamp}.json"
+        report_path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        # Écriture atomique : le collecteur textfile peut lire à tout moment.
+        prom_path = directory / "metrics.prom"
+        tmp_path = prom_path.with_suffix(".prom.tmp")
+        tmp_path.write_text(self.prometheus(), encoding="utf-8")
+        tmp_path.replace(prom_path)
+        logger.info("Metrics written to %s and %s", report_path, prom_path)
+
+
+registry = MetricsRegistry()
+add_usage_listener(registry.record_llm_call)
+
+
+def record_cache(field_name: str, hits: int, lookups: int):
+    """Raccourci vers `registry.record_cache` pour les nœuds."""
+    registry.record_cache(field_name, hits, lookups)
+
+
+class MeteredNode(Node):
+    """Enveloppe un nœud pour mesurer sa durée et lui attribuer les appels LLM.
+
+    Le nombre d'éléments traités est la taille, en sortie, de la liste que le
+    nœud produit (`NODE_ITEMS`).
+    """
+
+    def __init__(self, name: str, node: Node):
+        self.name = name
+        self._node = node
+
+    def __call__(self, state: State) -> State:
+        token = current_node.set(self.name)
+        started = time.perf_counter()
+        try:
+            result = self._node(state)
+        finally:
+            duration = time.perf_counter() - started
+            current_node.reset(token)
+        items = len((result or {}).get(NODE_ITEMS.get(self.name, "raw_papers")) or [])
+        registry.record_node(self.name, duration, items)
+        logger.info("Node %s finished in %.2fs (%s papers)", self.name, duration, items)
+        return result
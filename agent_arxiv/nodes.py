@@ -1,38 +1,84 @@
+import asyncio
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from datetime import datetime, timedelta, timezone
-from io import BytesIO
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Set, Tuple
 
-import arxiv
-import requests
-from pypdf import PdfReader
-
-from cache import load_cache, paper_id_from_url, save_cache
-from llm_client import LLMClient
+from cache import (
+    flush_cache,
+    load_cache_field,
+    paper_id_from_url,
+    save_cache_field,
+)
+from llm_client import GenerationProfile
+from llm_client.tokens import estimate_messages_tokens
 
 from .config import (
+    ANALYSIS_PROFILE,
     DEFAULT_CATEGORIES,
-    LINKEDIN_CHARACTER_LIMIT,
+    LINKEDIN_PROFILE,
+    analysis_token_budget,
     linkedin_language,
     linkedin_temperature,
+    llm_concurrency,
+    pdf_download_workers,
+    revision_reuse_threshold,
+    score_batch_size,
+    search_incremental,
+    search_page_size,
+    search_watermark_overlap_hours,
+    search_window_hours,
+    triage_enabled,
+    triage_min_score,
+    triage_top_k,
 )
+from .content import reduce_content
+from .content_store import attach_cached_content, attach_content, load_paper_content
+from .extraction import POLL_INTERVAL, ExtractedText, PdfExtractor
+from .fingerprints import analysis_fingerprint, score_fingerprint
 from .logger import get_logger
+from .metrics import record_cache
 from .papers import collect_scored_papers
 from .prompts import (
-    LINKEDIN_SYSTEM_PROMPT,
-    build_analysis_prompt,
+    build_analysis_messages,
     build_linkedin_user_prompt,
-    build_score_prompt,
+    interest_profile,
+    linkedin_system_prompt,
+)
+from .resources import (
+    arxiv_client,
+    get_llm,
+    llm_dispatcher,
+    pdf_tools,
+    run_async,
+    warm_resources,
 )
+from .revisions import reuse_prior_revision
+from .scheduler import (
+    ANALYSIS_TIME_SHARE,
+    BudgetExhausted,
+    Scheduler,
+    prioritize,
+    scheduler_for,
+)
+from .scoring import ScoreBatcher, score_batch, score_cost
+from .search_state import load_search_state, save_search_state
 from .state import State
 
+# `arxiv`, `openai` et `requests` sont importés au premier usage.
+if TYPE_CHECKING:
+    import arxiv
+
+    from llm_client import LLMDispatcher
+
+    from .downloads import PdfDownloader
 
-llm = LLMClient()
 logger = get_logger(__name__)
 
 
 def get_24h_window():
     now = datetime.now(timezone.utc)
-    window_start = now - timedelta(hours=72)
+    window_start = now - timedelta(hours=search_window_hours())
     return window_start
 
 
@@ -42,194 +88,636 @@ def build_arxiv_query(categories: List[str] | None = None) -> str:
     return f"({cat_query})"
 
 
+def _submitted_date_range(start: datetime, end: datetime) -> str:
+    fmt = "%Y%m%d%H%M"
+    return f"submittedDate:[{start.strftime(fmt)} TO {end.strftime(fmt)}]"
+
+
+def _paper_from_result(result: "arxiv.Result") -> Dict[str, Any]:
+    return {
+        "title": result.title,
+        "category": result.primary_category,
+        "abstract": result.summary,
+        "url": result.entry_id,
+        "pdf_url": result.pdf_url,
+        "published": str(result.published),
+        "authors": [author.name for author in result.authors],
+    }
+
+
+def _search_window(state: State) -> Tuple[datetime, datetime]:
+    """Retourne la fenêtre `(début, fin)` : `window_start`/`window_end` du state
+    (dates ISO, utilisées par le backfill) ou les `SEARCH_WINDOW_HOURS` dernières heures.
+    """
+    if state.get("window_end"):
+        end = datetime.fromisoformat(state["window_end"])
+    else:
+        end = datetime.now(timezone.utc)
+    if state.get("window_start"):
+        return datetime.fromisoformat(state["window_start"]), end
+    return end - timedelta(hours=search_window_hours()), end
+
+
 def search_arxiv(state: State):
     logger.info("Searching ArXiv...")
-    window_start = get_24h_window()
-    query = state.get("query") or build_arxiv_query()
+    window_start, now = _search_window(state)
+    categories = state.get("categories") or DEFAULT_CATEGORIES
+    query = state.get("query") or build_arxiv_query(categories)
+    # Une fenêtre explicite (backfill) ne lit ni ne déplace le high-water mark.
+    incremental = search_incremental() and not state.get("window_start")
+
+    since = window_start
+    previous_watermark = None
+    known: List[Dict[str, Any]] = []
+    if incremental:
+        previous_watermark, known = load_search_state(query)
+        if previous_watermark:
+            overlap = timedelta(hours=search_watermark_overlap_hours())
+            since = max(window_start, previous_watermark - overlap)
+
+    # La plage de dates est filtrée côté serveur et les pages sont lues à la
+    # demande : on s'arrête dès qu'un résultat sort de la fenêtre.
+    import arxiv  # import coûteux, différé jusqu'à la première recherche
+
+    page_size = search_page_size()
+    client = arxiv_client()
     search_query = arxiv.Search(
-        query=query,
-        max_results=1000,
+        query=f"{query} AND {_submitted_date_range(since, now)}",
+        max_results=None,
         sort_by=arxiv.SortCriterion.SubmittedDate,
     )
-    results = list(search_query.results())
-    logger.info("Results length: %s", len(results))
+    fetched = 0
+    watermark = previous_watermark
+    new_papers: List[Dict[str, Any]] = []
+    for result in client.results(search_query):
+        fetched += 1
+        if result.published < since:
+            break
+        watermark = max(watermark or result.published, result.published)
+        if result.primary_category not in categories:
+            continue
+        new_papers.append(_paper_from_result(result))
+    logger.info(
+        "Results length: %s (pages fetched: %s, since: %s)",
+        fetched,
+        -(-fetched // page_size),
+        since.isoformat(),
+    )
 
-    papers: List[Dict[str, Any]] = []
-    for result in results:
-        if result.primary_category not in DEFAULT_CATEGORIES:
+    papers = list(new_papers)
+    seen_urls = {paper["url"] for paper in papers}
+    for paper in known:
+        if paper["url"] in seen_urls:
             continue
-        if result.published < window_start:
+        if datetime.fromisoformat(paper["published"]) < window_start:
             continue
-        papers.append(
-            {
-                "title": result.title,
-                "category": result.primary_category,
-                "abstract": result.summary,
-                "url": result.entry_id,
-                "pdf_url": result.pdf_url,
-                "published": str(result.published),
-                "authors": [author.name for author in result.authors],
-            }
-        )
+        papers.append(paper)
+        seen_urls.add(paper["url"])
+
+    if incremental:
+        save_search_state(query, watermark, papers)
 
-    logger.info("Papers length: %s", len(papers))
+    logger.info("Papers length: %s (new: %s)", len(papers), len(new_papers))
     state["raw_papers"] = papers
     return state
 
 
-def _download_pdf(pdf_url: str) -> bytes:
-    response = requests.get(pdf_url, timeout=30)
-    response.raise_for_status()
-    return response.content
+def triage_papers(state: State):
+    """Ne transmet aux étapes coûteuses que les papiers les plus pertinents.
 
+    Classement TF-IDF (features hachées) du titre et du résumé contre le
+    profil d'intérêt `prompts/interest_profile.md`.
+    """
+    papers = state.get("raw_papers", [])
+    if not triage_enabled() or not papers:
+        return state
+
+    from .triage import rank_papers  # NumPy n'est chargé que si le tri s'exécute
 
-def _extract_pdf_content(pdf_bytes: bytes) -> str:
-    reader = PdfReader(BytesIO(pdf_bytes))
-    pages_text: List[str] = []
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        if text:
-            pages_text.append(text)
-    return "\n".join(pages_text)
+    logger.info("Triaging papers...")
+    kept = rank_papers(papers, interest_profile(), triage_top_k(), triage_min_score())
+    logger.info(
+        "Triage stats - total: %s, kept: %s, pruned: %s",
+        len(papers),
+        len(kept),
+        len(papers) - len(kept),
+    )
+    state["raw_papers"] = kept
+    return state
+
+
+PendingPaper = Tuple[Dict[str, Any], str]
+LLMJob = Tuple[Dict[str, Any], str, str]
+ScoreJob = Tuple[Dict[str, Any], str, str]
 
 
 def _attach_cached_field(
     paper: Dict[str, Any],
     paper_id: str,
-    cached: Dict[str, Any] | None,
     field: str,
     value: Any,
+    fingerprint: str | None = None,
 ):
     paper[field] = value
-    cached = cached or {}
-    cached[field] = value
-    save_cache(paper_id, cached)
+    save_cache_field(paper_id, field, value)
+    if fingerprint is not None:
+        save_cache_field(paper_id, f"{field}_fingerprint", fingerprint)
 
 
-def fetch_pdf_content(state: State):
-    logger.info("Fetching PDF contents...")
+def _analysis_messages(paper: Dict[str, Any], paper_id: str) -> List[Dict[str, str]]:
+    """Construit les messages d'analyse sur le contenu réduit aux sections utiles.
 
-    papers_with_content: List[Dict[str, Any]] = []
-    total = len(state.get("raw_papers", []))
-    cache_hits = 0
-    downloaded = 0
-    missing_pdf = 0
-    failures = 0
+    Le texte intégral est lu en cache ici et n'est pas conservé au-delà.
+    """
+    content = load_paper_content(paper)
+    if not content:
+        return build_analysis_messages(paper)
+    reduced = reduce_content(content, analysis_token_budget())
+    logger.info(
+        "Content reduction: %s - %s -> %s tokens (saved %s, dropped: %s)",
+        paper_id,
+        reduced.original_tokens,
+        reduced.reduced_tokens,
+        reduced.saved_tokens,
+        ", ".join(reduced.dropped) or "none",
+    )
+    return build_analysis_messages({**paper, "content": reduced.text})
 
-    for paper in state.get("raw_papers", []):
-        paper_id = paper_id_from_url(paper["url"])
-        cached = load_cache(paper_id)
 
-        if cached and "content" in cached:
-            logger.info("Cache hit: %s (content)", paper_id)
-            paper["content"] = cached["content"]
-            papers_with_content.append(paper)
-            cache_hits += 1
-            continue
+def _load_fresh_field(paper_id: str, field: str, fingerprint: str) -> Any:
+    """Lit `field` en cache seulement si son empreinte d'entrées est à jour."""
+    value = load_cache_field(paper_id, field)
+    if value is None:
+        return None
+    if load_cache_field(paper_id, f"{field}_fingerprint") != fingerprint:
+        logger.info("Stale cache: %s (%s)", paper_id, field)
+        return None
+    return value
 
-        pdf_url = paper.get("pdf_url")
-        if not pdf_url:
-            logger.warning("No PDF found for %s", paper_id)
-            papers_with_content.append(paper)
-            missing_pdf += 1
-            continue
 
-        try:
-            pdf_bytes = _download_pdf(pdf_url)
-            content = _extract_pdf_content(pdf_bytes)
-            _attach_cached_field(paper, paper_id, cached, "content", content)
-            downloaded += 1
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Unable to fetch PDF %s", paper_id)
-            failures += 1
+def _attach_extraction(
+    paper: Dict[str, Any], paper_id: str, extracted: ExtractedText, stats: Counter
+):
+    attach_content(paper, paper_id, extracted.text, extracted.meta())
+    stats["pages read"] += extracted.pages_read
+    stats["pages skipped"] += extracted.pages_total - extracted.pages_read
+    logger.info(
+        "Extraction: %s - %s/%s pages, %s chars in %.2fs (stop: %s)",
+        paper_id,
+        extracted.pages_read,
+        extracted.pages_total,
+        len(extracted.text),
+        extracted.seconds,
+        extracted.stop_reason,
+    )
+
 
-        papers_with_content.append(paper)
+def fetch_pdf_content(state: State):
+    logger.info("Fetching PDF contents...")
 
+    papers = state.get("raw_papers", [])
+    total = len(papers)
+    cache_hits = 0
+    downloaded = 0
+    missing_pdf = 0
+    failures = 0
+    pages: Counter = Counter()
+
+    with pdf_tools() as (downloader, extractor):
+        # Même borne que `pdf_slots` en streaming : au plus `pdf_slots` PDF
+        # téléchargés ou en attente d'extraction gardés en mémoire.
+        pdf_slots = 2 * (pdf_download_workers() + extractor.max_workers)
+        queued: Deque[Tuple[str, PendingPaper]] = deque()
+        downloads: Dict[Future, PendingPaper] = {}
+        extractions: Dict[Future, PendingPaper] = {}
+        pending: Set[Future] = set()
+
+        def start_downloads():
+            while queued and len(downloads) + len(extractions) < pdf_slots:
+                pdf_url, job = queued.popleft()
+                future = downloader.submit(pdf_url)
+                downloads[future] = job
+                pending.add(future)
+
+        for paper in papers:
+            paper_id = paper_id_from_url(paper["url"])
+            if attach_cached_content(paper, paper_id):
+                logger.info("Cache hit: %s (content)", paper_id)
+                cache_hits += 1
+                continue
+
+            pdf_url = paper.get("pdf_url")
+            if not pdf_url:
+                logger.warning("No PDF found for %s", paper_id)
+                missing_pdf += 1
+                continue
+
+            queued.append((pdf_url, (paper, paper_id)))
+
+        # Les extractions démarrent dès qu'un téléchargement se termine, pendant
+        # que les suivants sont encore en cours.
+        start_downloads()
+        while pending:
+            timeout = POLL_INTERVAL if extractor.busy else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            pending -= done
+            for future in done:
+                if future in downloads:
+                    job = downloads.pop(future)
+                    paper_id = job[1]
+                    try:
+                        extraction = extractor.submit(future.result())
+                    except Exception:  # noqa: BLE001
+                        logger.exception("Unable to fetch PDF %s", paper_id)
+                        failures += 1
+                        continue
+                    extractions[extraction] = job
+                    pending.add(extraction)
+                    continue
+
+                paper, paper_id = extractions.pop(future)
+                try:
+                    _attach_extraction(paper, paper_id, future.result(), pages)
+                    downloaded += 1
+                except Exception:  # noqa: BLE001
+                    logger.exception("Unable to extract PDF %s", paper_id)
+                    failures += 1
+
+            for future in extractor.expired():
+                if future not in pending:
+                    continue
+                _, paper_id = extractions.pop(future)
+                logger.warning("PDF extraction timed out: %s", paper_id)
+                extractor.abandon(future)
+                pending.discard(future)
+                failures += 1
+            start_downloads()
+
+    flush_cache()
+    record_cache("content", cache_hits, total)
     logger.info(
         "PDF stats - total: %s, cache hits: %s, downloaded: %s, "
-        "missing pdf: %s, failures: %s",
+        "missing pdf: %s, failures: %s, pages read: %s, pages skipped: %s",
         total,
         cache_hits,
         downloaded,
         missing_pdf,
         failures,
+        pages["pages read"],
+        pages["pages skipped"],
     )
-    state["raw_papers"] = papers_with_content
+    state["raw_papers"] = papers
     return state
 
 
+async def _close_dispatcher(dispatcher: "LLMDispatcher"):
+    cache = dispatcher.client.response_cache
+    if cache is not None and cache.hits + cache.misses:
+        logger.info(
+            "LLM response cache - %s hits, %s misses", cache.hits, cache.misses
+        )
+    # Le dispatcher des ressources partagées reste ouvert entre deux exécutions.
+    if warm_resources() is None:
+        await dispatcher.client.close()
+
+
+async def _generate_fields(
+    jobs: List[LLMJob],
+    field: str,
+    profile: GenerationProfile,
+    build_messages: Callable[[Dict[str, Any], str], List[Dict[str, str]]],
+    schedule: Scheduler,
+) -> int:
+    """Génère `field` pour chaque job en parallèle et le met en cache au fil de l'eau.
+
+    Les messages ne sont construits qu'une fois un créneau obtenu : seuls
+    `LLM_CONCURRENCY` prompts (et textes sources) sont en mémoire à la fois.
+    Les créneaux sont attribués dans l'ordre des jobs, que `schedule` peut
+    interrompre (heure limite, budget de tokens).
+    """
+    dispatcher = llm_dispatcher()
+    slots = asyncio.Semaphore(max(1, llm_concurrency()))
+
+    async def run(paper, paper_id, fingerprint) -> bool:
+        try:
+            async with slots:
+                schedule.check()
+                messages = build_messages(paper, paper_id)
+                text = await schedule.run(
+                    estimate_messages_tokens(messages) + profile.max_tokens,
+                    lambda: dispatcher.chat(messages, profile=profile),
+                )
+        except BudgetExhausted:
+            return False
+        except Exception:  # noqa: BLE001
+            logger.exception("LLM %s failed: %s", field, paper_id)
+            return False
+        _attach_cached_field(paper, paper_id, field, text, fingerprint)
+        return True
+
+    try:
+        results = await asyncio.gather(*(run(*job) for job in jobs))
+    finally:
+        await _close_dispatcher(dispatcher)
+        flush_cache()
+    return sum(results)
+
+
 def analyze_papers(state: State):
     logger.info("Analyzing papers...")
 
-    analyzed: List[Dict[str, Any]] = []
-    total = len(state.get("raw_papers", []))
+    papers = state.get("raw_papers", [])
+    total = len(papers)
     cache_hits = 0
-    generated = 0
+    revision_reuses = 0
+    jobs = []
+    model = get_llm().model
+    schedule = scheduler_for(state, ANALYSIS_TIME_SHARE)
 
-    for paper in state.get("raw_papers", []):
+    for paper in prioritize(papers, state.get("categories")):
         paper_id = paper_id_from_url(paper["url"])
-        cached = load_cache(paper_id)
+        fingerprint = analysis_fingerprint(paper, model)
+        cached_analysis = _load_fresh_field(paper_id, "analysis", fingerprint)
 
-        if cached and "analysis" in cached:
+        if cached_analysis is not None:
             logger.info("Cache hit: %s (analysis)", paper_id)
-            paper["analysis"] = cached["analysis"]
-            analyzed.append(paper)
+            paper["analysis"] = cached_analysis
             cache_hits += 1
             continue
 
+        reused = reuse_prior_revision(paper, paper_id, model, revision_reuse_threshold())
+        if reused:
+            paper["analysis"] = reused["analysis"]
+            revision_reuses += 1
+            continue
+
         logger.info("🔍 LLM analysis: %s", paper_id)
-        prompt = build_analysis_prompt(paper)
-        analysis = llm.invoke(prompt).content
-        _attach_cached_field(paper, paper_id, cached, "analysis", analysis)
-        analyzed.append(paper)
-        generated += 1
+        jobs.append((paper, paper_id, fingerprint))
+
+    generated = (
+        run_async(
+            _generate_fields(jobs, "analysis", ANALYSIS_PROFILE, _analysis_messages, schedule)
+        )
+        if jobs
+        else 0
+    )
+    record_cache("analysis", cache_hits, total)
 
+    deferred = sum(schedule.deferred.values())
     logger.info(
-        "Analysis stats - total: %s, cache hits: %s, generated: %s",
+        "Analysis stats - total: %s, cache hits: %s, revision reuses: %s, "
+        "generated: %s, deferred: %s, failures: %s",
         total,
         cache_hits,
+        revision_reuses,
         generated,
+        deferred,
+        len(jobs) - generated - deferred,
     )
-    state["analyzed"] = analyzed
+    schedule.log_summary("analysis")
+    state["analyzed"] = [paper for paper in papers if "analysis" in paper]
     return state
 
 
+async def _score_jobs(jobs: List[ScoreJob], schedule: Scheduler) -> Tuple[int, int]:
+    """Score les jobs par lots de `SCORE_BATCH_SIZE` et met chaque score en cache.
+
+    Les lots sont admis par `schedule` dans l'ordre des jobs ; un lot refusé
+    ou interrompu n'est pas scoré. Renvoie `(générés, reportés)`.
+    """
+    dispatcher = llm_dispatcher()
+    by_id = {paper_id: (paper, fingerprint) for paper, paper_id, fingerprint in jobs}
+    items = [(paper_id, paper["analysis"]) for paper, paper_id, _ in jobs]
+    size = max(1, score_batch_size())
+
+    async def run(batch) -> Dict[str, str | Exception]:
+        try:
+            return await schedule.run(score_cost(batch), lambda: score_batch(dispatcher, batch))
+        except BudgetExhausted as exc:
+            return {paper_id: exc for paper_id, _ in batch}
+
+    try:
+        batches = await asyncio.gather(
+            *(run(items[idx : idx + size]) for idx in range(0, len(items), size))
+        )
+    finally:
+        await _close_dispatcher(dispatcher)
+
+    generated = deferred = 0
+    for scores in batches:
+        for paper_id, score in scores.items():
+            if isinstance(score, BudgetExhausted):
+                deferred += 1
+                continue
+            if isinstance(score, Exception):
+                continue
+            paper, fingerprint = by_id[paper_id]
+            _attach_cached_field(paper, paper_id, "score", score, fingerprint)
+            generated += 1
+    flush_cache()
+    return generated, deferred
+
+
 def score_papers(state: State):
     logger.info("Scoring papers...")
 
-    scored: List[Dict[str, Any]] = []
-    total = len(state.get("analyzed", []))
+    papers = state.get("analyzed", [])
+    total = len(papers)
     cache_hits = 0
-    generated = 0
+    jobs = []
+    model = get_llm().model
+    schedule = scheduler_for(state)
 
-    for paper in state.get("analyzed", []):
+    for paper in prioritize(papers, state.get("categories")):
         paper_id = paper_id_from_url(paper["url"])
-        cached = load_cache(paper_id)
+        fingerprint = score_fingerprint(paper["analysis"], model)
+        cached_score = _load_fresh_field(paper_id, "score", fingerprint)
 
-        if cached and "score" in cached:
+        if cached_score is not None:
             logger.info("⚡ Cache hit: %s (score)", paper_id)
-            paper["score"] = cached["score"]
-            scored.append(paper)
+            paper["score"] = cached_score
             cache_hits += 1
             continue
 
         logger.info("🏷️ LLM scoring: %s", paper_id)
-        prompt = build_score_prompt(paper["analysis"])
-        score_json = llm.invoke(prompt).content
-        _attach_cached_field(paper, paper_id, cached, "score", score_json)
-        scored.append(paper)
-        generated += 1
+        jobs.append((paper, paper_id, fingerprint))
+
+    generated, deferred = run_async(_score_jobs(jobs, schedule)) if jobs else (0, 0)
+    record_cache("score", cache_hits, total)
 
     logger.info(
-        "Score stats - total: %s, cache hits: %s, generated: %s",
+        "Score stats - total: %s, cache hits: %s, generated: %s, deferred: %s, failures: %s",
         total,
         cache_hits,
         generated,
+        deferred,
+        len(jobs) - generated - deferred,
     )
-    state["scored"] = scored
+    schedule.log_summary("scoring")
+    state["scored"] = [paper for paper in papers if "score" in paper]
     return state
 
 
+async def _stream_paper(
+    paper: Dict[str, Any],
+    downloader: "PdfDownloader",
+    extractor: PdfExtractor,
+    dispatcher: "LLMDispatcher",
+    scorer: ScoreBatcher,
+    pdf_slots: asyncio.Semaphore,
+    llm_slots: asyncio.Semaphore,
+    schedule: Scheduler,
+    stats: Counter,
+):
+    paper_id = paper_id_from_url(paper["url"])
+
+    if attach_cached_content(paper, paper_id):
+        stats["content cache hits"] += 1
+    elif not paper.get("pdf_url"):
+        logger.warning("No PDF found for %s", paper_id)
+        stats["missing pdf"] += 1
+    else:
+        # Borne le nombre de PDF (octets bruts) gardés en mémoire à la fois.
+        async with pdf_slots:
+            try:
+                pdf_bytes = await asyncio.wrap_future(downloader.submit(paper["pdf_url"]))
+                extracted = await extractor.extract(pdf_bytes)
+            except Exception:  # noqa: BLE001
+                logger.exception("Unable to fetch PDF %s", paper_id)
+                stats["pdf failures"] += 1
+            else:
+                _attach_extraction(paper, paper_id, extracted, stats)
+                del extracted
+                stats["downloaded"] += 1
+
+    async def analyze() -> str:
+        # Texte lu en cache une fois le créneau obtenu, libéré avec le prompt.
+        async with llm_slots:
+            schedule.check()
+            messages = _analysis_messages(paper, paper_id)
+            return await schedule.run(
+                estimate_messages_tokens(messages) + ANALYSIS_PROFILE.max_tokens,
+                lambda: dispatcher.chat(messages, profile=ANALYSIS_PROFILE),
+            )
+
+    async def score() -> str:
+        analysis = paper["analysis"]
+        return await schedule.run(
+            score_cost([(paper_id, analysis)]), lambda: scorer.score(paper_id, analysis)
+        )
+
+    for field, generate, build_fingerprint in (
+        (
+            "analysis",
+            analyze,
+            lambda: analysis_fingerprint(paper, dispatcher.client.model),
+        ),
+        (
+            "score",
+            score,
+            lambda: score_fingerprint(paper["analysis"], dispatcher.client.model),
+        ),
+    ):
+        fingerprint = build_fingerprint()
+        cached_value = _load_fresh_field(paper_id, field, fingerprint)
+        if cached_value is not None:
+            paper[field] = cached_value
+            stats[f"{field} cache hits"] += 1
+            continue
+        if field == "analysis":
+            reused = reuse_prior_revision(
+                paper, paper_id, dispatcher.client.model, revision_reuse_threshold()
+            )
+            if reused:
+                paper[field] = reused[field]
+                stats["revision reuses"] += 1
+                continue
+        try:
+            text = await generate()
+        except BudgetExhausted:
+            stats[f"{field} deferred"] += 1
+            return
+        except Exception:  # noqa: BLE001
+            logger.exception("LLM %s failed: %s", field, paper_id)
+            stats[f"{field} failures"] += 1
+            return
+        _attach_cached_field(paper, paper_id, field, text, fingerprint)
+        stats[f"{field} generated"] += 1
+
+
+async def _stream_papers(papers: List[Dict[str, Any]], schedule: Scheduler, stats: Counter):
+    dispatcher = llm_dispatcher()
+    scorer = ScoreBatcher(dispatcher, score_batch_size())
+    llm_slots = asyncio.Semaphore(max(1, llm_concurrency()))
+    with pdf_tools() as (downloader, extractor):
+        pdf_slots = asyncio.Semaphore(2 * (pdf_download_workers() + extractor.max_workers))
+        try:
+            await asyncio.gather(
+                *(
+                    _stream_paper(
+                        paper,
+                        downloader,
+                        extractor,
+                        dispatcher,
+                        scorer,
+                        pdf_slots,
+                        llm_slots,
+                        schedule,
+                        stats,
+                    )
+                    for paper in papers
+                )
+            )
+        finally:
+            await _close_dispatcher(dispatcher)
+            flush_cache()
+
+
+def process_papers(state: State):
+    """Fait progresser chaque papier indépendamment : PDF → analyse → score.
+
+    Remplace `fetch_pdf_content`, `analyze_papers` et `score_papers` en mode
+    streaming : un papier est analysé dès que son PDF est extrait, et scoré
+    dès que son analyse est prête, sans attendre le reste du lot.
+    """
+    logger.info("Processing papers (streaming)...")
+
+    papers = state.get("raw_papers", [])
+    stats: Counter = Counter()
+    schedule = scheduler_for(state)
+    if papers:
+        # Les créneaux LLM sont servis dans l'ordre : papiers les plus prometteurs d'abord.
+        run_async(_stream_papers(prioritize(papers, state.get("categories")), schedule, stats))
+
+    record_cache("content", stats["content cache hits"], len(papers))
+    for field in ("analysis", "score"):
+        hits = stats[f"{field} cache hits"]
+        lookups = hits + sum(
+            stats[f"{field} {outcome}"] for outcome in ("generated", "deferred", "failures")
+        )
+        if field == "analysis":
+            lookups += stats["revision reuses"]
+        record_cache(field, hits, lookups)
+    logger.info(
+        "Streaming stats - total: %s, %s",
+        len(papers),
+        ", ".join(f"{key}: {value}" for key, value in sorted(stats.items())),
+    )
+    schedule.log_summary("streaming")
+    state["raw_papers"] = papers
+    state["analyzed"] = [paper for paper in papers if "analysis" in paper]
+    state["scored"] = [paper for paper in papers if "score" in paper]
+    return state
+
+
+def linkedin_messages(papers: List[Dict[str, Any]], language: str) -> List[Dict[str, str]]:
+    """Messages (système + brief) de rédaction d'un post LinkedIn sur `papers`."""
+    return [
+        {"role": "system", "content": linkedin_system_prompt()},
+        {"role": "user", "content": build_linkedin_user_prompt(papers, language)},
+    ]
+
+
 def write_linkedin_post(state: State):
     logger.info("Drafting LinkedIn post...")
     top_papers = collect_scored_papers(state)[:5]
@@ -238,14 +726,11 @@ def write_linkedin_post(state: State):
         state["linkedin_post"] = ""
         return state
 
-    language = linkedin_language()
-    temperature = linkedin_temperature()
-    user_prompt = build_linkedin_user_prompt(top_papers, language)
-    messages = [
-        {"role": "system", "content": LINKEDIN_SYSTEM_PROMPT},
-        {"role": "user", "content": user_prompt},
-    ]
-    post = llm.invoke_chat(messages, temperature=temperature).content
+    post = get_llm().invoke_chat(
+        linkedin_messages(top_papers, linkedin_language()),
+        temperature=linkedin_temperature(),
+        profile=LINKEDIN_PROFILE,
+    ).content
     state["linkedin_post"] = post
     state["top_papers"] = top_papers
     return state
@@ -1,4 +1,5 @@
 import json
+import re
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ValidationError
@@ -16,31 +17,109 @@ class Score(BaseModel):
     score_global: Optional[float] = None
 
 
+_JSON_START_RE = re.compile(r"[\[{]")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _strip_code_fence(payload: str) -> str:
+    text = payload.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return text.strip()
+
+
+def extract_json(payload: str, expected: type | tuple = (dict, list)) -> Any:
+    """Extrait la première valeur JSON de type `expected` d'une réponse LLM.
+
+    Tolère les blocs de code Markdown et le texte autour du JSON
+    (« Here is the score: {...} »). Retourne `None` si aucune valeur
+    adéquate n'est trouvée.
+    """
+    if not isinstance(payload, str):
+        return None
+    try:
+        value = json.loads(_strip_code_fence(payload))
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(value, expected):
+            return value
+    for match in _JSON_START_RE.finditer(payload):
+        try:
+            value, _ = _JSON_DECODER.raw_decode(payload, match.start())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, expected):
+            return value
+    return None
+
+
 def parse_score(score_payload: str) -> Dict[str, Any]:
     """Parse et valide la charge utile JSON d'un score avec Pydantic.
 
     Retourne toujours un dictionnaire (éventuellement vide) pour rester
     compatible avec le reste du code.
     """
-    try:
-        raw = json.loads(score_payload)
-    except json.JSONDecodeError:
+    raw = extract_json(score_payload, dict)
+    if raw is None:
         return {}
 
     try:
         score = Score.model_validate(raw)
     except ValidationError:
         # Si la validation échoue, on revient au dictionnaire brut.
-        return raw if isinstance(raw, dict) else {}
+        return raw
 
     return score.model_dump(exclude_none=True)
 
 
+def has_global_score(score_payload: str) -> bool:
+    """Indique si la réponse contient un `score_global` numérique exploitable."""
+    return isinstance(parse_score(score_payload).get("score_global"), (int, float))
+
+
+def parse_batch_scores(payload: str, paper_ids: List[str]) -> Dict[str, str]:
+    """Parse la réponse d'un scoring groupé (tableau JSON d'objets `paper_id` + scores).
+
+    Retourne, pour chaque papier attendu dont l'entrée est valide, son score
+    sérialisé en JSON (même format que le scoring unitaire). Les papiers
+    absents ou invalides sont omis pour être rescorés individuellement.
+    """
+    raw = extract_json(payload)
+    if isinstance(raw, dict):
+        # Certains modèles enveloppent le tableau (`{"scores": [...]}`).
+        raw = next((value for value in raw.values() if isinstance(value, list)), None)
+    if not isinstance(raw, list):
+        return {}
+
+    expected = set(paper_ids)
+    scores: Dict[str, str] = {}
+    for item in raw:
+        if not isinstance(item, dict):
+            continue
+        paper_id = str(item.get("paper_id", ""))
+        if paper_id not in expected or paper_id in scores:
+            continue
+        try:
+            score = Score.model_validate(item)
+        except ValidationError:
+            continue
+        if score.score_global is None:
+            continue
+        scores[paper_id] = json.dumps(score.model_dump(exclude_none=True))
+    return scores
+
+
 def collect_scored_papers(state: State) -> List[Dict[str, Any]]:
     scored: List[Dict[str, Any]] = []
     for paper in state.get("scored", []):
         score_data = parse_score(paper.get("score", "{}"))
-        score_value = float(score_data.get("score_global", 0)) if score_data else 0.0
+        try:
+            score_value = float(score_data.get("score_global") or 0)
+        except (TypeError, ValueError):
+            # Score d'une ancienne exécution sans `score_global` numérique.
+            score_value = 0.0
         paper["score_json"] = score_data
         paper["score_value"] = score_value
         scored.append(paper)
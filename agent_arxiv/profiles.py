@@ -0,0 +1,140 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from cache import paper_id_from_url
+
+from .config import DEFAULT_CATEGORIES, LINKEDIN_PROFILE, linkedin_language, linkedin_temperature
+from .logger import get_logger
+from .metrics import current_node, registry
+from .nodes import build_arxiv_query, linkedin_messages
+from .papers import collect_scored_papers
+from .resources import llm_dispatcher, run_async, warm_resources
+from .workflow import build_workflow, report_metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PostProfile:
+    """Un public cible : catégories (et mots-clés) suivies, langue et taille du post.
+
+    `language` et `temperature` à `None` reprennent `LINKEDIN_POST_LANGUAGE`
+    et `LINKEDIN_POST_TEMPERATURE`. Les `keywords` filtrent localement les
+    papiers sur leur titre et leur résumé (insensible à la casse).
+    """
+
+    name: str
+    categories: Tuple[str, ...] = tuple(DEFAULT_CATEGORIES)
+    keywords: Tuple[str, ...] = ()
+    language: str | None = None
+    temperature: float | None = None
+    top_n: int = 5
+
+    def matches(self, paper: Dict[str, Any]) -> bool:
+        if paper.get("category") not in self.categories:
+            return False
+        if not self.keywords:
+            return True
+        text = f"{paper.get('title', '')}\n{paper.get('abstract', '')}".lower()
+        return any(keyword.lower() in text for keyword in self.keywords)
+
+
+@dataclass
+class ProfileResult:
+    profile: PostProfile
+    papers: List[Dict[str, Any]] = field(default_factory=list)
+    linkedin_post: str = ""
+
+
+def load_profiles(path: Path) -> List[PostProfile]:
+    """Lit une liste de profils JSON (`[{"name": ..., "categories": [...], ...}]`)."""
+    entries = json.loads(Path(path).read_text(encoding="utf-8"))
+    profiles = []
+    for entry in entries:
+        for key in ("categories", "keywords"):
+            if key in entry:
+                entry[key] = tuple(entry[key])
+        profiles.append(PostProfile(**entry))
+    names = [profile.name for profile in profiles]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate profile names in {path}")
+    return profiles
+
+
+def union_categories(profiles: List[PostProfile]) -> List[str]:
+    return sorted({category for profile in profiles for category in profile.categories})
+
+
+async def _draft_posts(results: List[ProfileResult]) -> List[str]:
+    dispatcher = llm_dispatcher()
+
+    async def draft(result: ProfileResult) -> str:
+        # Attribue les tokens de chaque post à son profil dans les métriques.
+        current_node.set(f"write_linkedin_post[{result.profile.name}]")
+        profile = result.profile
+        try:
+            return await dispatcher.chat(
+                linkedin_messages(result.papers, profile.language or linkedin_language()),
+                temperature=(
+                    profile.temperature
+                    if profile.temperature is not None
+                    else linkedin_temperature()
+                ),
+                profile=LINKEDIN_PROFILE,
+            )
+        except Exception:  # noqa: BLE001
+            logger.exception("LinkedIn post failed for profile %s", profile.name)
+            return ""
+
+    try:
+        return await asyncio.gather(*(draft(result) for result in results))
+    finally:
+        if warm_resources() is None:
+            await dispatcher.client.close()
+
+
+def run_profiles(profiles: List[PostProfile]) -> List[ProfileResult]:
+    """Exécute une seule fois recherche, PDF, analyse et scoring pour tous les profils.
+
+    La recherche porte sur l'union des catégories ; chaque papier est traité
+    une fois quel que soit le nombre de profils qui le retiennent. Les posts
+    LinkedIn (un par profil) sont ensuite rédigés en parallèle.
+    """
+    if not profiles:
+        return []
+    categories = union_categories(profiles)
+    registry.reset()
+    graph = build_workflow(linkedin_post=False).compile()
+    state = graph.invoke({"query": build_arxiv_query(categories), "categories": categories})
+
+    ranked = collect_scored_papers(state)
+    results = [
+        ProfileResult(profile, [paper for paper in ranked if profile.matches(paper)][: profile.top_n])
+        for profile in profiles
+    ]
+    shared = {
+        paper_id_from_url(paper["url"])
+        for result in results
+        for paper in result.papers
+    }
+    logger.info(
+        "Profiles stats - profiles: %s, scored: %s, selected: %s, unique selected: %s",
+        len(profiles),
+        len(ranked),
+        sum(len(result.papers) for result in results),
+        len(shared),
+    )
+
+    with_papers = [result for result in results if result.papers]
+    for result in results:
+        if not result.papers:
+            logger.warning("No scored papers for profile %s", result.profile.name)
+    if with_papers:
+        posts = run_async(_draft_posts(with_papers))
+        for result, post in zip(with_papers, posts):
+            result.linkedin_post = post
+    report_metrics()
+    return results
@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from .config import (
@@ -16,7 +18,9 @@ def _load_text_file(path) -> str:
         return ""
 
 
-def _load_criteria_prompts() -> List[tuple[str, str, str]]:
+# Les fichiers de prompts sont lus au premier usage puis gardés en mémoire.
+@lru_cache(maxsize=None)
+def criteria_prompts() -> List[tuple[str, str, str]]:
     prompts: List[tuple[str, str, str]] = []
     for key, label, filename in CRITERIA_PROMPT_FILES:
         path = PROMPTS_DIR / filename
@@ -25,71 +29,136 @@ def _load_criteria_prompts() -> List[tuple[str, str, str]]:
     return prompts
 
 
-CRITERIA_PROMPTS = _load_criteria_prompts()
-
-
 def format_criteria_guidelines() -> str:
     sections: List[str] = []
-    for key, label, text in CRITERIA_PROMPTS:
+    for key, label, text in criteria_prompts():
         if not text:
             continue
         sections.append(f"{label} ({key})\n{text}")
     return "\n\n".join(sections)
 
 
-def build_analysis_prompt(paper: Dict[str, Any]) -> str:
-    content = paper.get("content")
-    content_excerpt = ""
-
-    if content:
-        truncated = content[:100000]
-        content_excerpt = f"\nContent excerpt:\n{truncated}\n"
-
-    return f"""
-    Analyze the following paper and produce the requested insights:
-    Title: {paper['title']}
-    Abstract: {paper['abstract']}
-    START Content:
-    {content_excerpt}
-    
-    END Content
-    Return:
-    - The main contributions
-    - The technical innovations
-    - Potential applications
-    - How hard it is to reproduce
-    - A five-line summary
+@dataclass(frozen=True)
+class PromptTemplate:
+    """Prompt compilé : préfixe statique (message système) puis partie variable.
+
+    Le préfixe est identique d'un appel à l'autre, ce qui permet aux serveurs
+    compatibles OpenAI (vLLM…) de réutiliser leur cache de préfixe : seul le
+    message utilisateur, rendu depuis `body`, est propre au papier.
     """
 
+    prefix: str
+    body: str
+
+    def messages(self, **values: Any) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.prefix},
+            {"role": "user", "content": self.body.format(**values)},
+        ]
+
+
+# Gabarits compilés une fois : les consignes de critères ne sont plus relues ni
+# reformatées à chaque appel.
+@lru_cache(maxsize=None)
+def analysis_template() -> PromptTemplate:
+    return PromptTemplate(
+        prefix=(
+            "You analyze AI research papers. Read the paper given by the user"
+            " (title, abstract and content excerpt) and produce the requested insights.\n"
+            "Return:\n"
+            "- The main contributions\n"
+            "- The technical innovations\n"
+            "- Potential applications\n"
+            "- How hard it is to reproduce\n"
+            "- A five-line summary"
+        ),
+        body="Title: {title}\nAbstract: {abstract}\nSTART Content:\n{content}\nEND Content",
+    )
 
-def build_score_prompt(analysis: str) -> str:
-    criteria_guidelines = format_criteria_guidelines()
-    return f"""
-    Given the following analysis:
-    {analysis}
-
-    Use these guidelines for each criterion:
-    {criteria_guidelines}
-
-    Provide a score between 0 and 10 for:
-    - originality
-    - technical impact
-    - reproducibility
-    - short-term potential
-
-    Also output a final global score between 0 and 10.
-    Return JSON with this structure:
-    {{
-      "originalite": x,
-      "impact": x,
-      "repro": x,
-      "potentiel": x,
-      "score_global": x
-    }}
-    """
+
+_SCORE_CRITERIA = (
+    "Provide a score between 0 and 10 for:\n"
+    "- originality\n"
+    "- technical impact\n"
+    "- reproducibility\n"
+    "- short-term potential\n\n"
+    "Also output a final global score between 0 and 10."
+)
+
+
+@lru_cache(maxsize=None)
+def score_template() -> PromptTemplate:
+    return PromptTemplate(
+        prefix=(
+            "You score AI research papers from their analysis, given by the user.\n\n"
+            f"Use these guidelines for each criterion:\n{format_criteria_guidelines()}\n\n"
+            f"{_SCORE_CRITERIA}\n"
+            "Return JSON with this structure:\n"
+            "{\n"
+            '  "originalite": x,\n'
+            '  "impact": x,\n'
+            '  "repro": x,\n'
+            '  "potentiel": x,\n'
+            '  "score_global": x\n'
+            "}"
+        ),
+        body="Analysis:\n{analysis}",
+    )
+
+
+@lru_cache(maxsize=None)
+def batch_score_template() -> PromptTemplate:
+    return PromptTemplate(
+        prefix=(
+            "You score AI research papers from their analyses, given by the user."
+            " Score each paper independently.\n\n"
+            f"Use these guidelines for each criterion:\n{format_criteria_guidelines()}\n\n"
+            f"For every paper, {_SCORE_CRITERIA[0].lower()}{_SCORE_CRITERIA[1:]}\n\n"
+            "Return only a JSON array with exactly one object per paper, using the"
+            " paper identifiers given by the user:\n"
+            "[\n"
+            "  {\n"
+            '    "paper_id": "<paper identifier>",\n'
+            '    "originalite": x,\n'
+            '    "impact": x,\n'
+            '    "repro": x,\n'
+            '    "potentiel": x,\n'
+            '    "score_global": x\n'
+            "  }\n"
+            "]"
+        ),
+        body="Score the following {count} paper analyses.\n\n{analyses}",
+    )
+
+
+def build_analysis_messages(paper: Dict[str, Any]) -> List[Dict[str, str]]:
+    content = paper.get("content") or ""
+    return analysis_template().messages(
+        title=paper["title"], abstract=paper["abstract"], content=content[:100000]
+    )
+
+
+def build_score_messages(analysis: str) -> List[Dict[str, str]]:
+    return score_template().messages(analysis=analysis)
+
+
+SCORE_REPAIR_PROMPT = (
+    "Your previous answer could not be parsed. Reply with only the JSON object"
+    " requested above (keys: originalite, impact, repro, potentiel, score_global),"
+    " without any prose or code fences."
+)
+
+
+def build_batch_score_messages(items: List[tuple[str, str]]) -> List[Dict[str, str]]:
+    """Messages de scoring groupé : une liste `(paper_id, analyse)` → un tableau JSON."""
+    analyses = "\n\n".join(
+        f"### Paper {paper_id}\n{analysis}" for paper_id, analysis in items
+    )
+    return batch_score_template().messages(count=len(items), analyses=analyses)
 
 
-def _load_linkedin_system_prompt() -> str:
+@lru_cache(maxsize=None)
+def linkedin_system_prompt() -> str:
     default_prompt = (
         "You are a LinkedIn thought leader who helps AI enthusiasts"
         " understand cutting-edge research with enthusiasm and clarity."
@@ -99,7 +168,9 @@ def _load_linkedin_system_prompt() -> str:
     return text or default_prompt
 
 
-LINKEDIN_SYSTEM_PROMPT = _load_linkedin_system_prompt()
+@lru_cache(maxsize=None)
+def interest_profile() -> str:
+    return _load_text_file(PROMPTS_DIR / "interest_profile.md")
 
 
 def build_linkedin_user_prompt(papers: List[Dict[str, Any]], language: str) -> str:
@@ -108,12 +179,12 @@ def build_linkedin_user_prompt(papers: List[Dict[str, Any]], language: str) -> s
     return (
         f"Write a LinkedIn post in {language} that curates the top {paper_count} AI papers "
         "from the last 24 hours.\n"
-        "- Begin with a sentence explaining that here is 5 new papers from arXiv on artificial intelligence that are worth a look.\n"
+        f"- Begin with a sentence explaining that here are {paper_count} new papers from arXiv on artificial intelligence that are worth a look.\n"
         "- Dedicate one short paragraph (less than 400 characters) per paper starting with the ranking number (1. / 2. / 3. / etc.) followed with the exact paper title enclosed in double quotes (e.g., \"Attention Is All You Need\"),"
         " followed by the key idea, why it matters, and a concise practical takeaway.\n"
         "- Under each paragraph, add the link sentence formatted as"
         " Lien: <url>.\n"
-        f"- After the five paragraphs, append a one-sentence disclaimer that the content was generated"
+        f"- After the {paper_count} paragraphs, append a one-sentence disclaimer that the content was generated"
         " by a LangChain agentic workflow and link to the open-source code at "
         f"{REPO_URL}.\n"
         "Constraints: stay factual, avoid marketing buzzwords and filler, do not use emojis, do not use"
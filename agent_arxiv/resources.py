@@ -0,0 +1,176 @@
+import asyncio
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Coroutine, Iterator, Tuple, TypeVar
+
+from .config import (
+    arxiv_api_url,
+    llm_concurrency,
+    llm_max_retries,
+    llm_requests_per_minute,
+    llm_tokens_per_minute,
+    pdf_download_per_host,
+    pdf_download_retries,
+    pdf_download_workers,
+    pdf_extract_timeout,
+    pdf_extract_workers,
+    pdf_max_bytes,
+    pdf_max_chars,
+    pdf_max_pages,
+    search_page_size,
+)
+from .extraction import PdfExtractor
+from .logger import get_logger
+
+# `arxiv`, `openai` et `requests` ne sont importés qu'à la création des clients.
+if TYPE_CHECKING:
+    import arxiv
+
+    from llm_client import LLMClient, LLMDispatcher
+
+    from .downloads import PdfDownloader
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def new_arxiv_client() -> "arxiv.Client":
+    import arxiv
+
+    client = arxiv.Client(page_size=search_page_size())
+    if arxiv_api_url():
+        client.query_url_format = f"{arxiv_api_url()}?{{}}"
+    return client
+
+
+def new_downloader() -> "PdfDownloader":
+    from .downloads import PdfDownloader
+
+    return PdfDownloader(
+        max_workers=pdf_download_workers(),
+        per_host_limit=pdf_download_per_host(),
+        max_retries=pdf_download_retries(),
+    )
+
+
+def new_extractor() -> PdfExtractor:
+    return PdfExtractor(
+        max_workers=pdf_extract_workers() or None,
+        max_pages=pdf_max_pages(),
+        max_bytes=pdf_max_bytes(),
+        timeout=pdf_extract_timeout(),
+        max_chars=pdf_max_chars(),
+    )
+
+
+def new_dispatcher() -> "LLMDispatcher":
+    from llm_client import AsyncLLMClient, LLMDispatcher
+
+    # Les rejeux sont gérés par le dispatcher, pas par le client OpenAI.
+    return LLMDispatcher(
+        AsyncLLMClient(max_retries=0),
+        max_concurrency=llm_concurrency(),
+        requests_per_minute=llm_requests_per_minute(),
+        tokens_per_minute=llm_tokens_per_minute(),
+        max_retries=llm_max_retries(),
+    )
+
+
+class WarmResources:
+    """Clients conservés d'une exécution à l'autre (mode service).
+
+    Client ArXiv, session HTTP des PDF, pool d'extraction et dispatcher LLM
+    sont créés une fois ; les coroutines des nœuds s'exécutent toutes sur la
+    même boucle asyncio, à laquelle le client `AsyncOpenAI` (pool de
+    connexions) et les primitives du dispatcher restent attachés. Les
+    exécutions doivent donc être séquentielles.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.arxiv_client = new_arxiv_client()
+        self.downloader = new_downloader()
+        self._extractor = new_extractor()
+        self.dispatcher = new_dispatcher()
+
+    @property
+    def extractor(self) -> PdfExtractor:
+        # Un pool dont un worker est mort refuse tout nouveau job : on le
+        # remplace avant de le prêter à nouveau (un timeout le remplace aussitôt).
+        if self._extractor.broken:
+            logger.info("Replacing PDF extraction pool after a dead worker")
+            self._extractor.close()
+            self._extractor = new_extractor()
+        return self._extractor
+
+    def run(self, coroutine: Coroutine[None, None, T]) -> T:
+        return self.loop.run_until_complete(coroutine)
+
+    def close(self):
+        self.loop.run_until_complete(self.dispatcher.client.close())
+        self.loop.close()
+        self.downloader.close()
+        self._extractor.close()
+
+
+_warm: WarmResources | None = None
+_llm: "LLMClient | None" = None
+
+
+def get_llm() -> "LLMClient":
+    """Client LLM synchrone partagé, créé au premier appel (clé d'API requise)."""
+    global _llm
+    if _llm is None:
+        from llm_client import LLMClient
+
+        _llm = LLMClient()
+    return _llm
+
+
+def set_llm(client: "LLMClient | None"):
+    """Injecte le client LLM synchrone utilisé par les nœuds (`None` = défaut)."""
+    global _llm
+    _llm = client
+
+
+def warm_resources() -> WarmResources | None:
+    """Ressources partagées actives, ou `None` (exécution ponctuelle)."""
+    return _warm
+
+
+@contextmanager
+def use_warm_resources() -> Iterator[WarmResources]:
+    """Active des ressources partagées pour toutes les exécutions du bloc."""
+    global _warm
+    resources = WarmResources()
+    _warm = resources
+    try:
+        yield resources
+    finally:
+        _warm = None
+        resources.close()
+
+
+def run_async(coroutine: Coroutine[None, None, T]) -> T:
+    """`asyncio.run`, ou la boucle persistante des ressources partagées si actives."""
+    if _warm is not None:
+        return _warm.run(coroutine)
+    return asyncio.run(coroutine)
+
+
+@contextmanager
+def pdf_tools() -> Iterator[Tuple["PdfDownloader", PdfExtractor]]:
+    """Téléchargeur et extracteur : partagés si actifs, sinon créés puis fermés."""
+    if _warm is not None:
+        yield _warm.downloader, _warm.extractor
+        return
+    with new_downloader() as downloader, new_extractor() as extractor:
+        yield downloader, extractor
+
+
+def arxiv_client() -> "arxiv.Client":
+    return _warm.arxiv_client if _warm is not None else new_arxiv_client()
+
+
+def llm_dispatcher() -> "LLMDispatcher":
+    return _warm.dispatcher if _warm is not None else new_dispatcher()
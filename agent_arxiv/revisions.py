@@ -0,0 +1,95 @@
+import re
+from typing import Any, Dict, Set
+
+from cache import list_revisions, load_cache_field, save_cache_field, split_paper_version
+
+from .content_store import CONTENT_DIGEST, load_paper_content
+from .fingerprints import analysis_fingerprint, digest, score_fingerprint
+from .logger import get_logger
+
+SHINGLE_SIZE = 5
+_WORD_RE = re.compile(r"\w+")
+
+logger = get_logger(__name__)
+
+
+def _shingles(text: str) -> Set[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {hash(tuple(words))} if words else set()
+    return {
+        hash(tuple(words[idx : idx + SHINGLE_SIZE]))
+        for idx in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def text_similarity(left: str, right: str) -> float:
+    """Similarité de Jaccard entre les shingles de mots de deux textes (0 à 1)."""
+    left_shingles, right_shingles = _shingles(left), _shingles(right)
+    if not left_shingles and not right_shingles:
+        return 1.0
+    union = left_shingles | right_shingles
+    return len(left_shingles & right_shingles) / len(union)
+
+
+def reuse_prior_revision(
+    paper: Dict[str, Any], paper_id: str, model: str | None, threshold: float
+) -> Dict[str, Any]:
+    """Réutilise l'analyse (et le score) d'une révision antérieure quasi identique.
+
+    Cherche en cache les révisions précédentes du même ID de base, de la plus
+    récente à la plus ancienne. Une révision est retenue si son analyse est à
+    jour (mêmes gabarit, modèle, titre et résumé) et si la similarité de son
+    texte avec celui du papier (lu en cache) atteint `threshold`. Les champs
+    copiés sous `paper_id` sont renvoyés ; un dictionnaire vide signifie aucune
+    reprise.
+    """
+    _, version = split_paper_version(paper_id)
+    if version is None or threshold > 1:
+        return {}
+    content = load_paper_content(paper)
+    if not content:
+        return {}
+
+    for prior_id in reversed(list_revisions(paper_id)):
+        if (split_paper_version(prior_id)[1] or 0) >= version:
+            continue
+        prior_content = load_cache_field(prior_id, "content")
+        prior_analysis = load_cache_field(prior_id, "analysis")
+        if not prior_content or prior_analysis is None:
+            continue
+        prior_fingerprint = analysis_fingerprint(
+            {**paper, CONTENT_DIGEST: digest(prior_content)}, model
+        )
+        if load_cache_field(prior_id, "analysis_fingerprint") != prior_fingerprint:
+            continue
+
+        similarity = text_similarity(prior_content, content)
+        if similarity < threshold:
+            logger.info(
+                "Revision %s differs from %s (similarity %.2f)", paper_id, prior_id, similarity
+            )
+            return {}
+
+        reused = {
+            "analysis": prior_analysis,
+            "analysis_fingerprint": analysis_fingerprint(paper, model),
+            "reused_from": prior_id,
+        }
+        prior_score = load_cache_field(prior_id, "score")
+        if (
+            prior_score is not None
+            and load_cache_field(prior_id, "score_fingerprint")
+            == score_fingerprint(prior_analysis, model)
+        ):
+            reused["score"] = prior_score
+            reused["score_fingerprint"] = score_fingerprint(prior_analysis, model)
+
+        for field, value in reused.items():
+            save_cache_field(paper_id, field, value)
+        logger.info(
+            "Revision reuse: %s from %s (similarity %.2f)", paper_id, prior_id, similarity
+        )
+        return reused
+
+    return {}
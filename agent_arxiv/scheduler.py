@@ -0,0 +1,245 @@
+import asyncio
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+from cache import CACHE_DIR
+from llm_client import LLMCall, add_usage_listener
+
+from .config import (
+    DEFAULT_CATEGORIES,
+    LINKEDIN_PROFILE,
+    daily_token_budget,
+    deadline_reserve_seconds,
+)
+from .logger import get_logger
+from .state import State
+
+logger = get_logger(__name__)
+
+# Tokens gardés pour le post LinkedIn : complétion maximale et brief des meilleurs papiers.
+POST_RESERVE_TOKENS = LINKEDIN_PROFILE.max_tokens + 2048
+# Mode par étapes : part du temps restant accordée à l'analyse, le reste au scoring.
+ANALYSIS_TIME_SHARE = 0.8
+
+T = TypeVar("T")
+
+
+class BudgetExhausted(Exception):
+    """Appel LLM non lancé (ou interrompu) : heure limite ou budget de tokens atteint."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def parse_deadline(value: str, now: datetime | None = None) -> datetime | None:
+    """Convertit `HH:MM` (heure locale du jour) ou une date ISO 8601 en datetime UTC."""
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        clock = time.fromisoformat(value)
+    except ValueError:
+        deadline = datetime.fromisoformat(value)
+    else:
+        today = (now or datetime.now()).date()
+        deadline = datetime.combine(today, clock)
+    # Sans fuseau, `astimezone` interprète la date en heure locale.
+    return deadline.astimezone(timezone.utc)
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class TokenLedger:
+    """Tokens LLM consommés par jour (UTC), partagés entre exécutions et processus."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or CACHE_DIR / "token_spend.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_spend ("
+            " day TEXT PRIMARY KEY,"
+            " tokens INTEGER NOT NULL"
+            ")"
+        )
+
+    def spent(self, day: str | None = None) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tokens FROM token_spend WHERE day = ?", (day or _today(),)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def add(self, tokens: int, day: str | None = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO token_spend (day, tokens) VALUES (?, ?) "
+                "ON CONFLICT (day) DO UPDATE SET tokens = tokens + excluded.tokens",
+                (day or _today(), tokens),
+            )
+
+    def record(self, call: LLMCall):
+        """Écouteur d'usage : comptabilise les tokens facturés (pas les réponses en cache)."""
+        if not call.cached:
+            self.add(call.prompt_tokens + call.completion_tokens)
+
+
+@lru_cache(maxsize=None)
+def token_ledger() -> TokenLedger:
+    """Registre du jour, abonné aux appels LLM dès sa première utilisation."""
+    ledger = TokenLedger()
+    add_usage_listener(ledger.record)
+    return ledger
+
+
+class Scheduler:
+    """Admet les appels LLM d'analyse et de scoring tant que l'heure limite et le budget le permettent.
+
+    Chaque appel est admis avec une estimation de son coût (taille du prompt
+    + complétion maximale) : il est refusé si le reste du budget du jour,
+    moins les appels en cours et la réserve du post LinkedIn, ne le couvre
+    pas. Un appel encore en cours à l'heure limite (moins la réserve de
+    temps du post) est annulé. Les papiers refusés ne sont pas mis en cache
+    et seront traités à l'exécution suivante.
+    """
+
+    def __init__(
+        self,
+        deadline: datetime | None = None,
+        token_budget: int = 0,
+        ledger: TokenLedger | None = None,
+        reserve_seconds: float = 0.0,
+        reserve_tokens: int = 0,
+    ):
+        self.deadline = deadline
+        self.token_budget = token_budget
+        self.ledger = ledger
+        self.reserve_seconds = reserve_seconds
+        self.reserve_tokens = reserve_tokens
+        self.deferred: Counter = Counter()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.deadline is not None or self.token_budget > 0
+
+    def time_left(self) -> float | None:
+        """Secondes restantes avant l'heure limite, réserve du post déduite."""
+        if self.deadline is None:
+            return None
+        remaining = (self.deadline - datetime.now(timezone.utc)).total_seconds()
+        return remaining - self.reserve_seconds
+
+    def tokens_left(self) -> int | None:
+        """Tokens encore engageables aujourd'hui (appels en cours et réserve déduits)."""
+        if self.token_budget <= 0 or self.ledger is None:
+            return None
+        return self.token_budget - self.reserve_tokens - self.ledger.spent() - self._in_flight
+
+    def stop_reason(self, estimate: int = 0) -> str | None:
+        """Motif de refus d'un appel de coût `estimate`, ou `None` s'il peut partir."""
+        seconds = self.time_left()
+        if seconds is not None and seconds <= 0:
+            return "deadline"
+        tokens = self.tokens_left()
+        if tokens is not None and tokens < max(estimate, 1):
+            return "token budget"
+        return None
+
+    def check(self):
+        """Lève `BudgetExhausted` si plus aucun appel ne peut partir (avant de préparer un prompt)."""
+        reason = self.stop_reason() if self.active else None
+        if reason is not None:
+            self.deferred[reason] += 1
+            raise BudgetExhausted(reason)
+
+    async def run(self, estimate: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Lance `call` s'il est admis ; lève `BudgetExhausted` sinon (ou à l'heure limite)."""
+        if not self.active:
+            return await call()
+        with self._lock:
+            reason = self.stop_reason(estimate)
+            if reason is None:
+                self._in_flight += estimate
+        if reason is not None:
+            self.deferred[reason] += 1
+            raise BudgetExhausted(reason)
+        try:
+            return await asyncio.wait_for(call(), self.time_left())
+        except asyncio.TimeoutError:
+            self.deferred["deadline"] += 1
+            raise BudgetExhausted("deadline") from None
+        finally:
+            with self._lock:
+                self._in_flight -= estimate
+
+    def log_summary(self, stage: str):
+        if not self.active:
+            return
+        tokens = self.tokens_left()
+        seconds = self.time_left()
+        logger.info(
+            "Schedule stats - stage: %s, deferred calls: %s, tokens left: %s, seconds left: %s",
+            stage,
+            ", ".join(f"{reason}: {count}" for reason, count in sorted(self.deferred.items()))
+            or "0",
+            "unlimited" if tokens is None else max(tokens, 0),
+            "unlimited" if seconds is None else round(max(seconds, 0.0)),
+        )
+
+
+def scheduler_for(state: State, time_share: float = 1.0) -> Scheduler:
+    """Planificateur d'une étape : heure limite de l'état et budget du jour.
+
+    `RUN_DEADLINE` n'est résolue que par `run_workflow`, qui la place dans
+    l'état : backfill, service, workers et profils n'ont pas d'heure limite.
+    Avec `time_share` < 1, l'étape ne dispose que de cette part du temps
+    restant, pour laisser aux étapes suivantes le temps de finir.
+    """
+    deadline = state.get("deadline")
+    deadline = datetime.fromisoformat(deadline) if deadline else None
+    reserve = deadline_reserve_seconds()
+    if deadline is not None and time_share < 1:
+        available = (deadline - datetime.now(timezone.utc)).total_seconds() - reserve
+        if available > 0:
+            deadline -= timedelta(seconds=available * (1 - time_share))
+    budget = daily_token_budget()
+    return Scheduler(
+        deadline=deadline,
+        token_budget=budget,
+        ledger=token_ledger() if budget > 0 else None,
+        reserve_seconds=reserve,
+        reserve_tokens=POST_RESERVE_TOKENS if budget > 0 else 0,
+    )
+
+
+def prioritize(
+    papers: List[Dict[str, Any]], categories: List[str] | None = None
+) -> List[Dict[str, Any]]:
+    """Ordonne les papiers par valeur attendue, les plus prometteurs d'abord.
+
+    Score de tri (titre + résumé contre le profil d'intérêt) décroissant,
+    puis rang de la catégorie principale dans `categories` ; l'ordre
+    d'origine départage les égalités.
+    """
+    ranks = {category: rank for rank, category in enumerate(categories or DEFAULT_CATEGORIES)}
+    return sorted(
+        papers,
+        key=lambda paper: (
+            -paper.get("triage_score", 0.0),
+            ranks.get(paper.get("category"), len(ranks)),
+        ),
+    )
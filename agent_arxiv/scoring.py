@@ -0,0 +1,157 @@
+import asyncio
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from llm_client.tokens import estimate_tokens
+
+from .config import (
+    BATCH_SCORE_PROFILE,
+    BATCH_SCORE_TOKENS_PER_PAPER,
+    SCORE_PROFILE,
+    score_parse_retries,
+)
+from .logger import get_logger
+from .papers import has_global_score, parse_batch_scores
+from .prompts import (
+    SCORE_REPAIR_PROMPT,
+    batch_score_template,
+    build_batch_score_messages,
+    build_score_messages,
+    score_template,
+)
+
+if TYPE_CHECKING:
+    from llm_client import LLMDispatcher
+
+ScoreItem = Tuple[str, str]
+
+logger = get_logger(__name__)
+
+
+class ScoreParseError(ValueError):
+    """Erreur levée lorsqu'aucune réponse ne contient de `score_global` exploitable."""
+
+
+def score_cost(items: List[ScoreItem]) -> int:
+    """Estimation des tokens (prompt + complétion maximale) du scoring d'un lot."""
+    prompt_tokens = sum(estimate_tokens(analysis) for _, analysis in items)
+    if len(items) == 1:
+        return prompt_tokens + estimate_tokens(score_template().prefix) + SCORE_PROFILE.max_tokens
+    return (
+        prompt_tokens
+        + estimate_tokens(batch_score_template().prefix)
+        + BATCH_SCORE_PROFILE.max_tokens
+        + BATCH_SCORE_TOKENS_PER_PAPER * len(items)
+    )
+
+
+async def score_one(dispatcher: "LLMDispatcher", paper_id: str, analysis: str) -> str:
+    """Score une analyse ; redemande le JSON si la réponse est illisible.
+
+    Seule la réponse fautive est reprise (`SCORE_PARSE_RETRIES` fois au plus),
+    en conversation avec la réponse précédente : le reste du lot n'est pas
+    rejoué. Une réponse encore illisible lève `ScoreParseError` : elle n'est
+    pas mise en cache et le papier sera rescoré à la prochaine exécution.
+    """
+    messages = build_score_messages(analysis)
+    text = await dispatcher.chat(messages, profile=SCORE_PROFILE)
+    for attempt in range(score_parse_retries()):
+        if has_global_score(text):
+            break
+        logger.warning("Unparsable score for %s, asking again (%s)", paper_id, attempt + 1)
+        text = await dispatcher.chat(
+            [
+                *messages,
+                {"role": "assistant", "content": text},
+                {"role": "user", "content": SCORE_REPAIR_PROMPT},
+            ],
+            profile=SCORE_PROFILE,
+        )
+    if not has_global_score(text):
+        raise ScoreParseError(f"No usable score_global for {paper_id}")
+    return text
+
+
+async def score_batch(
+    dispatcher: "LLMDispatcher", items: List[ScoreItem]
+) -> Dict[str, str | Exception]:
+    """Score un lot `(paper_id, analyse)` en un seul appel LLM.
+
+    Chaque papier absent ou invalide dans la réponse groupée est rescoré
+    individuellement ; un échec définitif est renvoyé comme exception.
+    """
+    scores: Dict[str, str | Exception] = {}
+    if len(items) > 1:
+        try:
+            profile = replace(
+                BATCH_SCORE_PROFILE,
+                max_tokens=BATCH_SCORE_PROFILE.max_tokens
+                + BATCH_SCORE_TOKENS_PER_PAPER * len(items),
+            )
+            payload = await dispatcher.chat(build_batch_score_messages(items), profile=profile)
+            scores.update(parse_batch_scores(payload, [paper_id for paper_id, _ in items]))
+        except Exception:  # noqa: BLE001
+            logger.exception("Batch scoring failed (%s papers)", len(items))
+        missing = len(items) - len(scores)
+        if missing:
+            logger.warning("Batch scoring fallback: %s of %s papers", missing, len(items))
+
+    async def fallback(paper_id: str, analysis: str) -> Tuple[str, str | Exception]:
+        try:
+            return paper_id, await score_one(dispatcher, paper_id, analysis)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("LLM score failed: %s", paper_id)
+            return paper_id, exc
+
+    fallbacks = [item for item in items if item[0] not in scores]
+    scores.update(await asyncio.gather(*(fallback(*item) for item in fallbacks)))
+    return scores
+
+
+class ScoreBatcher:
+    """Regroupe à la volée les demandes de scoring du pipeline streaming.
+
+    Un lot part dès qu'il atteint `batch_size` papiers, ou après `linger`
+    secondes si les analyses arrivent au compte-gouttes.
+    """
+
+    def __init__(self, dispatcher: "LLMDispatcher", batch_size: int, linger: float = 2.0):
+        self.dispatcher = dispatcher
+        self.batch_size = max(1, batch_size)
+        self.linger = linger
+        self._queue: List[Tuple[str, str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def score(self, paper_id: str, analysis: str) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((paper_id, analysis, future))
+        if len(self._queue) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.linger, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, str, asyncio.Future]]):
+        results = await score_batch(
+            self.dispatcher, [(paper_id, analysis) for paper_id, analysis, _ in batch]
+        )
+        for paper_id, _, future in batch:
+            if future.done():  # demande annulée entre-temps (heure limite)
+                continue
+            result = results.get(paper_id)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,45 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from cache import CACHE_DIR
+
+# Hors de la racine de `CACHE_DIR`, où chaque `<id>.json` est un papier (backend
+# `json`, migration vers SQLite).
+SEARCH_STATE_PATH = CACHE_DIR / "state" / "search_state.json"
+LEGACY_SEARCH_STATE_PATH = CACHE_DIR / "search_state.json"
+
+
+def _read_all() -> Dict[str, Any]:
+    if LEGACY_SEARCH_STATE_PATH.exists() and not SEARCH_STATE_PATH.exists():
+        SEARCH_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        LEGACY_SEARCH_STATE_PATH.replace(SEARCH_STATE_PATH)
+    try:
+        with open(SEARCH_STATE_PATH, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_search_state(query: str) -> Tuple[datetime | None, List[Dict[str, Any]]]:
+    """Retourne le high-water mark et les papiers déjà vus pour `query`."""
+    entry = _read_all().get(query) or {}
+    watermark = entry.get("watermark")
+    return (
+        datetime.fromisoformat(watermark) if watermark else None,
+        entry.get("papers", []),
+    )
+
+
+def save_search_state(query: str, watermark: datetime | None, papers: List[Dict[str, Any]]):
+    """Persiste le high-water mark et les papiers de la fenêtre pour `query`."""
+    data = _read_all()
+    data[query] = {
+        "watermark": watermark.isoformat() if watermark else None,
+        "papers": papers,
+    }
+    SEARCH_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SEARCH_STATE_PATH.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    tmp_path.replace(SEARCH_STATE_PATH)
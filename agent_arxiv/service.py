@@ -0,0 +1,280 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from cache import paper_id_from_url
+
+from .config import search_incremental, service_host, service_port, service_poll_minutes
+from .logger import get_logger
+from .metrics import MeteredNode, registry
+from .nodes import write_linkedin_post
+from .nodes_base import FunctionNode
+from .papers import collect_scored_papers
+from .resources import use_warm_resources
+from .state import State
+from .workflow import build_workflow, report_metrics
+
+logger = get_logger(__name__)
+
+TOP_PAPERS = 5
+SUMMARY_FIELDS = ("title", "url", "pdf_url", "category", "published", "authors")
+
+
+def _summary(paper: Dict[str, Any]) -> Dict[str, Any]:
+    summary = {"id": paper_id_from_url(paper["url"])}
+    summary.update({key: paper.get(key) for key in SUMMARY_FIELDS})
+    summary["score_value"] = paper.get("score_value", 0.0)
+    summary["scores"] = paper.get("score_json") or {}
+    return summary
+
+
+def _detail(paper: Dict[str, Any]) -> Dict[str, Any]:
+    # Le texte intégral du PDF reste dans le cache : seule l'analyse est exposée.
+    return {**_summary(paper), "abstract": paper.get("abstract"), "analysis": paper.get("analysis")}
+
+
+class ResultStore:
+    """Derniers résultats publiés, lus par l'API pendant que le planificateur travaille.
+
+    Chaque publication remplace l'instantané en bloc : un lecteur voit soit
+    l'ancien, soit le nouveau, jamais un état intermédiaire.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._papers: List[Dict[str, Any]] = []
+        self._details: Dict[str, Dict[str, Any]] = {}
+        self._post: Dict[str, Any] = {"post": "", "top_papers": [], "generated_at": None}
+        self.updated_at: str | None = None
+
+    def publish(self, papers: List[Dict[str, Any]], post: Dict[str, Any] | None = None):
+        summaries = [_summary(paper) for paper in papers]
+        details = {summary["id"]: _detail(paper) for summary, paper in zip(summaries, papers)}
+        with self._lock:
+            self._papers = summaries
+            self._details = details
+            if post is not None:
+                self._post = post
+            self.updated_at = datetime.now(timezone.utc).isoformat()
+
+    def papers(self, limit: int | None = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._papers[:limit] if limit else list(self._papers)
+
+    def paper(self, paper_id: str) -> Dict[str, Any] | None:
+        with self._lock:
+            return self._details.get(paper_id)
+
+    def post(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._post)
+
+
+class PaperService:
+    """Mode service : interroge ArXiv périodiquement et publie les résultats.
+
+    Le graphe compilé, le client LLM et les ressources réseau/extraction
+    (`WarmResources`) restent en mémoire d'une exécution à l'autre ; seuls les
+    papiers nouveaux sont traités (cache et `SEARCH_INCREMENTAL`). Le post
+    LinkedIn n'est régénéré que si le top des papiers a changé.
+    """
+
+    def __init__(self, query: str = "", poll_minutes: float | None = None):
+        self.query = query
+        self.interval = timedelta(
+            minutes=poll_minutes if poll_minutes is not None else service_poll_minutes()
+        )
+        self.store = ResultStore()
+        self.graph = build_workflow(linkedin_post=False).compile()
+        self._post_node = MeteredNode("write_linkedin_post", FunctionNode(write_linkedin_post))
+        self._top_ids: List[str] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.runs = 0
+        self.running = False
+        self.last_run: Dict[str, Any] = {}
+        self.next_run: datetime | None = None
+
+    def run_once(self):
+        """Exécute le workflow une fois et publie son résultat."""
+        started = datetime.now(timezone.utc)
+        registry.reset()
+        result = self.graph.invoke({"query": self.query})
+        papers = collect_scored_papers(result)
+        top_ids = [paper_id_from_url(paper["url"]) for paper in papers[:TOP_PAPERS]]
+        post = None
+        if top_ids and top_ids != self._top_ids:
+            state = self._post_node(State(scored=papers))
+            post = {
+                "post": state.get("linkedin_post", ""),
+                "top_papers": top_ids,
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._top_ids = top_ids
+        report_metrics()
+        self.store.publish(papers, post)
+        self.runs += 1
+        self.last_run = {
+            "started_at": started.isoformat(),
+            "duration_seconds": round((datetime.now(timezone.utc) - started).total_seconds(), 3),
+            "papers": len(result.get("raw_papers", [])),
+            "scored": len(papers),
+            "post_regenerated": post is not None,
+            "error": None,
+        }
+        logger.info(
+            "Service run %s - %s scored papers, post %s",
+            self.runs,
+            len(papers),
+            "regenerated" if post is not None else "unchanged",
+        )
+
+    def _loop(self):
+        with use_warm_resources():
+            while not self._stop.is_set():
+                self.running = True
+                try:
+                    self.run_once()
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("Service run failed")
+                    self.last_run = {
+                        "started_at": datetime.now(timezone.utc).isoformat(),
+                        "error": f"{type(exc).__name__}: {exc}",
+                    }
+                finally:
+                    self.running = False
+                self.next_run = datetime.now(timezone.utc) + self.interval
+                self._wake.wait(self.interval.total_seconds())
+                self._wake.clear()
+
+    def start(self):
+        if not search_incremental():
+            logger.warning(
+                "SEARCH_INCREMENTAL is disabled: each poll re-reads the whole search window"
+            )
+        self._thread = threading.Thread(target=self._loop, name="arxiv-scheduler", daemon=True)
+        self._thread.start()
+
+    def refresh(self):
+        """Déclenche une exécution sans attendre la fin de l'intervalle."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok" if not self.last_run.get("error") else "degraded",
+            "running": self.running,
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "updated_at": self.store.updated_at,
+            "papers": len(self.store.papers()),
+        }
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    server: "ApiServer"
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    def _send_json(self, status: int, payload: Any, cacheable: bool = True):
+        body = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        etag = _etag(body)
+        if cacheable and _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if cacheable:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        else:
+            self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> Tuple[str, Dict[str, List[str]]]:
+        parts = urlsplit(self.path)
+        return parts.path.rstrip("/") or "/", parse_qs(parts.query)
+
+    def do_GET(self):
+        service = self.server.service
+        path, query = self._route()
+        if path == "/health":
+            self._send_json(200, service.health(), cacheable=False)
+        elif path == "/papers":
+            try:
+                limit = int(query.get("limit", ["0"])[0])
+            except ValueError:
+                self._send_json(400, {"error": "limit must be an integer"}, cacheable=False)
+                return
+            # Pas d'horodatage dans le corps : l'ETag ne change que si le classement change.
+            self._send_json(200, {"papers": service.store.papers(limit)})
+        elif path.startswith("/papers/"):
+            paper = service.store.paper(path.removeprefix("/papers/"))
+            if paper is None:
+                self._send_json(404, {"error": "unknown paper"}, cacheable=False)
+            else:
+                self._send_json(200, paper)
+        elif path == "/post":
+            self._send_json(200, service.store.post())
+        else:
+            self._send_json(404, {"error": "not found"}, cacheable=False)
+
+    def do_POST(self):
+        path, _ = self._route()
+        if path == "/refresh":
+            self.server.service.refresh()
+            self._send_json(202, {"status": "scheduled"}, cacheable=False)
+        else:
+            self._send_json(404, {"error": "not found"}, cacheable=False)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """API HTTP locale en lecture seule sur les résultats du service."""
+
+    daemon_threads = True
+
+    def __init__(self, service: PaperService, host: str, port: int):
+        super().__init__((host, port), _ApiHandler)
+        self.service = service
+
+
+def serve(query: str = "", host: str | None = None, port: int | None = None):
+    """Démarre le planificateur et sert l'API jusqu'à interruption (Ctrl-C)."""
+    service = PaperService(query)
+    server = ApiServer(service, host or service_host(), port or service_port())
+    service.start()
+    logger.info("Serving on http://%s:%s", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        service.stop()
@@ -1,5 +1,9 @@
 class State(dict):
     query: str
+    categories: list
+    window_start: str
+    window_end: str
+    deadline: str
     raw_papers: list
     analyzed: list
     scored: list
@@ -0,0 +1,57 @@
+import re
+import zlib
+from typing import Any, Dict, List
+
+import numpy as np
+
+HASH_DIM = 2**14
+_WORD_RE = re.compile(r"[a-z][a-z0-9\-]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have in is it its of on or our "
+    "that the this to we which with these those their using use used via into "
+    "paper propose proposed show shows results new based approach method methods".split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    words = [word for word in _WORD_RE.findall(text.lower()) if word not in _STOPWORDS]
+    return words + [f"{left} {right}" for left, right in zip(words, words[1:])]
+
+
+def _hashed_counts(texts: List[str]) -> np.ndarray:
+    counts = np.zeros((len(texts), HASH_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for term in _terms(text):
+            counts[row, zlib.crc32(term.encode("utf-8")) % HASH_DIM] += 1
+    return counts
+
+
+def relevance_scores(texts: List[str], profile: str) -> np.ndarray:
+    """Similarité cosinus TF-IDF (features hachées) entre chaque texte et le profil."""
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    counts = _hashed_counts(texts + [profile])
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(counts)) / (1 + document_frequency)) + 1
+    weights = np.log1p(counts) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights /= np.where(norms == 0, 1, norms)
+    return weights[:-1] @ weights[-1]
+
+
+def rank_papers(
+    papers: List[Dict[str, Any]], profile: str, top_k: int, min_score: float
+) -> List[Dict[str, Any]]:
+    """Classe les papiers sur titre + résumé et garde les `top_k` au-dessus de `min_score`.
+
+    Le score est stocké dans `paper["triage_score"]`; l'ordre d'origine des
+    papiers retenus est conservé.
+    """
+    texts = [f"{paper.get('title', '')}\n{paper.get('abstract', '')}" for paper in papers]
+    scores = relevance_scores(texts, profile)
+    for paper, score in zip(papers, scores):
+        paper["triage_score"] = round(float(score), 4)
+
+    ranked = sorted(range(len(papers)), key=lambda idx: scores[idx], reverse=True)
+    keep = {idx for idx in ranked[: top_k or None] if scores[idx] >= min_score}
+    return [paper for idx, paper in enumerate(papers) if idx in keep]
@@ -0,0 +1,437 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import groupby
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from cache import CACHE_DIR, paper_id_from_url
+
+from .config import (
+    work_batch_size,
+    work_lease_seconds,
+    work_max_attempts,
+    work_queue_db,
+)
+from .logger import get_logger
+from .metrics import MeteredNode, registry
+from .nodes import process_papers, search_arxiv, triage_papers, write_linkedin_post
+from .nodes_base import FunctionNode
+from .state import State
+from .workflow import report_metrics
+
+logger = get_logger(__name__)
+
+POLL_INTERVAL = 1.0
+
+
+def queue_path() -> Path:
+    return Path(work_queue_db()) if work_queue_db() else CACHE_DIR / "queue.sqlite3"
+
+
+@dataclass
+class Job:
+    run_id: str
+    paper_id: str
+    paper: Dict[str, Any]
+    attempts: int
+
+
+class WorkQueue:
+    """File de jobs par papier partagée entre processus (SQLite, mode WAL).
+
+    Un worker prend des jobs en bail (`lease`) pour `lease_seconds` et le
+    renouvelle (`heartbeat`) tant qu'il travaille. Un bail expiré (worker
+    arrêté ou planté) rend le job à nouveau disponible ; au-delà de
+    `max_attempts` tentatives, le job passe en `failed`.
+    """
+
+    def __init__(self, path: Path | None = None, max_attempts: int | None = None):
+        self.path = path or queue_path()
+        self.max_attempts = max_attempts or work_max_attempts()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions explicites : `BEGIN IMMEDIATE` sérialise les prises de bail.
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY,"
+            " query TEXT NOT NULL,"
+            " created_at TEXT NOT NULL,"
+            " finished_at TEXT"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " run_id TEXT NOT NULL,"
+            " paper_id TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " paper TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " lease_owner TEXT,"
+            " lease_expires REAL,"
+            " error TEXT,"
+            " PRIMARY KEY (run_id, paper_id)"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, run_id)")
+        # Mesures des workers par run, fusionnées et exportées par le coordinateur.
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metrics ("
+            " run_id TEXT NOT NULL,"
+            " worker_id TEXT NOT NULL,"
+            " recorded_at REAL NOT NULL,"
+            " snapshot TEXT NOT NULL"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS metrics_run ON metrics (run_id)")
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def has_run(self, run_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row is not None
+
+    def enqueue(self, run_id: str, query: str, papers: List[Dict[str, Any]]) -> int:
+        """Crée le run et un job par papier (un papier déjà présent n'est pas dupliqué)."""
+        rows = [
+            (run_id, paper_id_from_url(paper["url"]), position, json.dumps(paper))
+            for position, paper in enumerate(papers)
+        ]
+        with self._transaction():
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, query, created_at) VALUES (?, ?, ?)",
+                (run_id, query, datetime.now(timezone.utc).isoformat()),
+            )
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, paper_id, position, paper) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def lease(
+        self, worker_id: str, limit: int, lease_seconds: float, run_id: str | None = None
+    ) -> List[Job]:
+        """Prend en bail jusqu'à `limit` jobs en attente (ou dont le bail a expiré)."""
+        now = time.time()
+        run_filter, run_args = ("AND run_id = ?", (run_id,)) if run_id else ("", ())
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', lease_owner = NULL,"
+                " error = COALESCE(error, 'lease expired') "
+                f"WHERE status = 'leased' AND lease_expires < ? AND attempts >= ? {run_filter}",
+                (now, self.max_attempts, *run_args),
+            )
+            rows = self._conn.execute(
+                "SELECT run_id, paper_id, paper, attempts FROM jobs "
+                "WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                f"{run_filter} ORDER BY run_id, position LIMIT ?",
+                (now, *run_args, max(1, limit)),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1 WHERE run_id = ? AND paper_id = ?",
+                [(worker_id, now + lease_seconds, row[0], row[1]) for row in rows],
+            )
+        return [Job(row[0], row[1], json.loads(row[2]), row[3] + 1) for row in rows]
+
+    def heartbeat(self, worker_id: str, jobs: List[Job], lease_seconds: float) -> int:
+        """Prolonge les baux encore détenus par `worker_id` ; renvoie leur nombre."""
+        expires = time.time() + lease_seconds
+        with self._transaction():
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "UPDATE jobs SET lease_expires = ? WHERE run_id = ? AND paper_id = ?"
+                " AND status = 'leased' AND lease_owner = ?",
+                [(expires, job.run_id, job.paper_id, worker_id) for job in jobs],
+            )
+            return self._conn.total_changes - before
+
+    def complete(self, worker_id: str, job: Job, paper: Dict[str, Any]) -> bool:
+        """Enregistre le papier traité ; `False` si le bail avait été repris entre-temps."""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'done', paper = ?, lease_owner = NULL, error = NULL"
+                " WHERE run_id = ? AND paper_id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(paper), job.run_id, job.paper_id, worker_id),
+            )
+            return cursor.rowcount > 0
+
+    def fail(self, worker_id: str, job: Job, error: str):
+        """Rend le job (nouvel essai) ou le marque `failed` après `max_attempts`."""
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, error = ?"
+                " WHERE run_id = ? AND paper_id = ? AND status = 'leased' AND lease_owner = ?",
+                (status, error, job.run_id, job.paper_id, worker_id),
+            )
+
+    def counts(self, run_id: str | None = None) -> Dict[str, int]:
+        run_filter, run_args = ("WHERE run_id = ?", (run_id,)) if run_id else ("", ())
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT status, COUNT(*) FROM jobs {run_filter} GROUP BY status", run_args
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def idle(self, run_id: str | None = None) -> bool:
+        """Vrai s'il ne reste aucun job en attente ni en cours."""
+        counts = self.counts(run_id)
+        return not counts.get("pending") and not counts.get("leased")
+
+    def results(self, run_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT paper FROM jobs WHERE run_id = ? AND status = 'done' ORDER BY position",
+                (run_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def add_metrics(self, run_id: str, worker_id: str, snapshot: Dict[str, Any]):
+        """Enregistre les mesures d'un lot traité par `worker_id` (`registry.snapshot()`)."""
+        with self._transaction():
+            self._conn.execute(
+                "INSERT INTO metrics (run_id, worker_id, recorded_at, snapshot) VALUES (?, ?, ?, ?)",
+                (run_id, worker_id, time.time(), json.dumps(snapshot)),
+            )
+
+    def run_metrics(self, run_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT snapshot FROM metrics WHERE run_id = ? ORDER BY recorded_at", (run_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def finish(self, run_id: str):
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                (datetime.now(timezone.utc).isoformat(), run_id),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, *exc_info):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+class _Heartbeat:
+    """Renouvelle les baux d'un lot en arrière-plan pendant son traitement."""
+
+    def __init__(self, queue: WorkQueue, worker_id: str, jobs: List[Job], lease_seconds: float):
+        self._queue = queue
+        self._worker_id = worker_id
+        self._jobs = jobs
+        self._lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self._lease_seconds / 3):
+            held = self._queue.heartbeat(self._worker_id, self._jobs, self._lease_seconds)
+            if held < len(self._jobs):
+                logger.warning("Lost %s leases", len(self._jobs) - held)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _process_jobs(queue: WorkQueue, worker_id: str, run_id: str, jobs: List[Job]) -> int:
+    """Traite des jobs d'un même run ; leurs mesures sont confiées au coordinateur."""
+    papers = [job.paper for job in jobs]
+    registry.reset()
+    try:
+        MeteredNode("process_papers", FunctionNode(process_papers))(State(raw_papers=papers))
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Worker batch failed")
+        for job in jobs:
+            queue.fail(worker_id, job, f"{type(exc).__name__}: {exc}")
+        return 0
+    finally:
+        queue.add_metrics(run_id, worker_id, registry.snapshot())
+
+    processed = 0
+    for job, paper in zip(jobs, papers):
+        if "score" in paper:
+            if queue.complete(worker_id, job, paper):
+                processed += 1
+        else:
+            queue.fail(worker_id, job, "no score produced")
+    return processed
+
+
+def run_worker(
+    run_id: str | None = None,
+    exit_when_idle: bool = False,
+    batch_size: int | None = None,
+    lease_seconds: float | None = None,
+    queue: WorkQueue | None = None,
+) -> int:
+    """Boucle d'un worker : bail, PDF → analyse → score (`process_papers`), compte rendu.
+
+    Renvoie le nombre de papiers traités. Avec `exit_when_idle`, s'arrête
+    quand plus aucun job n'est en attente ni en cours ; sinon attend les
+    prochains runs indéfiniment. Les mesures (tokens, latences…) sont
+    enregistrées par run dans la file : le coordinateur les exporte avec les
+    siennes (`METRICS_DIR`), les workers n'écrivent pas de fichier.
+    """
+    queue = queue or WorkQueue()
+    worker_id = default_worker_id()
+    batch_size = batch_size or work_batch_size()
+    lease_seconds = lease_seconds or work_lease_seconds()
+    processed = 0
+    logger.info("Worker %s started (batch: %s, lease: %ss)", worker_id, batch_size, lease_seconds)
+    while True:
+        jobs = queue.lease(worker_id, batch_size, lease_seconds, run_id)
+        if not jobs:
+            if exit_when_idle and queue.idle(run_id):
+                break
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        # Un bail peut chevaucher deux runs (jobs triés par run) : mesures séparées.
+        with _Heartbeat(queue, worker_id, jobs, lease_seconds):
+            for job_run_id, run_jobs in groupby(jobs, key=attrgetter("run_id")):
+                processed += _process_jobs(queue, worker_id, job_run_id, list(run_jobs))
+
+    logger.info("Worker %s done - %s papers processed", worker_id, processed)
+    return processed
+
+
+def _spawn_workers(count: int, run_id: str) -> List[subprocess.Popen]:
+    command = [sys.executable, "-m", "agent_arxiv.work_queue", "worker", "--run-id", run_id, "--exit-when-idle"]
+    return [subprocess.Popen(command) for _ in range(count)]
+
+
+def _wait(queue: WorkQueue, run_id: str, workers: List[subprocess.Popen]) -> Iterator[Dict[str, int]]:
+    last = None
+    while not queue.idle(run_id):
+        counts = queue.counts(run_id)
+        if counts != last:
+            yield counts
+            last = counts
+        if workers and all(worker.poll() is not None for worker in workers):
+            logger.warning("All local workers exited with jobs remaining")
+            break
+        time.sleep(POLL_INTERVAL)
+
+
+def coordinate(query: str = "", run_id: str | None = None, workers: int = 0) -> State:
+    """Recherche et tri, mise en file des papiers, attente des workers, post LinkedIn.
+
+    Relancé avec le même `run_id`, le coordinateur ne refait pas la recherche
+    et reprend l'attente. `workers` lance autant de workers locaux ; d'autres
+    peuvent être démarrés sur la même file (`python -m agent_arxiv.work_queue worker`).
+    """
+    queue = WorkQueue()
+    run_id = run_id or datetime.now(timezone.utc).strftime("run-%Y%m%dT%H%M%SZ")
+    registry.reset()
+    if not queue.has_run(run_id):
+        state = State(query=query)
+        for name, node in (("search_arxiv", search_arxiv), ("triage_papers", triage_papers)):
+            state = MeteredNode(name, FunctionNode(node))(state)
+        added = queue.enqueue(run_id, query, state.get("raw_papers", []))
+        logger.info("Run %s: %s jobs queued", run_id, added)
+    else:
+        logger.info("Run %s already queued, waiting for workers", run_id)
+
+    processes = _spawn_workers(workers, run_id) if workers else []
+    started = time.perf_counter()
+    for counts in _wait(queue, run_id, processes):
+        logger.info(
+            "Run %s - %s",
+            run_id,
+            ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())),
+        )
+    for process in processes:
+        process.wait()
+
+    scored = queue.results(run_id)
+    logger.info(
+        "Queue stats - run: %s, scored: %s, failed: %s, elapsed: %.1fs",
+        run_id,
+        len(scored),
+        queue.counts(run_id).get("failed", 0),
+        time.perf_counter() - started,
+    )
+    state = MeteredNode("write_linkedin_post", FunctionNode(write_linkedin_post))(
+        State(query=query, raw_papers=scored, analyzed=scored, scored=scored)
+    )
+    for snapshot in queue.run_metrics(run_id):
+        registry.merge(snapshot)
+    queue.finish(run_id)
+    queue.close()
+    report_metrics()
+    return state
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="File de travail multi-processus")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="Traite les jobs de la file")
+    worker.add_argument("--run-id", help="Ne traiter que ce run")
+    worker.add_argument("--exit-when-idle", action="store_true", help="S'arrêter quand la file est vide")
+    worker.add_argument("--batch-size", type=int, help="Papiers par bail (défaut : WORK_BATCH_SIZE)")
+    coordinator = commands.add_parser("coordinate", help="Met un run en file et attend les workers")
+    coordinator.add_argument("--query", default="")
+    coordinator.add_argument("--run-id", help="Identifiant du run (reprise si déjà en file)")
+    coordinator.add_argument("--workers", type=int, default=0, help="Workers locaux à lancer")
+    commands.add_parser("status", help="Affiche l'état de la file")
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        run_worker(args.run_id, args.exit_when_idle, args.batch_size)
+    elif args.command == "coordinate":
+        state = coordinate(args.query, args.run_id, args.workers)
+        if state.get("linkedin_post"):
+            logger.info("Suggested LinkedIn post:\n%s", state["linkedin_post"])
+    else:
+        print(json.dumps(WorkQueue().counts(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,36 +1,145 @@
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator
+
 from langgraph.graph import END, StateGraph
 
+from cache import CACHE_DIR
+
+from .config import checkpoint_db, metrics_dir, pipeline_mode, run_deadline
+from .logger import get_logger
+from .metrics import MeteredNode, registry
 from .nodes import (
     analyze_papers,
     fetch_pdf_content,
+    process_papers,
     score_papers,
     search_arxiv,
+    triage_papers,
     write_linkedin_post,
 )
+from .nodes_base import FunctionNode
+from .scheduler import parse_deadline
 from .state import State
 
+if TYPE_CHECKING:
+    from langgraph.checkpoint.sqlite import SqliteSaver
 
-def build_workflow() -> StateGraph:
-    workflow = StateGraph(State)
+logger = get_logger(__name__)
+
+
+def _add_node(workflow: StateGraph, name: str, fn):
+    """Ajoute `fn` au graphe, enveloppé pour mesurer sa durée et ses appels LLM."""
+    workflow.add_node(name, MeteredNode(name, FunctionNode(fn)))
 
-    workflow.add_node("search_arxiv", search_arxiv)
-    workflow.add_node("fetch_pdf_content", fetch_pdf_content)
-    workflow.add_node("analyze_papers", analyze_papers)
-    workflow.add_node("score_papers", score_papers)
-    workflow.add_node("write_linkedin_post", write_linkedin_post)
 
-    workflow.set_entry_point("search_arxiv")
+def build_workflow(mode: str | None = None, linkedin_post: bool = True) -> StateGraph:
+    """Construit le graphe en mode `staged` (étapes globales) ou `streaming`.
 
-    workflow.add_edge("search_arxiv", "fetch_pdf_content")
-    workflow.add_edge("fetch_pdf_content", "analyze_papers")
-    workflow.add_edge("analyze_papers", "score_papers")
-    workflow.add_edge("score_papers", "write_linkedin_post")
-    workflow.add_edge("write_linkedin_post", END)
+    En mode `streaming`, `process_papers` fait avancer chaque papier
+    indépendamment et `write_linkedin_post` reste le seul point de jonction.
+    `linkedin_post=False` arrête le graphe après le scoring (backfill).
+    """
+    mode = mode or pipeline_mode()
+    workflow = StateGraph(State)
+
+    steps = [("search_arxiv", search_arxiv), ("triage_papers", triage_papers)]
+    if mode == "streaming":
+        steps.append(("process_papers", process_papers))
+    else:
+        steps += [
+            ("fetch_pdf_content", fetch_pdf_content),
+            ("analyze_papers", analyze_papers),
+            ("score_papers", score_papers),
+        ]
+    if linkedin_post:
+        steps.append(("write_linkedin_post", write_linkedin_post))
+
+    for name, fn in steps:
+        _add_node(workflow, name, fn)
+    workflow.set_entry_point(steps[0][0])
+    for (current, _), (following, _) in zip(steps, steps[1:]):
+        workflow.add_edge(current, following)
+    workflow.add_edge(steps[-1][0], END)
     return workflow
 
 
-graph = build_workflow().compile()
+@lru_cache(maxsize=None)
+def get_graph():
+    """Graphe par défaut, compilé au premier appel puis réutilisé."""
+    return build_workflow().compile()
+
+
+def checkpoint_path() -> Path:
+    return Path(checkpoint_db()) if checkpoint_db() else CACHE_DIR / "checkpoints.sqlite3"
+
+
+@contextmanager
+def checkpointer(path: Path | None = None) -> Iterator["SqliteSaver"]:
+    """Checkpointer LangGraph local (SQLite) : chaque étape terminée y est enregistrée."""
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    path = path or checkpoint_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    try:
+        yield SqliteSaver(conn)
+    finally:
+        conn.close()
+
+
+def invoke_checkpointed(compiled, inputs: Dict[str, Any], thread_id: str) -> State:
+    """Exécute le graphe sous `thread_id`, en reprenant après la dernière étape terminée.
+
+    Si le dernier passage de ce thread s'est interrompu (`next` non vide), il
+    est repris sans relancer les étapes déjà enregistrées ; sinon une nouvelle
+    exécution démarre avec `inputs`.
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+    snapshot = compiled.get_state(config)
+    if snapshot.next:
+        logger.info("Resuming run %s at %s", thread_id, ", ".join(snapshot.next))
+        return compiled.invoke(None, config)
+    return compiled.invoke(inputs, config)
+
+
+def report_metrics():
+    """Journalise les totaux de l'exécution et les exporte si `METRICS_DIR` est défini."""
+    totals = registry.report()["totals"]
+    logger.info(
+        "Run metrics - LLM requests: %s, prompt tokens: %s (cached: %s), completion tokens: %s",
+        totals["llm_requests"],
+        totals["prompt_tokens"],
+        totals["cached_prompt_tokens"],
+        totals["completion_tokens"],
+    )
+    if metrics_dir():
+        registry.export(Path(metrics_dir()))
+
+
+def run_workflow(query: str = "", thread_id: str | None = None, deadline: str = ""):
+    """Exécute le workflow ; avec `thread_id`, l'exécution est checkpointée et reprenable.
 
+    Les checkpoints du thread sont supprimés une fois l'exécution terminée :
+    seules les exécutions interrompues restent dans la base.
 
-def run_workflow(query: str = ""):
-    return graph.invoke({"query": query})
+    `deadline` (`HH:MM` ou date ISO 8601, défaut : `RUN_DEADLINE`) est résolue
+    une fois au démarrage et conservée dans l'état, reprises comprises.
+    """
+    registry.reset()
+    inputs = {"query": query}
+    resolved = parse_deadline(deadline or run_deadline())
+    if resolved is not None:
+        inputs["deadline"] = resolved.isoformat()
+    if thread_id is None:
+        result = get_graph().invoke(inputs)
+    else:
+        with checkpointer() as saver:
+            result = invoke_checkpointed(
+                build_workflow().compile(checkpointer=saver), inputs, thread_id
+            )
+            saver.delete_thread(thread_id)
+    report_metrics()
+    return result
@@ -1,11 +1,99 @@
+import argparse
+from datetime import date
+from pathlib import Path
+
 from agent_arxiv import run_workflow
 from agent_arxiv.logger import get_logger
 from agent_arxiv.papers import collect_scored_papers, parse_score
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Veille ArXiv et proposition de post LinkedIn")
+    parser.add_argument("--query", default="", help="Requête ArXiv (défaut : catégories configurées)")
+    parser.add_argument(
+        "--thread-id",
+        help="Exécution checkpointée : relancer avec le même identifiant reprend après la dernière étape terminée",
+    )
+    parser.add_argument(
+        "--deadline",
+        default="",
+        help="Heure limite (HH:MM ou date ISO) : le post est rédigé à temps avec les papiers traités (défaut : RUN_DEADLINE)",
+    )
+    parser.add_argument(
+        "--backfill",
+        nargs=2,
+        metavar=("START", "END"),
+        type=date.fromisoformat,
+        help="Traite la plage de dates START..END (AAAA-MM-JJ, incluses) jour par jour",
+    )
+    parser.add_argument(
+        "--profiles",
+        type=Path,
+        help="Fichier JSON de profils : un traitement partagé, un post LinkedIn par profil",
+    )
+    parser.add_argument("--chunk-days", type=int, default=1, help="Taille des fenêtres de backfill")
+    parser.add_argument(
+        "--force", action="store_true", help="Backfill : retraite aussi les fenêtres terminées"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Mode service : interrogation périodique d'ArXiv et API HTTP locale",
+    )
+    parser.add_argument("--host", help="Adresse d'écoute du mode service (défaut : SERVICE_HOST)")
+    parser.add_argument("--port", type=int, help="Port du mode service (défaut : SERVICE_PORT)")
+    return parser.parse_args()
+
+
+def run_backfill(args, logger):
+    from agent_arxiv.backfill import backfill
+
+    start, end = args.backfill
+    for summary in backfill(start, end, args.query, args.chunk_days, args.force):
+        logger.info(
+            "%s → %s: %s papers, %s scored%s",
+            summary["window_start"],
+            summary["window_end"],
+            summary["papers"],
+            summary["scored"],
+            " (skipped)" if summary["skipped"] else "",
+        )
+
+
+def run_multi_profile(args, logger):
+    from agent_arxiv.profiles import load_profiles, run_profiles
+
+    for result in run_profiles(load_profiles(args.profiles)):
+        profile = result.profile
+        logger.info(
+            "Profile %s (%s) - %s papers:\n%s",
+            profile.name,
+            ", ".join(profile.categories),
+            len(result.papers),
+            "\n".join(
+                f"     {paper['score_value']:.1f} - {paper['title']}" for paper in result.papers
+            ),
+        )
+        if result.linkedin_post:
+            logger.info("Suggested LinkedIn post (%s):\n%s", profile.name, result.linkedin_post)
+
+
 def main():
     logger = get_logger(__name__)
-    result = run_workflow("")
+    args = parse_args()
+    if args.serve:
+        from agent_arxiv.service import serve
+
+        serve(args.query, args.host, args.port)
+        return
+    if args.backfill:
+        run_backfill(args, logger)
+        return
+    if args.profiles:
+        run_multi_profile(args, logger)
+        return
+
+    result = run_workflow(args.query, thread_id=args.thread_id, deadline=args.deadline)
     scored_papers = collect_scored_papers(result)
     for paper in scored_papers:
         scores = parse_score(paper.get("score", "{}"))
@@ -0,0 +1,118 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+# Vocabulaire mêlant des thèmes du profil d'intérêt et des thèmes hors sujet,
+# pour que le tri sur titre + résumé ait un vrai classement à faire.
+TOPICS = [
+    "large language model agents",
+    "retrieval-augmented generation",
+    "multi-agent planning",
+    "tool use and function calling",
+    "dense retrieval and reranking",
+    "long context inference",
+    "quantization of small language models",
+    "hallucination evaluation benchmarks",
+    "protein structure prediction",
+    "robotic grasping",
+    "graph neural networks for chemistry",
+    "speech enhancement",
+]
+FILLER = (
+    "we propose evaluate model results dataset baseline method training "
+    "performance analysis approach experiments task framework accuracy "
+    "improvement benchmark architecture efficient robust scalable"
+).split()
+PUBLICATION_INTERVAL = timedelta(minutes=20)
+SECTIONS = ["Introduction", "Related Work", "Method", "Experiments", "Conclusion"]
+
+
+@dataclass
+class SyntheticPaper:
+    """Papier factice servi par le faux flux ArXiv et le serveur de PDF."""
+
+    paper_id: str
+    title: str
+    abstract: str
+    published: datetime
+    category: str = "cs.CL"
+    pages: List[str] = field(default_factory=list)
+
+
+def _sentence(rng: random.Random, topic: str, words: int = 14) -> str:
+    body = " ".join(rng.choice(FILLER) for _ in range(words))
+    return f"{body} {topic}."
+
+
+def build_corpus(count: int, pages: int = 8, seed: int = 0) -> List[SyntheticPaper]:
+    """Génère `count` papiers publiés à `PUBLICATION_INTERVAL` d'écart, du plus récent au plus ancien."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    papers: List[SyntheticPaper] = []
+    for index in range(count):
+        topic = TOPICS[index % len(TOPICS)]
+        paper_id = f"2501.{index:05d}v1"
+        abstract = " ".join(_sentence(rng, topic) for _ in range(5))
+        lines_per_page = 40
+        body: List[str] = []
+        for page_index in range(pages):
+            lines = []
+            if page_index == 0:
+                lines += [f"{topic.title()}", "Abstract", abstract]
+            section = SECTIONS[min(page_index, len(SECTIONS) - 1)]
+            if page_index < len(SECTIONS):
+                lines.append(f"{page_index + 1} {section}")
+            if page_index == pages - 1:
+                lines.append("References")
+            lines += [_sentence(rng, topic) for _ in range(lines_per_page - len(lines))]
+            body.append("\n".join(lines))
+        papers.append(
+            SyntheticPaper(
+                paper_id=paper_id,
+                title=f"On {topic}: study {index}",
+                abstract=abstract,
+                published=now - PUBLICATION_INTERVAL * (index + 1),
+                pages=body,
+            )
+        )
+    return papers
+
+
+def _pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """Écrit un PDF texte minimal (une police Helvetica, une ligne par `Tj`)."""
+    objects: List[str] = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",  # arbre des pages, rempli une fois les numéros connus
+    ]
+    font_ref = 3 + 2 * len(pages)
+    kids = []
+    for index, text in enumerate(pages):
+        page_ref, content_ref = 3 + 2 * index, 4 + 2 * index
+        kids.append(f"{page_ref} 0 R")
+        ops = ["BT /F1 9 Tf 11 TL 50 760 Td"]
+        ops += [f"({_pdf_string(line)}) Tj T*" for line in text.splitlines()]
+        ops.append("ET")
+        stream = "\n".join(ops)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {content_ref} 0 R /Resources << /Font << /F1 {font_ref} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1", errors="replace")
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+from .corpus import SyntheticPaper, make_pdf
+
+_BATCH_ID_RE = re.compile(r"^\s*### Paper (\S+)", re.MULTILINE)
+_DATE_RANGE_RE = re.compile(r"submittedDate:\[(\d{12}) TO (\d{12})\]")
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    server: "_LocalServer"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(
+        self, status: int, body: bytes, content_type: str, headers: Dict[str, str] | None = None
+    ):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _LocalServer(ThreadingHTTPServer):
+    """Serveur HTTP local démarré dans un thread, qui compte ses requêtes."""
+
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "_LocalServer":
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _LLMHandler(_QuietHandler):
+    server: "FakeLLMServer"
+
+    def do_POST(self):
+        self.server.count()
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.server.should_fail():
+            error = json.dumps({"error": {"message": "injected failure"}}).encode()
+            self._send(429, error, "application/json", {"retry-after": "0.1"})
+            return
+
+        text = self.server.answer(body["messages"])
+        completion_tokens = max(1, len(text) // 4)
+        prompt_tokens = sum(len(m.get("content", "")) for m in body["messages"]) // 4
+        cached_tokens = self.server.cached_prefix_tokens(body["messages"])
+        prefill = (
+            (prompt_tokens - cached_tokens) / self.server.prefill_tokens_per_second
+            if self.server.prefill_tokens_per_second
+            else 0.0
+        )
+        time.sleep(
+            self.server.latency + prefill + completion_tokens / self.server.tokens_per_second
+        )
+        payload = {
+            "id": "bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or "bench",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": text},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }
+        self._send(200, json.dumps(payload).encode(), "application/json")
+
+
+class FakeLLMServer(_LocalServer):
+    """Endpoint compatible OpenAI (`/v1/chat/completions`) aux réponses déterministes.
+
+    Chaque réponse attend `latency` secondes plus le temps de « générer » ses
+    tokens à `tokens_per_second` ; une fraction `error_rate` des requêtes
+    reçoit un 429 pour exercer les rejeux.
+
+    Un message système déjà vu simule le cache de préfixe d'un serveur réel :
+    ses tokens sont renvoyés dans `usage.prompt_tokens_details.cached_tokens`
+    et, si `prefill_tokens_per_second` est non nul, seuls les tokens non mis
+    en cache coûtent du temps de prefill.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        tokens_per_second: float = 400.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        prefill_tokens_per_second: float = 0.0,
+    ):
+        super().__init__(_LLMHandler)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._prefixes: set[str] = set()
+
+    def cached_prefix_tokens(self, messages: List[Dict[str, str]]) -> int:
+        if not messages or messages[0].get("role") != "system":
+            return 0
+        prefix = messages[0].get("content", "")
+        with self._lock:
+            seen = prefix in self._prefixes
+            self._prefixes.add(prefix)
+        return len(prefix) // 4 if seen else 0
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+            return failed
+
+    @staticmethod
+    def _score(key: str) -> Dict[str, int]:
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        values = [digest[i] % 11 for i in range(4)]
+        return {
+            "originalite": values[0],
+            "impact": values[1],
+            "repro": values[2],
+            "potentiel": values[3],
+            "score_global": round(sum(values) / 4),
+        }
+
+    def answer(self, messages: List[Dict[str, str]]) -> str:
+        prompt = "\n".join(message.get("content", "") for message in messages)
+        if "LinkedIn post" in prompt:
+            return "Voici une sélection de papiers récents.\n\n" + "\n\n".join(
+                f"{index}. \"Paper\" Lien: https://arxiv.org" for index in range(1, 6)
+            )
+        batch_ids = _BATCH_ID_RE.findall(prompt)
+        if batch_ids:
+            return json.dumps(
+                [{"paper_id": paper_id, **self._score(paper_id)} for paper_id in batch_ids]
+            )
+        if "score_global" in prompt:
+            return json.dumps(self._score(prompt[-2000:]))
+        return "\n".join(
+            [
+                "- Main contributions: a new approach evaluated on standard benchmarks.",
+                "- Technical innovations: an efficient training and inference recipe.",
+                "- Potential applications: assistants, search and document understanding.",
+                "- Reproducibility: code and data are described in enough detail.",
+                "- Summary: " + "the method improves accuracy at a lower cost. " * 20,
+            ]
+        )
+
+
+class _ArxivHandler(_QuietHandler):
+    server: "FakeArxivServer"
+
+    def do_GET(self):
+        self.server.count()
+        query = parse_qs(urlparse(self.path).query)
+        start = int(query.get("start", ["0"])[0])
+        size = int(query.get("max_results", ["100"])[0])
+        papers = self.server.papers
+        match = _DATE_RANGE_RE.search(query.get("search_query", [""])[0])
+        if match:
+            low, high = (
+                datetime.strptime(value, "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+                for value in match.groups()
+            )
+            papers = [paper for paper in papers if low <= paper.published <= high]
+        page = papers[start : start + size]
+        entries = "".join(self.server.entry(paper) for paper in page)
+        feed = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" '
+            'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+            'xmlns:arxiv="http://arxiv.org/schemas/atom">'
+            "<title>bench</title>"
+            f"<opensearch:totalResults>{len(papers)}</opensearch:totalResults>"
+            f"<opensearch:startIndex>{start}</opensearch:startIndex>"
+            f"<opensearch:itemsPerPage>{size}</opensearch:itemsPerPage>"
+            f"{entries}</feed>"
+        )
+        self._send(200, feed.encode("utf-8"), "application/atom+xml")
+
+
+class FakeArxivServer(_LocalServer):
+    """Flux Atom ArXiv (`/api/query`) qui respecte pagination et plage `submittedDate`."""
+
+    def __init__(self, papers: List[SyntheticPaper], pdf_base_url: str):
+        super().__init__(_ArxivHandler)
+        self.papers = sorted(papers, key=lambda paper: paper.published, reverse=True)
+        self.pdf_base_url = pdf_base_url
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/api/query"
+
+    def entry(self, paper: SyntheticPaper) -> str:
+        date = paper.published.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return (
+            "<entry>"
+            f"<id>http://arxiv.org/abs/{paper.paper_id}</id>"
+            f"<updated>{date}</updated><published>{date}</published>"
+            f"<title>{escape(paper.title)}</title>"
+            f"<summary>{escape(paper.abstract)}</summary>"
+            "<author><name>Bench Author</name></author>"
+            f'<link href="http://arxiv.org/abs/{paper.paper_id}" rel="alternate" type="text/html"/>'
+            f'<link title="pdf" href="{self.pdf_base_url}/pdf/{paper.paper_id}" '
+            'rel="related" type="application/pdf"/>'
+            f'<arxiv:primary_category term="{paper.category}" '
+            'scheme="http://arxiv.org/schemas/atom"/>'
+            f'<category term="{paper.category}" scheme="http://arxiv.org/schemas/atom"/>'
+            "</entry>"
+        )
+
+
+class _PdfHandler(_QuietHandler):
+    server: "PdfServer"
+
+    def do_GET(self):
+        self.server.count()
+        paper_id = self.path.rstrip("/").split("/")[-1]
+        pdf = self.server.pdfs.get(paper_id)
+        if pdf is None:
+            self._send(404, b"not found", "text/plain")
+        else:
+            self._send(200, pdf, "application/pdf")
+
+
+class PdfServer(_LocalServer):
+    """Hôte statique des PDF synthétiques (`/pdf/<paper_id>`), générés au démarrage."""
+
+    def __init__(self, papers: List[SyntheticPaper]):
+        super().__init__(_PdfHandler)
+        self.pdfs = {paper.paper_id: make_pdf(paper.pages) for paper in papers}
@@ -0,0 +1,112 @@
+"""Banc du temps d'import des modules du projet.
+
+Chaque module est importé dans un interpréteur neuf (`python -X importtime`),
+sans clé d'API et avec un `CACHE_DIR` inexistant : le temps cumulé est
+comparé à un budget, et l'import ne doit ni charger de dépendance lourde
+(SDK réseau, PDF, LangGraph), ni créer le répertoire de cache.
+
+    python -m benchmarks.import_time --repeat 5 --output imports.json
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("openai", "arxiv", "pypdf", "langgraph", "requests", "numpy", "tiktoken")
+# (module, budget en ms, dépendances lourdes tolérées)
+TARGETS: List[Tuple[str, float, Tuple[str, ...]]] = [
+    ("agent_arxiv", 50, ()),
+    ("agent_arxiv.papers", 150, ()),
+    ("agent_arxiv.prompts", 150, ()),
+    ("agent_arxiv.nodes", 250, ()),
+    ("cache", 50, ()),
+    ("llm_client", 50, ()),
+]
+_IMPORTTIME_RE = re.compile(r"^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| (?P<module>\S.*)$")
+# `importlib.import_module` n'apparaît pas dans `-X importtime` : instruction `import` explicite.
+_PROBE = (
+    "import {module}; import json, sys; "
+    "print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))"
+)
+
+
+def _measure(module: str, env: Dict[str, str]) -> Tuple[float, List[str]]:
+    """Importe `module` dans un processus neuf : (temps cumulé en ms, modules lourds chargés)."""
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"Import of {module!r} failed:\n{completed.stderr}")
+    cumulative = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match and match.group("module").strip() == module:
+            cumulative = int(match.group("cumulative"))
+    return cumulative / 1000, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(repeat: int) -> Dict[str, Any]:
+    cache_dir = Path(tempfile.mkdtemp(prefix="arxiv-imports-")) / "cache"
+    env = {key: value for key, value in os.environ.items() if key != "AI_ENDPOINTS_ACCESS_TOKEN"}
+    env["CACHE_DIR"] = str(cache_dir)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    results: List[Dict[str, Any]] = []
+    for module, budget_ms, allowed in TARGETS:
+        timings = []
+        loaded: List[str] = []
+        for _ in range(max(1, repeat)):
+            elapsed, loaded = _measure(module, env)
+            timings.append(elapsed)
+        unexpected = sorted(set(loaded) - set(allowed))
+        best = min(timings)
+        results.append(
+            {
+                "module": module,
+                "best_ms": round(best, 1),
+                "median_ms": round(sorted(timings)[len(timings) // 2], 1),
+                "budget_ms": budget_ms,
+                "heavy_modules": unexpected,
+                "ok": best <= budget_ms and not unexpected,
+            }
+        )
+    cache_created = cache_dir.exists()
+    shutil.rmtree(cache_dir.parent, ignore_errors=True)
+    return {
+        "python": sys.version.split()[0],
+        "cache_dir_created": cache_created,
+        "modules": results,
+        "ok": not cache_created and all(result["ok"] for result in results),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Imports par module (meilleur temps retenu)")
+    parser.add_argument("--output", type=Path, help="Fichier JSON de résultats (défaut : stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""Banc de performance hors ligne du workflow complet.
+
+Démarre localement un faux endpoint OpenAI, un faux flux ArXiv et un hôte de
+PDF synthétiques, puis exécute `run_workflow` de bout en bout dans un
+sous-processus par scénario (`cold` : cache vidé, `warm` : cache du scénario
+précédent). Les résultats (temps par étape, papiers/minute, RSS maximal,
+taux de cache, requêtes servies) sont écrits en JSON.
+
+Le scénario `queue` mesure la file de travail multi-processus : pour chaque
+valeur de `--queue-workers`, cache vidé, coordinateur et N workers locaux.
+
+    python -m benchmarks.run --papers 40 --scenarios cold warm --output bench.json
+    python -m benchmarks.run --scenarios queue --queue-workers 1 2 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .corpus import PUBLICATION_INTERVAL, build_corpus
+from .fakes import FakeArxivServer, FakeLLMServer, PdfServer
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_STATS_RE = re.compile(r"^(?P<stage>[\w ]+?) stats - (?P<counters>.+)$")
+_HIT_KEY_RE = re.compile(r"^(?:(?P<field>\w+) )?(?:cache hits|generated)$")
+
+
+class _StatsCollector(logging.Handler):
+    """Récupère les lignes « <Étape> stats - clé: valeur, ... » journalisées par les nœuds."""
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def emit(self, record: logging.LogRecord):
+        match = _STATS_RE.match(record.getMessage())
+        if not match:
+            return
+        counters = {}
+        for part in match.group("counters").split(", "):
+            key, _, value = part.partition(": ")
+            if value.strip().isdigit():
+                counters[key.strip()] = int(value)
+        self.stats[match.group("stage").lower()] = counters
+
+
+def _hit_rates(stats: Dict[str, Dict[str, int]]) -> Dict[str, float]:
+    """Taux de cache par champ : `<champ> cache hits` (ou `cache hits` de l'étape) / `total`.
+
+    Les compteurs nuls n'étant pas toujours journalisés (mode streaming), un
+    champ qui n'apparaît que via `<champ> generated` a un taux de 0.
+    """
+    rates: Dict[str, float] = {}
+    for stage, counters in stats.items():
+        total = counters.get("total")
+        if not total:
+            continue
+        for key in counters:
+            match = _HIT_KEY_RE.match(key)
+            if not match:
+                continue
+            prefix = f"{match.group('field')} " if match.group("field") else ""
+            name = match.group("field") or stage
+            rates[name] = round(counters.get(f"{prefix}cache hits", 0) / total, 3)
+    return rates
+
+
+def _peak_rss_mb(who: int) -> float:
+    # `ru_maxrss` est en kilo-octets sous Linux, en octets sous macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(who).ru_maxrss / scale, 1)
+
+
+def run_worker(mode: str, output: Path):
+    """Exécute le workflow dans le processus courant et écrit ses mesures dans `output`."""
+    started = time.perf_counter()
+    from agent_arxiv.metrics import registry
+    from agent_arxiv.workflow import build_workflow
+
+    graph = build_workflow(mode).compile()
+    import_seconds = time.perf_counter() - started
+    # Le logger du projet ne propage pas vers la racine : on s'y branche
+    # une fois qu'il est configuré.
+    collector = _StatsCollector()
+    logging.getLogger("agent_arxiv").addHandler(collector)
+
+    stages: Dict[str, float] = {}
+    state: Dict[str, Any] = {}
+    papers_found = 0
+    registry.reset()
+    last = time.perf_counter()
+    for update in graph.stream({"query": ""}, stream_mode="updates"):
+        now = time.perf_counter()
+        for node, values in update.items():
+            stages[node] = round(stages.get(node, 0.0) + now - last, 3)
+            state.update(values or {})
+            if node == "search_arxiv":
+                papers_found = len(state.get("raw_papers", []))
+        last = now
+    wall = time.perf_counter() - started - import_seconds
+
+    processed = len(state.get("scored", []))
+    result = {
+        "wall_seconds": round(wall, 3),
+        "import_seconds": round(import_seconds, 3),
+        "stages": stages,
+        "papers_found": papers_found,
+        "papers_processed": processed,
+        "papers_per_minute": round(processed / wall * 60, 2) if wall else 0.0,
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_rss_children_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "stats": collector.stats,
+        "cache_hit_rates": _hit_rates(collector.stats),
+        "linkedin_post": bool(state.get("linkedin_post")),
+        "llm": registry.report()["totals"],
+    }
+    output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+def _scenario_env(args, llm: FakeLLMServer, arxiv_server: FakeArxivServer, cache_dir: Path):
+    env = dict(os.environ)
+    env.update(
+        {
+            "AI_ENDPOINTS_ACCESS_TOKEN": "bench",
+            "MODEL": "bench-model",
+            "BASE_URL": f"{llm.url}/v1",
+            "ARXIV_API_URL": arxiv_server.api_url,
+            "CACHE_DIR": str(cache_dir),
+            "CACHE_BACKEND": args.cache_backend,
+            "PIPELINE_MODE": args.mode,
+            "SEARCH_INCREMENTAL": "false",
+            "SEARCH_WINDOW_HOURS": str(
+                (args.papers + 1) * PUBLICATION_INTERVAL.total_seconds() / 3600
+            ),
+            "LLM_RESPONSE_CACHE": "",
+        }
+    )
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def run_queue_scenario(args, workers: int, env: Dict[str, str], workdir: Path) -> Dict[str, Any]:
+    """Coordinateur de la file de travail avec `workers` workers locaux, cache vidé."""
+    cache_dir = Path(env["CACHE_DIR"])
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    metrics_dir = workdir / f"metrics-queue-{workers}"
+    run_id = f"bench-{workers}"
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [
+            sys.executable, "-m", "agent_arxiv.work_queue", "coordinate",
+            "--run-id", run_id, "--workers", str(workers),
+        ],
+        cwd=workdir,
+        env={**env, "METRICS_DIR": str(metrics_dir)},
+        stdout=subprocess.DEVNULL if not args.verbose else None,
+        stderr=subprocess.PIPE if not args.verbose else None,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr or "")
+        raise SystemExit(f"Queue scenario with {workers} workers failed ({completed.returncode})")
+    with sqlite3.connect(cache_dir / "queue.sqlite3") as conn:
+        counts = dict(
+            conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (run_id,)
+            ).fetchall()
+        )
+    # Rapport du coordinateur : ses nœuds et les mesures fusionnées des workers.
+    report = json.loads(next(metrics_dir.glob("run-*.json")).read_text(encoding="utf-8"))
+    processed = counts.get("done", 0)
+    return {
+        "workers": workers,
+        "wall_seconds": round(wall, 3),
+        "papers_processed": processed,
+        "papers_failed": counts.get("failed", 0),
+        "papers_per_minute": round(processed / wall * 60, 2) if wall else 0.0,
+        "llm": report["totals"],
+    }
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    corpus = build_corpus(args.papers, pages=args.pages, seed=args.seed)
+    workdir = Path(tempfile.mkdtemp(prefix="arxiv-bench-"))
+    cache_dir = workdir / "cache"
+    results: List[Dict[str, Any]] = []
+
+    with PdfServer(corpus) as pdf_server, FakeLLMServer(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+    ) as llm, FakeArxivServer(corpus, pdf_server.url) as arxiv_server:
+        servers = {"llm": llm, "pdf": pdf_server, "arxiv": arxiv_server}
+        for scenario in args.scenarios:
+            if scenario == "queue":
+                env = _scenario_env(args, llm, arxiv_server, cache_dir)
+                for workers in args.queue_workers:
+                    before = {name: server.requests for name, server in servers.items()}
+                    result = run_queue_scenario(args, workers, env, workdir)
+                    result["scenario"] = f"queue-{workers}"
+                    result["requests"] = {
+                        name: server.requests - before[name] for name, server in servers.items()
+                    }
+                    results.append(result)
+                continue
+            if scenario == "cold":
+                shutil.rmtree(cache_dir, ignore_errors=True)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            before = {name: server.requests for name, server in servers.items()}
+            errors_before = llm.errors
+            output = workdir / f"{scenario}.json"
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.run", "--worker", str(output), "--mode", args.mode],
+                cwd=workdir,
+                env=_scenario_env(args, llm, arxiv_server, cache_dir),
+                stdout=subprocess.DEVNULL if not args.verbose else None,
+                stderr=subprocess.PIPE if not args.verbose else None,
+                text=True,
+            )
+            if completed.returncode != 0:
+                sys.stderr.write(completed.stderr or "")
+                raise SystemExit(f"Scenario {scenario!r} failed ({completed.returncode})")
+            result = json.loads(output.read_text(encoding="utf-8"))
+            result["scenario"] = scenario
+            result["requests"] = {
+                name: server.requests - before[name] for name, server in servers.items()
+            }
+            result["llm_errors_injected"] = llm.errors - errors_before
+            results.append(result)
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "config": {
+            "papers": args.papers,
+            "pages": args.pages,
+            "mode": args.mode,
+            "cache_backend": args.cache_backend,
+            "latency": args.latency,
+            "tokens_per_second": args.tokens_per_second,
+            "prefill_tokens_per_second": args.prefill_tokens_per_second,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "queue_workers": args.queue_workers,
+        },
+        "python": sys.version.split()[0],
+        "scenarios": results,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=40, help="Taille du corpus synthétique")
+    parser.add_argument("--pages", type=int, default=8, help="Pages par PDF")
+    parser.add_argument("--mode", default="staged", choices=["staged", "streaming"])
+    parser.add_argument("--cache-backend", default="sqlite", choices=["sqlite", "json"])
+    parser.add_argument(
+        "--scenarios", nargs="+", default=["cold", "warm"], choices=["cold", "warm", "queue"]
+    )
+    parser.add_argument(
+        "--queue-workers",
+        nargs="+",
+        type=int,
+        default=[1, 2, 4],
+        help="Nombres de workers du scénario queue",
+    )
+    parser.add_argument("--latency", type=float, default=0.2, help="Latence LLM simulée (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument(
+        "--prefill-tokens-per-second",
+        type=float,
+        default=0.0,
+        help="Débit de prefill simulé des tokens de prompt hors cache de préfixe (0 = gratuit)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Part de réponses 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Fichier JSON de résultats (défaut : stdout)")
+    parser.add_argument("--verbose", action="store_true", help="Affiche les logs du workflow")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.mode, args.worker)
+        return 0
+
+    report = json.dumps(run_benchmark(args), indent=2)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,709 @@
-import os
+import argparse
+import atexit
 import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Le répertoire n'est créé qu'à l'ouverture d'un backend, pas à l'import.
+CACHE_DIR = Path(os.getenv("CACHE_DIR", "cache"))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite")
+CACHE_DB_PATH = CACHE_DIR / "cache.sqlite3"
+
+_VERSION_RE = re.compile(r"^(?P<base>.+?)v(?P<version>\d+)$")
+# Identifiants arXiv : `2410.12345` (depuis 2007) ou `0501001` (ancien schéma, sans archive).
+_ARXIV_MONTH_RE = re.compile(r"^(?P<yy>\d{2})(?P<mm>\d{2})(?:\.\d{4,5}|\d{3})(?:v\d+)?$")
+
+# Champs évincés en premier quand le cache dépasse sa taille maximale : le texte
+# se retélécharge, alors qu'une analyse ou un score coûte des appels LLM.
+# L'empreinte et les métadonnées partent avec le texte pour que le PDF soit
+# récupéré à nouveau plutôt que d'analyser un papier sans son contenu.
+EVICT_FIRST_FIELDS = ("content", "content_digest", "content_meta")
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
-CACHE_DIR = Path("cache")
-CACHE_DIR.mkdir(exist_ok=True)
 
 def paper_id_from_url(url: str) -> str:
     """Extrait l'ID du papier depuis l'URL arXiv."""
     return url.rstrip("/").split("/")[-1]
 
+
+def split_paper_version(paper_id: str) -> Tuple[str, int | None]:
+    """Sépare l'ID de base et le numéro de révision (`2410.12345v2` → `2410.12345`, 2)."""
+    match = _VERSION_RE.match(paper_id)
+    if not match:
+        return paper_id, None
+    return match.group("base"), int(match.group("version"))
+
+
+def paper_month(paper_id: str) -> datetime | None:
+    """Mois de soumission encodé dans l'ID arXiv (`2410.12345` → octobre 2024), en UTC."""
+    match = _ARXIV_MONTH_RE.match(paper_id)
+    if not match:
+        return None
+    year, month = int(match.group("yy")), int(match.group("mm"))
+    if not 1 <= month <= 12:
+        return None
+    return datetime(1900 + year if year >= 91 else 2000 + year, month, 1, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=1)
+def _zstd():
+    # Import différé : zstandard est optionnel, zlib sert de repli.
+    try:
+        import zstandard
+    except ImportError:  # pragma: no cover - dépendance optionnelle
+        return None
+    return zstandard
+
+
+def resolve_codec(name: str) -> str | None:
+    """Codec effectif pour `CACHE_COMPRESSION` (`auto`, `zstd`, `zlib` ou `none`)."""
+    if name == "none":
+        return None
+    if name in ("auto", "zstd") and _zstd() is not None:
+        return "zstd"
+    return "zlib"
+
+
+def compress_value(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd().compress(data, 3)
+    return zlib.compress(data, 6)
+
+
+def decode_value(value: str | bytes) -> Any:
+    """Décode une valeur stockée : JSON en clair ou BLOB compressé (codec reconnu à l'en-tête)."""
+    if isinstance(value, str):
+        return json.loads(value)
+    if value[:4] == ZSTD_MAGIC:
+        zstandard = _zstd()
+        if zstandard is None:
+            raise ValueError("zstd-compressed cache value but zstandard is not installed")
+        return json.loads(zstandard.decompress(value))
+    return json.loads(zlib.decompress(value))
+
+
 def cache_path(paper_id: str) -> Path:
     return CACHE_DIR / f"{paper_id}.json"
 
+
+class JsonCacheBackend:
+    """Stockage historique : un fichier `<id>.json` par papier."""
+
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def load(self, paper_id: str) -> dict | None:
+        path = self.directory / f"{paper_id}.json"
+        if path.exists():
+            with open(path, "r") as f:
+                return json.load(f)
+        return None
+
+    def load_field(self, paper_id: str, field: str, default: Any = None) -> Any:
+        return (self.load(paper_id) or {}).get(field, default)
+
+    def save(self, paper_id: str, data: dict):
+        path = self.directory / f"{paper_id}.json"
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def save_field(self, paper_id: str, field: str, value: Any):
+        data = self.load(paper_id) or {}
+        data[field] = value
+        self.save(paper_id, data)
+
+    def revisions(self, base_id: str) -> List[str]:
+        return [path.stem for path in self.directory.glob(f"{base_id}v*.json")]
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        for path in sorted(self.directory.glob("*.json")):
+            with open(path, "r") as f:
+                yield path.stem, json.load(f)
+
+    def flush(self):
+        pass
+
+
+class SqliteCacheBackend:
+    """Stockage transactionnel dans une base SQLite unique (mode WAL).
+
+    Chaque champ d'un papier (`content`, `analysis`, `score`...) est une ligne
+    distincte : ajouter un score ne réécrit pas le texte du PDF. Les écritures
+    sont regroupées en mémoire et validées par lots de `batch_size` lignes ou
+    après `max_delay` secondes, et systématiquement par `flush()`.
+
+    Les valeurs d'au moins `compress_min_bytes` octets (le texte des PDF) sont
+    stockées compressées (zstd si disponible, sinon zlib) ; les petits champs
+    (analyses, scores) restent en JSON clair et se relisent sans décompression.
+    La table `entries` indexe la taille et le dernier accès de chaque ligne :
+    `prune()` supprime les papiers plus vieux que `ttl_days` (mois de l'ID
+    arXiv ou dernier accès, le plus récent des deux) puis, au-delà de `max_bytes` octets stockés, les moins récemment
+    lus (LRU), en commençant par le texte des PDF.
+    """
+
+    PRUNE_INTERVAL = 200
+
+    def __init__(
+        self,
+        path: Path = CACHE_DB_PATH,
+        batch_size: int = 50,
+        max_delay: float = 2.0,
+        compression: str = "auto",
+        compress_min_bytes: int = 4096,
+        ttl_days: float = 0.0,
+        max_bytes: int = 0,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.codec = resolve_codec(compression)
+        self.compress_min_bytes = compress_min_bytes
+        self.ttl_days = ttl_days
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._pending_since = 0.0
+        # Lectures à dater dans `entries` (champ `None` : toute l'entrée), validées avec les écritures.
+        self._touched: set[Tuple[str, str | None]] = set()
+        self._writes = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fields ("
+                " paper_id TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " PRIMARY KEY (paper_id, field)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " paper_id TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " raw_size INTEGER NOT NULL,"
+                " accessed REAL NOT NULL,"
+                " PRIMARY KEY (paper_id, field)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+        if self.get_meta("entries_indexed") is None:
+            self._index_entries()
+
+    @classmethod
+    def from_env(cls, path: Path = CACHE_DB_PATH) -> "SqliteCacheBackend":
+        """Construit le backend depuis `CACHE_COMPRESSION`, `CACHE_TTL_DAYS` et `CACHE_MAX_BYTES`."""
+        return cls(
+            path,
+            compression=os.getenv("CACHE_COMPRESSION", "auto"),
+            compress_min_bytes=int(os.getenv("CACHE_COMPRESS_MIN_BYTES", 4096)),
+            ttl_days=float(os.getenv("CACHE_TTL_DAYS", 0)),
+            max_bytes=int(os.getenv("CACHE_MAX_BYTES", 0)),
+        )
+
+    @property
+    def retention(self) -> bool:
+        return self.ttl_days > 0 or self.max_bytes > 0
+
+    def _index_entries(self) -> int:
+        """Indexe les lignes absentes de `entries` (base antérieure à la table) ; retourne leur nombre."""
+        with self._lock, self._conn:
+            indexed = self._conn.execute(
+                "INSERT OR IGNORE INTO entries (paper_id, field, size, raw_size, accessed) "
+                "SELECT paper_id, field, length(CAST(value AS BLOB)), "
+                "length(CAST(value AS BLOB)), ? FROM fields",
+                (time.time(),),
+            )
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('entries_indexed', '1') "
+                "ON CONFLICT (key) DO NOTHING"
+            )
+        return indexed.rowcount
+
+    def _encode(self, value: str) -> Tuple[str | bytes, int, int]:
+        """Forme stockée d'une valeur JSON, avec ses tailles stockée et brute (octets)."""
+        data = value.encode("utf-8")
+        if self.codec is not None and len(data) >= self.compress_min_bytes:
+            compressed = compress_value(data, self.codec)
+            if len(compressed) < len(data):
+                return compressed, len(compressed), len(data)
+        return value, len(data), len(data)
+
+    def _load(self, paper_id: str) -> dict:
+        rows = self._conn.execute(
+            "SELECT field, value FROM fields WHERE paper_id = ?", (paper_id,)
+        ).fetchall()
+        data = {field: decode_value(value) for field, value in rows}
+        for (pending_id, field), value in self._pending.items():
+            if pending_id == paper_id:
+                data[field] = json.loads(value)
+        return data
+
+    def load(self, paper_id: str) -> dict | None:
+        with self._lock:
+            data = self._load(paper_id)
+            if data:
+                self._touched.add((paper_id, None))
+        return data or None
+
+    def load_field(self, paper_id: str, field: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self._pending.get((paper_id, field))
+            if value is None:
+                row = self._conn.execute(
+                    "SELECT value FROM fields WHERE paper_id = ? AND field = ?",
+                    (paper_id, field),
+                ).fetchone()
+                if row is None:
+                    return default
+                value = row[0]
+                self._touched.add((paper_id, field))
+        return decode_value(value)
+
+    def save(self, paper_id: str, data: dict):
+        with self._lock:
+            self._commit()
+            rows = [
+                (paper_id, field, *self._encode(json.dumps(value)))
+                for field, value in data.items()
+            ]
+            with self._conn:
+                self._conn.execute("DELETE FROM fields WHERE paper_id = ?", (paper_id,))
+                self._conn.execute("DELETE FROM entries WHERE paper_id = ?", (paper_id,))
+                self._write_rows(rows, time.time())
+
+    def save_field(self, paper_id: str, field: str, value: Any):
+        with self._lock:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending[(paper_id, field)] = json.dumps(value)
+            if (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._pending_since >= self.max_delay
+            ):
+                self._commit()
+
+    def revisions(self, base_id: str) -> List[str]:
+        pattern = base_id.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            self._commit()
+            rows = self._conn.execute(
+                "SELECT DISTINCT paper_id FROM fields WHERE paper_id LIKE ? ESCAPE '\\'",
+                (f"{pattern}v%",),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        """Parcourt toutes les entrées, sans les compter comme lues pour l'éviction."""
+        self.flush()
+        with self._lock:
+            paper_ids = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT DISTINCT paper_id FROM fields ORDER BY paper_id"
+                )
+            ]
+        for paper_id in paper_ids:
+            with self._lock:
+                data = self._load(paper_id)
+            if data:
+                yield paper_id, data
+
+    def _write_rows(self, rows: List[Tuple[str, str, str | bytes, int, int]], now: float):
+        self._conn.executemany(
+            "INSERT INTO fields (paper_id, field, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (paper_id, field) DO UPDATE SET value = excluded.value",
+            [(pid, field, value) for pid, field, value, _, _ in rows],
+        )
+        self._conn.executemany(
+            "INSERT INTO entries (paper_id, field, size, raw_size, accessed) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (paper_id, field) DO UPDATE SET "
+            "size = excluded.size, raw_size = excluded.raw_size, accessed = excluded.accessed",
+            [(pid, field, size, raw_size, now) for pid, field, _, size, raw_size in rows],
+        )
+
+    def _commit(self, touch: bool = False):
+        """Valide les écritures en attente et, avec elles (ou si `touch`), les dates de lecture."""
+        with self._lock:
+            if not self._pending and not (touch and self._touched):
+                return
+            now = time.time()
+            rows = [
+                (pid, field, *self._encode(value))
+                for (pid, field), value in self._pending.items()
+            ]
+            with self._conn:
+                self._write_rows(rows, now)
+                self._conn.executemany(
+                    "UPDATE entries SET accessed = ? WHERE paper_id = ? AND field = ?",
+                    [(now, pid, field) for pid, field in self._touched if field is not None],
+                )
+                self._conn.executemany(
+                    "UPDATE entries SET accessed = ? WHERE paper_id = ?",
+                    [(now, pid) for pid, field in self._touched if field is None],
+                )
+            self._pending.clear()
+            self._touched.clear()
+            self._writes += len(rows)
+            if self.retention and self._writes >= self.PRUNE_INTERVAL:
+                self.prune(now)
+
+    def flush(self):
+        self._commit(touch=True)
+
+    def prune(self, now: float | None = None) -> Dict[str, int]:
+        """Applique la rétention : TTL par mois du papier, puis taille maximale (LRU).
+
+        Retourne le nombre de papiers expirés, de textes PDF et de papiers
+        évincés, et les octets libérés.
+        """
+        now = time.time() if now is None else now
+        report = {"expired_papers": 0, "evicted_content": 0, "evicted_papers": 0, "freed_bytes": 0}
+        with self._lock:
+            self._commit(touch=True)
+            with self._conn:
+                if self.ttl_days > 0:
+                    expired, freed = self._expired(now)
+                    self._delete(expired)
+                    report["expired_papers"] = len(expired)
+                    report["freed_bytes"] += freed
+                if self.max_bytes > 0:
+                    excess = (
+                        self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                        - self.max_bytes
+                    )
+                    if excess > 0:
+                        victims, freed = self._least_recent(excess, EVICT_FIRST_FIELDS)
+                        self._delete(victims, EVICT_FIRST_FIELDS)
+                        report["evicted_content"] = len(victims)
+                        report["freed_bytes"] += freed
+                        excess -= freed
+                    if excess > 0:
+                        victims, freed = self._least_recent(excess)
+                        self._delete(victims)
+                        report["evicted_papers"] = len(victims)
+                        report["freed_bytes"] += freed
+            self._writes = 0
+        return report
+
+    def _expired(self, now: float) -> Tuple[List[str], int]:
+        """Papiers soumis et lus pour la dernière fois plus de `ttl_days` avant `now`."""
+        cutoff = datetime.fromtimestamp(now, timezone.utc) - timedelta(days=self.ttl_days)
+        expired, freed = [], 0
+        for paper_id, accessed, size in self._conn.execute(
+            "SELECT paper_id, MAX(accessed), SUM(size) FROM entries GROUP BY paper_id"
+        ):
+            reference = datetime.fromtimestamp(accessed, timezone.utc)
+            month = paper_month(paper_id)
+            if month is not None:
+                # Fin du mois de soumission : l'ID ne donne pas le jour. Un
+                # papier ancien lu ou écrit récemment (rattrapage) est conservé.
+                reference = max(reference, (month + timedelta(days=31)).replace(day=1))
+            if reference < cutoff:
+                expired.append(paper_id)
+                freed += size
+        return expired, freed
+
+    def _least_recent(
+        self, excess: int, fields: Tuple[str, ...] | None = None
+    ) -> Tuple[List[str], int]:
+        """Papiers les moins récemment lus dont les lignes `fields` libèrent `excess` octets.
+
+        La date d'accès d'un papier est celle de son champ lu le plus récemment.
+        """
+        if fields is None:
+            selected, params = "size", ()
+        else:
+            selected = f"CASE WHEN field IN ({', '.join('?' * len(fields))}) THEN size ELSE 0 END"
+            params = fields
+        victims, freed = [], 0
+        for paper_id, size in self._conn.execute(
+            f"SELECT paper_id, SUM({selected}) AS selected FROM entries "
+            "GROUP BY paper_id HAVING selected > 0 ORDER BY MAX(accessed)",
+            params,
+        ):
+            if freed >= excess:
+                break
+            victims.append(paper_id)
+            freed += size
+        return victims, freed
+
+    def _delete(self, paper_ids: List[str], fields: Tuple[str, ...] | None = None):
+        if fields is None:
+            clause, extra = "paper_id = ?", ()
+        else:
+            clause = f"paper_id = ? AND field IN ({', '.join('?' * len(fields))})"
+            extra = fields
+        for table in ("fields", "entries"):
+            self._conn.executemany(
+                f"DELETE FROM {table} WHERE {clause}",
+                [(paper_id, *extra) for paper_id in paper_ids],
+            )
+
+    def file_size(self) -> int:
+        """Taille sur disque de la base, journal WAL compris."""
+        return sum(
+            path.stat().st_size
+            for path in (self.path, Path(f"{self.path}-wal"), Path(f"{self.path}-shm"))
+            if path.exists()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Lignes, octets stockés et bruts et lignes compressées par champ."""
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT field, COUNT(*), SUM(size), SUM(raw_size), SUM(size < raw_size) "
+                "FROM entries GROUP BY field ORDER BY field"
+            ).fetchall()
+            papers = self._conn.execute(
+                "SELECT COUNT(DISTINCT paper_id) FROM entries"
+            ).fetchone()[0]
+        return {
+            "path": str(self.path),
+            "codec": self.codec or "none",
+            "ttl_days": self.ttl_days,
+            "max_bytes": self.max_bytes,
+            "papers": papers,
+            "bytes": sum(row[2] for row in rows),
+            "raw_bytes": sum(row[3] for row in rows),
+            "file_bytes": self.file_size(),
+            "fields": {
+                field: {"rows": count, "bytes": size, "raw_bytes": raw_size, "compressed": compressed}
+                for field, count, size, raw_size, compressed in rows
+            },
+        }
+
+    def check(self) -> Dict[str, Any]:
+        """Vérifie l'intégrité SQLite, le décodage de chaque valeur et la cohérence de `entries`."""
+        with self._lock:
+            self.flush()
+            integrity = [row[0] for row in self._conn.execute("PRAGMA integrity_check")]
+            corrupt = []
+            for paper_id, field, value in self._conn.execute(
+                "SELECT paper_id, field, value FROM fields"
+            ):
+                try:
+                    decode_value(value)
+                except Exception as exc:  # noqa: BLE001 - tout échec de décodage est une corruption
+                    corrupt.append(f"{paper_id}/{field}: {exc}")
+            unindexed = self._conn.execute(
+                "SELECT COUNT(*) FROM fields AS f WHERE NOT EXISTS ("
+                " SELECT 1 FROM entries AS e WHERE e.paper_id = f.paper_id AND e.field = f.field)"
+            ).fetchone()[0]
+            orphans = self._conn.execute(
+                "SELECT COUNT(*) FROM entries AS e WHERE NOT EXISTS ("
+                " SELECT 1 FROM fields AS f WHERE f.paper_id = e.paper_id AND f.field = e.field)"
+            ).fetchone()[0]
+        return {
+            "ok": integrity == ["ok"] and not corrupt and not unindexed and not orphans,
+            "integrity": integrity,
+            "corrupt": corrupt,
+            "unindexed": unindexed,
+            "orphans": orphans,
+        }
+
+    def compact(self) -> Dict[str, Any]:
+        """Applique la rétention, compresse les grandes valeurs en clair, répare `entries` et `VACUUM`."""
+        with self._lock:
+            before = self.file_size()
+            pruned = self.prune()
+            recompressed = 0
+            if self.codec is not None:
+                keys = self._conn.execute(
+                    "SELECT paper_id, field FROM fields "
+                    "WHERE typeof(value) = 'text' AND length(CAST(value AS BLOB)) >= ?",
+                    (self.compress_min_bytes,),
+                ).fetchall()
+                for start in range(0, len(keys), self.batch_size):
+                    rows = []
+                    for paper_id, field in keys[start : start + self.batch_size]:
+                        value = self._conn.execute(
+                            "SELECT value FROM fields WHERE paper_id = ? AND field = ?",
+                            (paper_id, field),
+                        ).fetchone()[0]
+                        encoded = self._encode(value)
+                        if isinstance(encoded[0], bytes):
+                            rows.append((paper_id, field, *encoded))
+                    with self._conn:
+                        self._conn.executemany(
+                            "UPDATE fields SET value = ? WHERE paper_id = ? AND field = ?",
+                            [(value, pid, field) for pid, field, value, _, _ in rows],
+                        )
+                        self._conn.executemany(
+                            "UPDATE entries SET size = ?, raw_size = ? WHERE paper_id = ? AND field = ?",
+                            [(size, raw_size, pid, field) for pid, field, _, size, raw_size in rows],
+                        )
+                    recompressed += len(rows)
+            with self._conn:
+                orphans = self._conn.execute(
+                    "DELETE FROM entries WHERE NOT EXISTS ("
+                    " SELECT 1 FROM fields AS f"
+                    " WHERE f.paper_id = entries.paper_id AND f.field = entries.field)"
+                ).rowcount
+            reindexed = self._index_entries()
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {
+            **pruned,
+            "compressed_rows": recompressed,
+            "reindexed_rows": reindexed,
+            "orphan_rows": orphans,
+            "file_bytes_before": before,
+            "file_bytes_after": self.file_size(),
+        }
+
+    def get_meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            if self.retention and self._writes:
+                self.prune()
+            self._conn.close()
+
+
+def migrate_json_cache(
+    backend: SqliteCacheBackend, directory: Path = CACHE_DIR, force: bool = False
+) -> int:
+    """Importe les fichiers `<id>.json` dans la base SQLite (une seule fois).
+
+    Les fichiers JSON sont conservés ; la migration est marquée dans la table
+    `meta` et n'est rejouée que si `force=True`. Retourne le nombre de papiers
+    importés.
+    """
+    if backend.get_meta("json_migrated") and not force:
+        return 0
+    migrated = 0
+    for paper_id, data in JsonCacheBackend(directory).items():
+        for field, value in data.items():
+            backend.save_field(paper_id, field, value)
+        migrated += 1
+    backend.flush()
+    backend.set_meta("json_migrated", str(migrated))
+    return migrated
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_cache_backend():
+    """Retourne le backend de cache configuré par `CACHE_BACKEND` (`sqlite` ou `json`)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if CACHE_BACKEND == "json":
+                _backend = JsonCacheBackend(CACHE_DIR)
+            else:
+                _backend = SqliteCacheBackend.from_env(CACHE_DB_PATH)
+                migrate_json_cache(_backend, CACHE_DIR)
+                atexit.register(_backend.close)
+        return _backend
+
+
+def set_cache_backend(backend):
+    """Injecte le backend utilisé par les fonctions du module (outil, autre stockage).
+
+    Doit être appelé avant le premier accès au cache ; le backend fourni n'est
+    pas fermé automatiquement.
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
 def load_cache(paper_id: str) -> dict | None:
-    path = cache_path(paper_id)
-    if path.exists():
-        with open(path, "r") as f:
-            return json.load(f)
-    return None
+    return get_cache_backend().load(paper_id)
+
+
+def load_cache_field(paper_id: str, field: str, default: Any = None) -> Any:
+    """Lit un seul champ du cache, sans charger les autres (ex. le texte PDF)."""
+    return get_cache_backend().load_field(paper_id, field, default)
+
 
 def save_cache(paper_id: str, data: dict):
-    path = cache_path(paper_id)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    get_cache_backend().save(paper_id, data)
+
+
+def save_cache_field(paper_id: str, field: str, value: Any):
+    """Écrit un seul champ du cache sans réécrire le reste de l'entrée."""
+    get_cache_backend().save_field(paper_id, field, value)
+
+
+def list_revisions(paper_id: str) -> List[str]:
+    """Liste les révisions en cache du même papier, de la plus ancienne à la plus récente."""
+    base_id, _ = split_paper_version(paper_id)
+    revisions = [
+        rev for rev in get_cache_backend().revisions(base_id)
+        if split_paper_version(rev)[0] == base_id
+    ]
+    return sorted(revisions, key=lambda rev: split_paper_version(rev)[1] or 0)
+
+
+def flush_cache():
+    """Valide les écritures en attente du backend de cache."""
+    get_cache_backend().flush()
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="cache.py", description="Maintenance du cache SQLite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate", help="Importe les fichiers <id>.json dans la base")
+    migrate.add_argument("--force", action="store_true", help="Rejoue une migration déjà faite")
+    commands.add_parser("stats", help="Affiche lignes, octets et compression par champ")
+    commands.add_parser(
+        "compact", help="Applique la rétention, compresse les grandes valeurs et VACUUM"
+    )
+    commands.add_parser("check", help="Vérifie l'intégrité de la base et de chaque valeur")
+    args = parser.parse_args(argv)
+
+    backend = SqliteCacheBackend.from_env(CACHE_DB_PATH)
+    try:
+        if args.command == "migrate":
+            count = migrate_json_cache(backend, CACHE_DIR, force=args.force)
+            print(f"Migrated {count} papers from {CACHE_DIR} to {CACHE_DB_PATH}")
+        elif args.command == "stats":
+            print(json.dumps(backend.stats(), indent=2))
+        elif args.command == "compact":
+            print(json.dumps(backend.compact(), indent=2))
+        else:
+            report = backend.check()
+            print(json.dumps(report, indent=2))
+            return 0 if report["ok"] else 1
+    finally:
+        backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,2 +1,36 @@
-from .custom_chat import LLMClient
+from importlib import import_module
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from .async_chat import AsyncLLMClient
+    from .custom_chat import LLMClient
+    from .dispatcher import LLMDispatcher, RateLimiter
+    from .profiles import DEFAULT_PROFILE, GenerationProfile
+    from .response_cache import ResponseCache
+    from .usage import LLMCall, add_usage_listener, remove_usage_listener
+
+# Exports chargés à la demande (PEP 562) : `from llm_client import
+# GenerationProfile` n'importe pas le SDK `openai`.
+_EXPORTS = {
+    "AsyncLLMClient": ".async_chat",
+    "LLMClient": ".custom_chat",
+    "LLMDispatcher": ".dispatcher",
+    "RateLimiter": ".dispatcher",
+    "DEFAULT_PROFILE": ".profiles",
+    "GenerationProfile": ".profiles",
+    "ResponseCache": ".response_cache",
+    "LLMCall": ".usage",
+    "add_usage_listener": ".usage",
+    "remove_usage_listener": ".usage",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
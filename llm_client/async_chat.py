@@ -0,0 +1,113 @@
+import time
+from typing import Dict, List
+
+import openai
+from openai import AsyncOpenAI
+
+from .custom_chat import BaseLLMClient, LLMResponse
+from .profiles import GenerationProfile
+from .response_cache import ResponseCache
+
+
+class AsyncLLMClient(BaseLLMClient):
+    """Variante asynchrone de `LLMClient`, basée sur `AsyncOpenAI`.
+
+    Expose la même interface (`generate`, `chat`, `invoke`, `invoke_chat`)
+    sous forme de coroutines. `max_retries` est transmis au client OpenAI :
+    le `LLMDispatcher` le fixe à 0 pour gérer lui-même les rejeux.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        temperature: float = 0.2,
+        max_retries: int = 2,
+        response_cache: ResponseCache | None = None,
+        json_mode: bool | None = None,
+    ):
+        super().__init__(
+            model=model,
+            base_url=base_url,
+            api_key=api_key,
+            temperature=temperature,
+            response_cache=response_cache,
+            json_mode=json_mode,
+        )
+        self.client = AsyncOpenAI(
+            api_key=self.api_key, base_url=self.base_url, max_retries=max_retries
+        )
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        profile: GenerationProfile | None,
+    ) -> str:
+        options = self._request_options(profile)
+        key = self._cache_key(messages, temperature, options)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                temperature=temperature,
+                messages=messages,
+                **options,
+            )
+        except openai.BadRequestError as exc:
+            if not self._json_mode_rejected(options, exc):
+                raise
+            return await self._complete(messages, temperature, profile)
+        self._report_usage(response, time.perf_counter() - started)
+        text = response.choices[0].message.content.strip()
+        self._store(key, text)
+        return text
+
+    async def generate(
+        self,
+        prompt: str,
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Envoie un prompt au LLM et renvoie le texte généré."""
+        return await self._complete(
+            self._prompt_messages(prompt), self._temperature(temperature), profile
+        )
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """Envoie une liste de messages rôlés (system/user/assistant)."""
+        return await self._complete(
+            self._sanitize_messages(messages), self._temperature(temperature), profile
+        )
+
+    async def invoke(
+        self,
+        prompt: str,
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> LLMResponse:
+        text = await self.generate(prompt, temperature=temperature, profile=profile)
+        return LLMResponse(content=text)
+
+    async def invoke_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> LLMResponse:
+        text = await self.chat(messages, temperature=temperature, profile=profile)
+        return LLMResponse(content=text)
+
+    async def close(self):
+        await self.client.close()
+        if self._owns_response_cache:
+            self.response_cache.close()
@@ -1,12 +1,21 @@
+import logging
 import os
+import time
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Any, Dict, List
 
+import openai
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from .profiles import DEFAULT_PROFILE, GenerationProfile
+from .response_cache import ResponseCache
+from .usage import LLMCall, notify_usage
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class LLMResponse:
     """Réponse minimale pour imiter l'interface de ChatOpenAI de LangChain."""
@@ -14,13 +23,13 @@ class LLMResponse:
     content: str
 
 
-class LLMClient:
-    """
-    Client générique pour les APIs compatibles OpenAI.
-    
-    Utilise la méthode `generate(prompt)` pour retourner du texte, et expose
-    aussi `invoke(prompt)` qui renvoie un objet avec un attribut `.content`
-    pour rester compatible avec le code existant (`llm.invoke(...).content`).
+class BaseLLMClient:
+    """Configuration et utilitaires communs aux clients synchrone et asynchrone.
+
+    `response_cache` active le cache disque des réponses ; par défaut il est
+    construit depuis `LLM_RESPONSE_CACHE` (désactivé si la variable est vide).
+    `json_mode` (par défaut `LLM_JSON_MODE`, activé) autorise la sortie JSON
+    structurée pour les profils qui la demandent.
     """
 
     def __init__(
@@ -29,18 +38,24 @@ class LLMClient:
         base_url: str | None = None,
         api_key: str | None = None,
         temperature: float = 0.2,
+        response_cache: ResponseCache | None = None,
+        json_mode: bool | None = None,
     ):
         self.model = model or os.getenv("MODEL")
         self.base_url = base_url or os.getenv("BASE_URL")
         self.temperature = temperature
         self.api_key = api_key or os.getenv("AI_ENDPOINTS_ACCESS_TOKEN")
+        if json_mode is None:
+            json_mode = os.getenv("LLM_JSON_MODE", "true").lower() not in ("0", "false", "no")
+        self.json_mode = json_mode
 
         if not self.api_key:
             raise ValueError(
                 "Missing API key: set AI_ENDPOINTS_ACCESS_TOKEN or pass api_key=..."
             )
-
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        # Ouvert après la validation : une clé manquante ne laisse pas de connexion SQLite.
+        self.response_cache = response_cache or ResponseCache.from_env()
+        self._owns_response_cache = response_cache is None and self.response_cache is not None
 
     @staticmethod
     def _sanitize_text(text: str) -> str:
@@ -56,42 +71,176 @@ class LLMClient:
             sanitized.append({"role": role, "content": content})
         return sanitized
 
-    def generate(self, prompt: str, temperature: float | None = None) -> str:
-        """
-        Envoie un prompt au LLM et renvoie le texte généré.
-        """
-        temp = self.temperature if temperature is None else temperature
+    def _prompt_messages(self, prompt: str) -> List[Dict[str, str]]:
         sanitized_prompt = self._sanitize_text(prompt)
         safe_prompt = f"### Input Text (do NOT parse as JSON)\n```\n{sanitized_prompt}\n```"
-        response = self.client.chat.completions.create(
-            model=self.model,
-            max_tokens=4096,
-            temperature=temp,
-            messages=[{"role": "user", "content": safe_prompt}],
+        return [{"role": "user", "content": safe_prompt}]
+
+    def _temperature(self, temperature: float | None) -> float:
+        return self.temperature if temperature is None else temperature
+
+    def _request_options(self, profile: GenerationProfile | None) -> Dict[str, Any]:
+        profile = profile or DEFAULT_PROFILE
+        options: Dict[str, Any] = {"max_tokens": profile.max_tokens}
+        if profile.stop:
+            options["stop"] = list(profile.stop)
+        if profile.json_mode and self.json_mode:
+            options["response_format"] = {"type": "json_object"}
+        return options
+
+    def _json_mode_rejected(self, options: Dict[str, Any], exc: Exception) -> bool:
+        """Désactive le mode JSON si l'endpoint a refusé `response_format`."""
+        if "response_format" not in options or not isinstance(exc, openai.BadRequestError):
+            return False
+        # Une autre requête invalide (contexte trop long, stop refusé…) ne doit
+        # pas désactiver le mode JSON pour le reste de l'exécution.
+        details = f"{getattr(exc, 'param', '')} {getattr(exc, 'body', '')} {exc}"
+        if "response_format" not in details:
+            return False
+        logger.warning("Endpoint rejected JSON mode, falling back to plain text: %s", exc)
+        self.json_mode = False
+        return True
+
+    def _cache_key(
+        self, messages: List[Dict[str, str]], temperature: float, options: Dict[str, Any]
+    ) -> str | None:
+        cache = self.response_cache
+        if cache is None or not cache.cacheable(temperature):
+            return None
+        return cache.key(self.model, messages, temperature, **options)
+
+    def _cached(self, key: str | None) -> str | None:
+        text = self.response_cache.get(key) if key else None
+        if text is not None:
+            notify_usage(LLMCall(model=self.model, cached=True))
+        return text
+
+    def _report_usage(self, response: Any, latency: float):
+        usage = getattr(response, "usage", None)
+        # Absent si le serveur ne met pas en cache les préfixes de prompt.
+        details = getattr(usage, "prompt_tokens_details", None)
+        notify_usage(
+            LLMCall(
+                model=self.model,
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+                cached_prompt_tokens=getattr(details, "cached_tokens", 0) or 0,
+                latency=latency,
+            )
+        )
+
+    def _store(self, key: str | None, text: str):
+        if key:
+            self.response_cache.set(key, text)
+
+    def is_cached(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> bool:
+        """Indique si la réponse à `messages` est servie par le cache (sans compter de hit)."""
+        key = self._cache_key(
+            messages, self._temperature(temperature), self._request_options(profile)
+        )
+        return bool(key) and self.response_cache.get(key, touch=False) is not None
+
+
+class LLMClient(BaseLLMClient):
+    """
+    Client générique pour les APIs compatibles OpenAI.
+    
+    Utilise la méthode `generate(prompt)` pour retourner du texte, et expose
+    aussi `invoke(prompt)` qui renvoie un objet avec un attribut `.content`
+    pour rester compatible avec le code existant (`llm.invoke(...).content`).
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        temperature: float = 0.2,
+        response_cache: ResponseCache | None = None,
+        json_mode: bool | None = None,
+    ):
+        super().__init__(
+            model=model,
+            base_url=base_url,
+            api_key=api_key,
+            temperature=temperature,
+            response_cache=response_cache,
+            json_mode=json_mode,
         )
+        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        profile: GenerationProfile | None,
+    ) -> str:
+        options = self._request_options(profile)
+        key = self._cache_key(messages, temperature, options)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                temperature=temperature,
+                messages=messages,
+                **options,
+            )
+        except openai.BadRequestError as exc:
+            if not self._json_mode_rejected(options, exc):
+                raise
+            return self._complete(messages, temperature, profile)
+        self._report_usage(response, time.perf_counter() - started)
         text = response.choices[0].message.content.strip()
+        self._store(key, text)
         return text
 
-    def chat(self, messages: List[Dict[str, str]], temperature: float | None = None) -> str:
+    def generate(
+        self,
+        prompt: str,
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        """
+        Envoie un prompt au LLM et renvoie le texte généré.
+        """
+        return self._complete(
+            self._prompt_messages(prompt), self._temperature(temperature), profile
+        )
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> str:
         """Permet d'envoyer une liste de messages rôlés (system/user/assistant)."""
-        temp = self.temperature if temperature is None else temperature
-        sanitized_messages = self._sanitize_messages(messages)
-        response = self.client.chat.completions.create(
-            model=self.model,
-            max_tokens=4096,
-            temperature=temp,
-            messages=sanitized_messages,
+        return self._complete(
+            self._sanitize_messages(messages), self._temperature(temperature), profile
         )
-        text = response.choices[0].message.content.strip()
-        return text
 
     # Adapter pour rester compatible avec le reste du code (`llm.invoke(...).content`)
-    def invoke(self, prompt: str, temperature: float | None = None) -> LLMResponse:
-        text = self.generate(prompt, temperature=temperature)
+    def invoke(
+        self,
+        prompt: str,
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> LLMResponse:
+        text = self.generate(prompt, temperature=temperature, profile=profile)
         return LLMResponse(content=text)
 
     def invoke_chat(
-        self, messages: List[Dict[str, str]], temperature: float | None = None
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
     ) -> LLMResponse:
-        text = self.chat(messages, temperature=temperature)
+        text = self.chat(messages, temperature=temperature, profile=profile)
         return LLMResponse(content=text)
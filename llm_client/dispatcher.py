@@ -0,0 +1,151 @@
+import asyncio
+import random
+import time
+from collections import deque
+from functools import partial
+from typing import Deque, Dict, List, Tuple
+
+import openai
+
+from .async_chat import AsyncLLMClient
+from .profiles import GenerationProfile
+from .tokens import estimate_messages_tokens, estimate_tokens
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+class RateLimiter:
+    """Limiteur de débit sur fenêtre glissante (requêtes et tokens par minute).
+
+    Une limite à 0 est désactivée. Une requête plus grosse que le budget de
+    tokens passe seule lorsque la fenêtre est vide, pour ne jamais bloquer.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        window: float = 60.0,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._entries: Deque[Tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._lock = asyncio.Lock()
+
+    def _prune(self, now: float):
+        while self._entries and now - self._entries[0][0] >= self.window:
+            _, tokens = self._entries.popleft()
+            self._tokens_in_window -= tokens
+
+    def _has_room(self, tokens: int) -> bool:
+        if not self._entries:
+            return True
+        if self.requests_per_minute and len(self._entries) >= self.requests_per_minute:
+            return False
+        if (
+            self.tokens_per_minute
+            and self._tokens_in_window + tokens > self.tokens_per_minute
+        ):
+            return False
+        return True
+
+    async def acquire(self, tokens: int):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._prune(now)
+                if self._has_room(tokens):
+                    self._entries.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+                wait = self._entries[0][0] + self.window - now
+                await asyncio.sleep(max(wait, 0.01))
+
+
+class LLMDispatcher:
+    """Exécute des appels LLM concurrents sous contraintes de débit.
+
+    La concurrence est bornée par un sémaphore, le débit par un
+    `RateLimiter` (RPM/TPM), et les erreurs de rate limit, de connexion ou
+    5xx sont rejouées avec un backoff exponentiel (en respectant
+    `Retry-After` lorsque le serveur le fournit).
+    """
+
+    def __init__(
+        self,
+        client: AsyncLLMClient,
+        max_concurrency: int = 8,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        completion_tokens_estimate: int = 512,
+    ):
+        self.client = client
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.completion_tokens_estimate = completion_tokens_estimate
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+
+    def _retry_delay(self, attempt: int, exc: Exception) -> float:
+        response = getattr(exc, "response", None)
+        retry_after = response.headers.get("retry-after", "") if response else ""
+        try:
+            return float(retry_after)
+        except ValueError:
+            return self.backoff * (2**attempt) + random.uniform(0, self.backoff)
+
+    async def _call(self, tokens: int, make_request):
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._limiter.acquire(tokens)
+                try:
+                    return await make_request()
+                except RETRYABLE_ERRORS as exc:
+                    if attempt >= self.max_retries:
+                        raise
+                    await asyncio.sleep(self._retry_delay(attempt, exc))
+
+    def _completion_tokens(self, profile: GenerationProfile | None) -> int:
+        if profile is None:
+            return self.completion_tokens_estimate
+        return min(profile.max_tokens, self.completion_tokens_estimate)
+
+    async def generate(
+        self,
+        prompt: str,
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        request = partial(
+            self.client.generate, prompt, temperature=temperature, profile=profile
+        )
+        # Une réponse en cache ne consomme ni créneau de concurrence ni budget.
+        if self.client.is_cached(self.client._prompt_messages(prompt), temperature, profile):
+            return await request()
+        tokens = estimate_tokens(prompt) + self._completion_tokens(profile)
+        return await self._call(tokens, request)
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float | None = None,
+        profile: GenerationProfile | None = None,
+    ) -> str:
+        request = partial(
+            self.client.chat, messages, temperature=temperature, profile=profile
+        )
+        if self.client.is_cached(
+            self.client._sanitize_messages(messages), temperature, profile
+        ):
+            return await request()
+        tokens = estimate_messages_tokens(messages) + self._completion_tokens(profile)
+        return await self._call(tokens, request)
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Paramètres de génération propres à un type d'appel (analyse, score...).
+
+    `json_mode` demande une sortie JSON structurée (`response_format`) ; il
+    n'est appliqué que si le client l'autorise et est abandonné si
+    l'endpoint le refuse.
+    """
+
+    max_tokens: int = 4096
+    stop: Tuple[str, ...] = ()
+    json_mode: bool = False
+
+
+DEFAULT_PROFILE = GenerationProfile()
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class ResponseCache:
+    """Cache disque (SQLite) des réponses LLM, indexé par le contenu de la requête.
+
+    La clé est un hash de (modèle, messages, température, max_tokens et
+    options de génération). Seules les requêtes quasi déterministes
+    (`temperature <= max_temperature`) sont mises en cache. Les entrées
+    expirent après `ttl` secondes ; au-delà de `max_entries` entrées ou de
+    `max_bytes` octets, les moins récemment lues sont évincées (LRU).
+    """
+
+    EVICTION_INTERVAL = 50
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float = 30 * 24 * 3600,
+        max_entries: int = 20000,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_temperature: float = 0.2,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL"
+                ")"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache | None":
+        """Construit le cache depuis `LLM_RESPONSE_CACHE` (chemin ; vide = désactivé)."""
+        path = os.getenv("LLM_RESPONSE_CACHE")
+        if not path:
+            return None
+        return cls(
+            path,
+            ttl=float(os.getenv("LLM_RESPONSE_CACHE_TTL", 30 * 24 * 3600)),
+            max_entries=int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", 20000)),
+            max_bytes=int(os.getenv("LLM_RESPONSE_CACHE_MAX_BYTES", 200 * 1024 * 1024)),
+            max_temperature=float(os.getenv("LLM_RESPONSE_CACHE_MAX_TEMPERATURE", 0.2)),
+        )
+
+    def cacheable(self, temperature: float) -> bool:
+        return temperature <= self.max_temperature
+
+    @staticmethod
+    def key(
+        model: str | None,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        **options: Any,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "options": options,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, touch: bool = True) -> str | None:
+        """Renvoie la réponse en cache ; `touch=False` ne compte ni hit ni miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and now - row[1] > self.ttl):
+                if touch:
+                    self.misses += 1
+                return None
+            if not touch:
+                return row[0]
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO responses (key, value, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "value = excluded.value, size = excluded.size, "
+                    "created = excluded.created, accessed = excluded.accessed",
+                    (key, value, len(value.encode("utf-8")), now, now),
+                )
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        with self._conn:
+            if self.ttl:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE created < ?", (now - self.ttl,)
+                )
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            excess_entries = max(0, count - self.max_entries)
+            excess_bytes = max(0, total - self.max_bytes)
+            if not excess_entries and not excess_bytes:
+                return
+            removed, freed = 0, 0
+            keys = []
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed"
+            ):
+                if removed >= excess_entries and freed >= excess_bytes:
+                    break
+                keys.append((key,))
+                removed += 1
+                freed += size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Dict, List
+
+# Approximation usuelle pour les tokenizers BPE sur du texte anglais, utilisée
+# lorsque tiktoken (ou son fichier d'encodage) n'est pas disponible.
+CHARS_PER_TOKEN = 4
+ENCODING_NAME = "cl100k_base"
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    # Import différé : tiktoken n'est chargé qu'au premier comptage.
+    try:
+        import tiktoken
+    except ImportError:  # pragma: no cover - dépendance optionnelle
+        return None
+    try:
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:  # noqa: BLE001 - fichier BPE non téléchargeable hors ligne
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estime le nombre de tokens d'un texte (tiktoken si disponible)."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_messages_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estime le nombre de tokens d'une liste de messages rôlés."""
+    return sum(estimate_tokens(msg.get("content", "")) + 4 for msg in messages)
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Callable, List
+
+
+@dataclass
+class LLMCall:
+    """Bilan d'un appel LLM : tokens facturés (`usage`) et latence observée.
+
+    `cached` signale une réponse servie par le `ResponseCache`, sans appel réseau ;
+    `cached_prompt_tokens` compte les tokens de prompt servis par le cache de
+    préfixe du serveur (`usage.prompt_tokens_details.cached_tokens`).
+    """
+
+    model: str | None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    latency: float = 0.0
+    cached: bool = False
+
+
+UsageListener = Callable[[LLMCall], None]
+_listeners: List[UsageListener] = []
+
+
+def add_usage_listener(listener: UsageListener):
+    """Abonne `listener` à chaque appel LLM des clients synchrone et asynchrone."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_usage_listener(listener: UsageListener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def notify_usage(call: LLMCall):
+    for listener in list(_listeners):
+        listener(call)
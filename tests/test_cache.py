@@ -0,0 +1,21 @@
+import time
+
+from cache import SqliteCacheBackend
+
+
+def test_ttl_keeps_a_backfill_of_old_papers(tmp_path):
+    backend = SqliteCacheBackend(tmp_path / "cache.sqlite3", batch_size=10, ttl_days=30)
+    paper_ids = [f"1501.{idx:05d}" for idx in range(2 * SqliteCacheBackend.PRUNE_INTERVAL)]
+    try:
+        # Les écritures déclenchent `prune()` en cours de rattrapage.
+        for paper_id in paper_ids:
+            backend.save_field(paper_id, "analysis", "...")
+        backend.flush()
+        assert all(backend.load(paper_id) for paper_id in paper_ids)
+
+        # Sans accès pendant `ttl_days`, le mois de soumission fait foi.
+        report = backend.prune(now=time.time() + 31 * 86400)
+        assert report["expired_papers"] == len(paper_ids)
+        assert backend.load(paper_ids[0]) is None
+    finally:
+        backend.close()
@@ -0,0 +1,55 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from agent_arxiv import extraction
+from agent_arxiv.extraction import ExtractedText, ExtractionTimeoutError, PdfExtractor
+
+HANGING_PDF = b"hang"
+
+# Les workers héritent de `extract_pdf_text` remplacé par fork.
+pytestmark = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="requires the fork start method"
+)
+
+
+def _fake_extract(pdf_bytes, max_pages=0, max_seconds=0, max_chars=0):
+    if pdf_bytes == HANGING_PDF:
+        time.sleep(3600)  # page qui ne rend jamais la main
+    return ExtractedText(pdf_bytes.decode(), 1, 1, 0.0, "end")
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(extraction, "extract_pdf_text", _fake_extract)
+    with PdfExtractor(max_workers=1, timeout=1) as extractor:
+        yield extractor
+
+
+def test_hanging_pdf_does_not_block_queued_jobs(extractor):
+    hanging = extractor.submit(HANGING_PDF)
+    good = extractor.submit(b"ok")
+    deadline = time.monotonic() + 15
+    while not good.done() and time.monotonic() < deadline:
+        wait([hanging, good], timeout=0.1)
+        for future in extractor.expired():
+            extractor.abandon(future)
+
+    assert hanging.cancelled()
+    assert good.result(timeout=0).text == "ok"
+    assert not extractor.busy
+
+
+def test_async_extract_times_out_only_the_hanging_pdf(extractor):
+    async def run():
+        return await asyncio.gather(
+            extractor.extract(HANGING_PDF), extractor.extract(b"ok"), return_exceptions=True
+        )
+
+    hanging, good = asyncio.run(asyncio.wait_for(run(), timeout=15))
+
+    assert isinstance(hanging, ExtractionTimeoutError)
+    assert good.text == "ok"